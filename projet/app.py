@@ -6,17 +6,18 @@ This module sets up the Streamlit interface, initializes the application compone
 """
 
 import logging
-import time
 import streamlit as st
 
 from projet.app_init import AppInitializer
+from projet.components.admin_panel import AdminPanel
 from projet.components.sidebar import Sidebar
 from projet.components.metrics_display import MetricsDisplay
 from projet.components.navigation_header import NavigationHeader
 from projet.config.config_loader import ConfigLoader
 from projet.config.logging_config import setup_logging
 from projet.src.data_structures.linked_list_navigator import LinkedListNavigator
-from projet.src.api.request_queue import ApiRequestQueue
+from projet.src.api.session_queue import SessionRequestQueue
+from projet.src.services.station_prefetcher import StationPrefetcher
 from projet.src.viz import viz_utils
 
 setup_logging(log_level="INFO", log_file="weather_app.log")
@@ -35,23 +36,12 @@ def main():
         parquet_handler, data_fetcher, weather_charts = init.init_services()
         logger.info("Lancement de l'appli")
 
-        # Initialiser et démarrer la file d'attente une seule fois par session
+        # File d'attente partagée par toutes les sessions, vue propre à chaque session
         if 'api_queue' not in st.session_state:
-            logger.info("Creating and starting a new ApiRequestQueue instance.")
-            st.session_state.task_status = {"refresh_needed": False}
-            st.session_state.api_queue = ApiRequestQueue(task_status=st.session_state.task_status)
-            st.session_state.api_queue.start()
-
-        # Vérifie si un rafraîchissement est nécessaire après une tâche de fond
-        if st.session_state.task_status.get("refresh_needed", False):
-            st.session_state.task_status["refresh_needed"] = False
-            st.rerun()
-
-        # Affiche un spinner et recharge tant que la file d'attente travaille
-        if st.session_state.api_queue.is_working:
-            with st.spinner("Mise à jour des données en cours..."):
-                time.sleep(0.5)
-                st.rerun()
+            logger.info("Attaching the session to the shared request queue.")
+            st.session_state.api_queue = SessionRequestQueue(init.init_request_queue())
+        # Ingestion horaire de toutes les stations, une seule par processus
+        init.init_scheduler()
 
         # 2. NAVIGATION INITIALIZATION
         if 'navigator' not in st.session_state:
@@ -64,6 +54,14 @@ def main():
 
             logger.info("Navigator initialized with %d stations", len(stations))
 
+        # Préchargement des stations voisines, propre à chaque session
+        if 'prefetcher' not in st.session_state:
+            st.session_state.prefetcher = StationPrefetcher(
+                init.init_request_queue(),
+                data_fetcher,
+                count=config.get('app.prefetch_neighbours', 1)
+            )
+
         # 3. PAGE TITLE
         st.title(config.get('app.page_title', "🌡️ Weather Station Dashboard"))
         st.markdown("---")
@@ -81,18 +79,37 @@ def main():
             data_fetcher=data_fetcher,
             api_queue=st.session_state.api_queue)
         sidebar.render(st.session_state.navigator)
+        if config.get('app.admin_panel', False):
+            AdminPanel.render(init.init_request_queue().snapshot())
 
         # 6. GET CURRENT STATION (source of truth)
         current_station = st.session_state.navigator.get_current()
 
         logger.info("Displaying data for station: %s", current_station.name)
+        st.session_state.prefetcher.update(st.session_state.navigator)
+
+        # Recharge la page uniquement quand la station affichée a été rafraîchie
+        _watch_station_refresh(
+            st.session_state.api_queue,
+            current_station.id,
+            config.get('app.refresh_poll_interval', 1.0),
+            config.get('app.idle_poll_interval', 30.0)
+        )
 
         # 7. LOAD STATION DATA
         parquet_handler.load_station_reports(current_station)
 
         if not current_station.reports:
             st.warning(f"No data available for '{current_station.name}'")
-            st.info("Click 'Refresh Data' to fetch initial data")
+            no_data = data_fetcher.no_data_since(current_station)
+            if no_data is not None:
+                empty_since, next_check = no_data
+                st.info(
+                    f"No data since {empty_since.astimezone():%d/%m/%Y %H:%M} "
+                    f"(next check at {next_check.astimezone():%d/%m/%Y %H:%M})"
+                )
+            else:
+                st.info("Click 'Refresh Data' to fetch initial data")
             return
 
         _render_dashboard(current_station, weather_charts)
@@ -102,6 +119,32 @@ def main():
         st.error(f"An application error occurred: {e}")
 
 
+def _watch_station_refresh(api_queue, station_id, poll_interval, idle_interval):
+    """
+    Rerun the app once the displayed station has been refreshed, whoever
+    requested the refresh (this session, another one, a prefetch or the scheduler).
+
+    Only a small fragment polls the shared queue: every `poll_interval`
+    while a refresh of the station is pending, every `idle_interval`
+    otherwise. The rest of the page is not re-executed meanwhile, and
+    refreshes of other stations never trigger a rerun.
+    """
+    pending = api_queue.is_pending(station_id)
+    seen = api_queue.completions(station_id)
+
+    @st.fragment(run_every=poll_interval if pending else idle_interval)
+    def watcher():
+        refreshed = api_queue.completions(station_id) != seen
+        # A refresh started elsewhere: rerun to poll it at the faster pace
+        started = not pending and api_queue.is_pending(station_id)
+        if refreshed or started:
+            st.rerun()
+        if pending:
+            st.caption("🔄 Mise à jour des données en cours...")
+
+    watcher()
+
+
 def _render_dashboard(current_station, weather_charts):
     """
     Helper function to render the station dashboard (info, charts, metrics).
@@ -10,13 +10,24 @@ import pandas as pd
 import streamlit as st
 
 from projet.config.config_loader import ConfigLoader
+from projet.src.api.catalog import CatalogSync
+from projet.src.api.export_extractor import ExportExtractor
 from projet.src.api.extractor import APIExtractor
+from projet.src.api.http_session import HttpSessionPool
+from projet.src.api.rate_limiter import RateLimiter
+from projet.src.api.recorder import ResponseRecorder
+from projet.src.api.request_queue import ApiRequestQueue
+from projet.src.api.resilience import CircuitBreaker, RetryPolicy
+from projet.src.api.response_cache import ResponseCache
+from projet.src.api.task_store import SqliteTaskStore
 from projet.src.entities.station import Station
 from projet.src.entities.station_builder import StationBuilder
 from projet.src.processing.transformer import DataTransformer
 from projet.src.processing.validator import DataValidator
 from projet.src.services.data_fetcher import DataFetcher
+from projet.src.services.ingestion_scheduler import IngestionScheduler
 from projet.src.services.loader import DataLoader
+from projet.src.services.negative_cache import NegativeCache
 from projet.src.storage.parquet_handler import ParquetHandler
 from projet.src.viz.data_vizualizer_factory import DataVizualiserFactory
 
@@ -97,29 +108,219 @@ class AppInitializer:
         config = ConfigLoader()
 
         # Build low-level services from config
-        extractor = APIExtractor(base_url=config.get_required('api.url_base'),
-                                 timeout=config.get_required('api.timeout'))
+        extractor, backfill_extractor = AppInitializer._build_extractors(config)
 
+        resolution = config.get('api.resolution', 'hourly')
         validation_rules = config.get_section('validation')
-        validator = DataValidator(rules=validation_rules)
+        validator = DataValidator(rules=validation_rules, resolution=resolution)
 
         parquet_handler = ParquetHandler(data_dir=Path(config.get_required('storage.data_path')),
-                                    compression=config.get_required('storage.parquet_compression')
+                                    compression=config.get_required('storage.parquet_compression'),
+                                    read_resolution=config.get('storage.read_resolution', 'hourly'),
+                                    cache_size=config.get('storage.memory_cache_size', 0)
                                          )
 
         # Build high-level services by injecting dependencies
         data_fetcher = DataFetcher(
             extractor=extractor,
-            transformer=DataTransformer(),
+            transformer=DataTransformer(resolution=resolution),
             validator=validator,
             loader=DataLoader(),
-            parquet_handler=parquet_handler
+            parquet_handler=parquet_handler,
+            incremental=config.get('api.incremental', True),
+            backfill_extractor=backfill_extractor,
+            catalog=AppInitializer._build_catalog(config, extractor),
+            negative_cache=AppInitializer._build_negative_cache(config)
         )
 
         weather_charts = DataVizualiserFactory()
 
         return parquet_handler, data_fetcher, weather_charts
 
+    @staticmethod
+    @st.cache_resource(show_spinner=False)
+    def init_request_queue() -> ApiRequestQueue:
+        """
+        Create and start the request queue shared by every user session.
+
+        Being a cached resource, a single queue and worker pool exist per
+        process, so the number of threads and the API traffic do not grow
+        with the number of open sessions. Sessions use it through a
+        `SessionRequestQueue` to withdraw their own requests.
+
+        With a durable store, station refreshes and backfills left unfinished
+        by the previous process (e.g. before a redeploy) are queued again.
+
+        Returns:
+            ApiRequestQueue: The started process-wide queue
+        """
+        config = ConfigLoader()
+        store = None
+        if config.get('queue.store.enabled', False):
+            store = SqliteTaskStore(
+                Path(config.get('queue.store.path', 'projet/data/queue/tasks.sqlite3')),
+                max_attempts=config.get('queue.store.max_attempts', 5)
+            )
+        api_queue = ApiRequestQueue(
+            workers=config.get('queue.workers', 4),
+            process_workers=config.get('queue.process_workers', 0),
+            aging_interval=config.get('queue.aging_interval', 10),
+            max_size=config.get('queue.max_size', 0),
+            overflow_policy=config.get('queue.overflow_policy', 'reject'),
+            block_timeout=config.get('queue.block_timeout', 1.0),
+            store=store
+        )
+        if store is not None:
+            _, data_fetcher, _ = AppInitializer.init_services()
+            api_queue.register_durable('refresh', data_fetcher.refresh_and_save_station_data)
+            api_queue.register_durable('backfill', data_fetcher.backfill_station,
+                                       progress_kwarg='on_progress')
+            stations = AppInitializer(config).load_stations()
+            api_queue.resume({station.id: station for station in stations})
+        api_queue.start()
+        logger.info("Process-wide request queue started with %d workers", api_queue.workers)
+        return api_queue
+
+    @st.cache_resource(show_spinner=False)
+    def init_scheduler(_self) -> IngestionScheduler | None:  # pylint: disable=no-self-argument
+        """
+        Create and start the hourly ingestion of every station.
+
+        Being a cached resource, a single scheduler runs per process, started
+        by the first session and independent of the sessions afterwards.
+
+        Returns:
+            IngestionScheduler | None: The started scheduler, or None if disabled
+        """
+        if not _self.config.get('scheduler.enabled', False):
+            return None
+
+        _, data_fetcher, _ = AppInitializer.init_services()
+        scheduler = IngestionScheduler(
+            api_queue=AppInitializer.init_request_queue(),
+            data_fetcher=data_fetcher,
+            stations=_self.load_stations(),
+            offset=_self.config.get('scheduler.offset', 300),
+            jitter=_self.config.get('scheduler.jitter', 300),
+            max_age=_self.config.get('scheduler.max_age', 3600)
+        )
+        scheduler.start()
+        return scheduler
+
+    @staticmethod
+    def _build_extractors(config: ConfigLoader) -> Tuple[APIExtractor, APIExtractor]:
+        """
+        Build the API extractors sharing one transport (connection pool,
+        retry policy, circuit breaker and rate limiter).
+
+        Backfills use the `/exports` endpoint, except when the response
+        recorder is enabled: exports are streamed to disk and bypass it, so
+        backfills then go through the paginated `/records` pages, which are
+        recorded and replayed like any other request.
+
+        Args:
+            config (ConfigLoader): The application configuration loader.
+
+        Returns:
+            Tuple of (APIExtractor, extractor used for backfills)
+        """
+        # Process-wide limiter, also used by any other API client
+        rate_limiter = RateLimiter.shared()
+        rate_limiter.configure(
+            rate=config.get('api.rate_limit.requests_per_second', 5),
+            burst=config.get('api.rate_limit.burst', 10)
+        )
+        transport = {
+            'base_url': config.get_required('api.url_base'),
+            'timeout': config.get_required('api.timeout'),
+            'session_pool': HttpSessionPool(pool_size=config.get('api.pool_size', 10)),
+            'retry_policy': RetryPolicy(
+                max_attempts=config.get('api.retry.max_attempts', 3),
+                backoff_base=config.get('api.retry.backoff_base', 0.5),
+                backoff_max=config.get('api.retry.backoff_max', 8.0)
+            ),
+            'circuit_breaker': CircuitBreaker(
+                failure_threshold=config.get('api.circuit_breaker.failure_threshold', 3),
+                cooldown=config.get('api.circuit_breaker.cooldown', 60)
+            ),
+            'rate_limiter': rate_limiter,
+            'resolution': config.get('api.resolution', 'hourly')
+        }
+
+        cache_config = config.get_section('api.cache')
+        cache = None
+        if cache_config.get('enabled', False):
+            cache = ResponseCache(
+                cache_dir=Path(cache_config.get('dir', 'projet/data/cache')),
+                ttl=cache_config.get('ttl', 3600),
+                max_bytes=cache_config.get('max_mb', 50) * 1024 * 1024,
+                align_to_hour=cache_config.get('align_to_hour', True)
+            )
+
+        recorder_config = config.get_section('api.recorder')
+        recorder = None
+        if recorder_config.get('mode', 'off') in ResponseRecorder.MODES:
+            recorder = ResponseRecorder(
+                cassette_dir=Path(recorder_config.get('dir', 'projet/data/cassettes')),
+                mode=recorder_config['mode']
+            )
+
+        extractor = APIExtractor(cache=cache, recorder=recorder, **transport)
+        if recorder is not None:
+            return extractor, extractor
+        backfill_extractor = ExportExtractor(
+            export_format=config.get('api.export_format', 'parquet'),
+            **transport
+        )
+        return extractor, backfill_extractor
+
+    @staticmethod
+    def _build_catalog(config: ConfigLoader, extractor: APIExtractor) -> CatalogSync | None:
+        """
+        Build the dataset catalog used to skip dead and stale stations.
+
+        Args:
+            config (ConfigLoader): The application configuration loader.
+            extractor (APIExtractor): API client whose transport is reused.
+
+        Returns:
+            CatalogSync | None: The catalog, or None if disabled
+        """
+        catalog_config = config.get_section('api.catalog')
+        if not catalog_config.get('enabled', False):
+            return None
+
+        catalog = CatalogSync(
+            extractor=extractor,
+            cache_path=Path(catalog_config.get('path', 'projet/data/stations/catalog.json')),
+            dataset_pattern=catalog_config.get('dataset_pattern', 'station-meteo'),
+            ttl=catalog_config.get('ttl', 86400),
+            stale_after_days=catalog_config.get('stale_after_days', 7),
+            retry_interval=catalog_config.get('retry_interval', 300)
+        )
+        # Synced on the first lookup, from a worker: startup never waits for the API
+        return catalog
+
+    @staticmethod
+    def _build_negative_cache(config: ConfigLoader) -> NegativeCache | None:
+        """
+        Build the negative cache of stations returning no data.
+
+        Args:
+            config (ConfigLoader): The application configuration loader.
+
+        Returns:
+            NegativeCache | None: The negative cache, or None if disabled
+        """
+        negative_config = config.get_section('api.negative_cache')
+        if not negative_config.get('enabled', False):
+            return None
+        return NegativeCache(
+            path=Path(negative_config.get('path', 'projet/data/stations/negative_cache.json')),
+            base_interval=negative_config.get('base_interval', 900),
+            max_interval=negative_config.get('max_interval', 86400)
+        )
+
     @staticmethod
     def configure_page():
         """Configure Streamlit page settings."""
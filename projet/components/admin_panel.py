@@ -0,0 +1,62 @@
+"""
+Admin panel component for Streamlit application.
+Handles display of the request queue metrics.
+"""
+
+from datetime import datetime
+
+import pandas as pd
+import streamlit as st
+
+
+class AdminPanel:
+    """Handles display of the shared request queue metrics in the sidebar."""
+    # pylint: disable=too-few-public-methods
+
+    @staticmethod
+    def render(snapshot: dict):
+        """
+        Render the request queue metrics in an expandable sidebar section.
+
+        Args:
+            snapshot: Metrics returned by `ApiRequestQueue.snapshot`
+        """
+        with st.sidebar.expander("🛠️ Request queue"):
+            col1, col2 = st.columns(2)
+            with col1:
+                st.metric("Busy workers", f"{snapshot['busy_workers']}/{snapshot['workers']}")
+                st.metric("Wait p90", AdminPanel._format_seconds(snapshot['wait'].get('p90')))
+            with col2:
+                st.metric("Waiting tasks", snapshot['depth']['current'])
+                st.metric("Run p90", AdminPanel._format_seconds(snapshot['run'].get('p90')))
+
+            outcomes = {**snapshot['outcomes'], **snapshot['dropped']}
+            st.caption(" · ".join(f"{name}: {count}" for name, count in sorted(outcomes.items()))
+                       or "No task run yet")
+
+            history = snapshot['depth']['history']
+            if history:
+                depth = pd.DataFrame(
+                    [(datetime.fromtimestamp(at), value) for at, value in history],
+                    columns=['time', 'depth']
+                ).set_index('time')
+                st.line_chart(depth)
+
+            rows = [
+                {
+                    'task': name,
+                    'runs': summary['count'],
+                    'p50 (s)': round(summary['p50'], 2),
+                    'p90 (s)': round(summary['p90'], 2),
+                    'p99 (s)': round(summary['p99'], 2),
+                    'max (s)': round(summary['max'], 2)
+                }
+                for name, summary in snapshot['by_task'].items()
+            ]
+            if rows:
+                st.dataframe(pd.DataFrame(rows), hide_index=True)
+
+    @staticmethod
+    def _format_seconds(value: float | None) -> str:
+        """Format a duration for a metric tile."""
+        return "-" if value is None else f"{value:.2f} s"
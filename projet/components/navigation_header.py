@@ -5,7 +5,8 @@ Handles station navigation buttons.
 
 import streamlit as st
 
-from projet.src.api.request_queue import ApiRequestQueue
+from projet.src.api.request_queue import TaskPriority
+from projet.src.api.session_queue import SessionRequestQueue
 from projet.src.data_structures.linked_list_navigator import LinkedListNavigator
 from projet.src.services.data_fetcher import DataFetcher
 
@@ -17,7 +18,7 @@ class NavigationHeader:
     @staticmethod
     def render(
         navigator: LinkedListNavigator,
-        api_queue: ApiRequestQueue,
+        api_queue: SessionRequestQueue,
         data_fetcher: DataFetcher
     ):
         """
@@ -33,13 +34,17 @@ class NavigationHeader:
 
         with col1:
             if st.button("← Previous", key="btn_previous", width='stretch'):
+                left_station = navigator.get_current()
                 previous_station = navigator.get_previous()
                 if previous_station:
                     # Synchronize session state
                     st.session_state.selected_station_id = previous_station.id
+                    NavigationHeader._cancel_refresh(api_queue, left_station)
                     api_queue.add_task(
                         data_fetcher.refresh_and_save_station_data,
-                        station=previous_station
+                        station=previous_station,
+                        dedupe_key=previous_station.id,
+                        priority=TaskPriority.INTERACTIVE
                     )
                     st.rerun()
 
@@ -47,12 +52,28 @@ class NavigationHeader:
 
         with col3:
             if st.button("Next →", key="btn_next", width='stretch'):
+                left_station = navigator.get_current()
                 next_station = navigator.get_next()
                 if next_station:
                     # Synchronize session state
                     st.session_state.selected_station_id = next_station.id
+                    NavigationHeader._cancel_refresh(api_queue, left_station)
                     api_queue.add_task(
                         data_fetcher.refresh_and_save_station_data,
-                        station=next_station
+                        station=next_station,
+                        dedupe_key=next_station.id,
+                        priority=TaskPriority.INTERACTIVE
                     )
                     st.rerun()
+
+    @staticmethod
+    def _cancel_refresh(api_queue: SessionRequestQueue, station):
+        """
+        Cancel the pending refresh of the station the user navigates away from.
+
+        Args:
+            api_queue: The background task queue.
+            station: Station left by the user (None if there was none)
+        """
+        if station is not None:
+            api_queue.cancel(station.id)
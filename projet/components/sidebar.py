@@ -7,7 +7,8 @@ import streamlit as st
 from projet.src.data_structures.linked_list_navigator import LinkedListNavigator
 from projet.src.services.data_fetcher import DataFetcher
 from projet.src.storage.parquet_handler import ParquetHandler
-from projet.src.api.request_queue import ApiRequestQueue
+from projet.src.api.request_queue import TaskPriority
+from projet.src.api.session_queue import SessionRequestQueue
 
 
 class Sidebar:
@@ -20,7 +21,7 @@ class Sidebar:
         self,
         parquet_handler: ParquetHandler,
         data_fetcher: DataFetcher,
-        api_queue: ApiRequestQueue
+        api_queue: SessionRequestQueue
     ):
         """
         Initialize Sidebar with required services.
@@ -85,9 +86,13 @@ class Sidebar:
                 if selected_station:
                     navigator.set_current(selected_station)
                     st.session_state.selected_station_id = selected_station.id
+                    # Its refresh is no longer needed if it has not started yet
+                    self.api_queue.cancel(current_id)
                     self.api_queue.add_task(
                         self.data_fetcher.refresh_and_save_station_data,
-                        station=selected_station
+                        station=selected_station,
+                        dedupe_key=selected_station.id,
+                        priority=TaskPriority.INTERACTIVE
                     )
                     st.rerun()
 
@@ -108,6 +113,8 @@ class Sidebar:
             self.api_queue.add_task(
                 self.data_fetcher.refresh_and_save_station_data,
                 station=station,
+                dedupe_key=station.id,
+                priority=TaskPriority.INTERACTIVE
             )
             st.info("Refresh is running in the background.")
             st.rerun()
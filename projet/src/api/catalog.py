@@ -0,0 +1,268 @@
+"""
+Module for discovering station datasets from the Opendatasoft catalog.
+"""
+
+import json
+import logging
+import threading
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pandas as pd
+import requests
+
+from projet.src.api.extractor import APIExtractor, MAX_PAGE_SIZE, _to_utc
+from projet.src.entities.station import Station
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class DatasetStatus:
+    """
+    Catalog entry of a station dataset.
+    """
+    dataset_id: str
+    records_count: int
+    modified: str | None = None
+
+    @property
+    def last_update(self) -> pd.Timestamp | None:
+        """Last modification date of the dataset (UTC), if known."""
+        return _to_utc(self.modified) if self.modified else None
+
+    def status(self, stale_after: timedelta, now: datetime | None = None) -> str:
+        """
+        Classify the dataset.
+
+        Args:
+            stale_after: Age of the last modification beyond which a dataset is stale
+            now: Reference time (default: now)
+
+        Returns:
+            str: 'dead' if it has no records, 'stale' if it has not been
+                updated for `stale_after`, 'active' otherwise
+        """
+        if self.records_count == 0:
+            return 'dead'
+        last_update = self.last_update
+        now = now or datetime.now(timezone.utc)
+        if last_update is not None and now - last_update > stale_after:
+            return 'stale'
+        return 'active'
+
+
+class CatalogSync:
+    """
+    Keeps a local copy of the catalog entries of the station datasets.
+
+    The whole catalog is fetched in a single request (a few pages at most),
+    with the record count and last modification date of every dataset. It is
+    cached on disk so that the application does not query it again before
+    `ttl` expires, and stays usable offline from the last copy. Looking up a
+    station syncs the catalog again once it has expired (at most every
+    `retry_interval` seconds while the API fails), so a long-running process
+    keeps an up-to-date view. The first sync also happens on lookup, not at
+    startup: until it succeeds, every station is considered fetchable.
+
+    Dead (no records) and stale (not updated for `stale_after_days` when the
+    catalog was fetched) datasets are reported as not fetchable, so that no
+    API request is wasted on them.
+    """
+    # pylint: disable=too-many-instance-attributes
+
+    def __init__(
+            self,
+            extractor: APIExtractor,
+            cache_path: Path,
+            dataset_pattern: str = 'station-meteo',
+            ttl: int = 24 * 3600,
+            stale_after_days: int = 7,
+            retry_interval: int = 300
+    ):
+        """
+        Args:
+            extractor: API client whose transport (pool, retries, rate limit) is reused
+            cache_path: Local JSON copy of the catalog
+            dataset_pattern: Text identifying the station datasets in their id
+            ttl: Lifetime of the local copy, in seconds
+            stale_after_days: Days without update after which a dataset is stale
+            retry_interval: Delay before syncing again after a failure, in seconds
+        """
+        # pylint: disable=too-many-arguments, too-many-positional-arguments
+        self.extractor = extractor
+        self.cache_path = Path(cache_path)
+        self.dataset_pattern = dataset_pattern
+        self.ttl = ttl
+        self.stale_after = timedelta(days=stale_after_days)
+        self.retry_interval = timedelta(seconds=retry_interval)
+        self._datasets: dict[str, DatasetStatus] = {}
+        self._fetched_at: datetime | None = None
+        self._failed_at: datetime | None = None
+        self._syncing = False
+        self._lock = threading.Lock()
+        self._load_cache()
+
+    @property
+    def datasets(self) -> dict[str, DatasetStatus]:
+        """Catalog entries by dataset id (empty until the first sync)."""
+        return self._datasets
+
+    @property
+    def is_expired(self) -> bool:
+        """True if the local copy is missing or older than the TTL."""
+        if self._fetched_at is None:
+            return True
+        return datetime.now(timezone.utc) - self._fetched_at > timedelta(seconds=self.ttl)
+
+    def sync(self, force: bool = False) -> dict[str, DatasetStatus]:
+        """
+        Refresh the catalog from the API if the local copy has expired.
+
+        On failure the previous copy is kept, and the API is not queried
+        again before `retry_interval` unless `force` is set. Only one thread
+        syncs at a time; the others return the current copy at once.
+
+        Args:
+            force: Query the API even if the local copy is still valid
+
+        Returns:
+            dict[str, DatasetStatus]: Catalog entries by dataset id
+        """
+        with self._lock:
+            if self._syncing or not (force or self._should_sync()):
+                return self._datasets
+            self._syncing = True
+
+        # The request runs outside the lock: meanwhile, lookups from other
+        # threads are answered from the current copy instead of waiting
+        try:
+            datasets = self._fetch_catalog()
+            with self._lock:
+                self._datasets = {dataset.dataset_id: dataset for dataset in datasets}
+                self._fetched_at = datetime.now(timezone.utc)
+                self._failed_at = None
+        except (requests.exceptions.RequestException, ValueError, KeyError, TypeError) as e:
+            with self._lock:
+                self._failed_at = datetime.now(timezone.utc)
+            logger.error("Catalog sync failed, keeping %d known datasets: %s",
+                         len(self._datasets), e)
+            return self._datasets
+        finally:
+            with self._lock:
+                self._syncing = False
+        self._save_cache()
+
+        statuses = [dataset.status(self.stale_after, self._fetched_at) for dataset in datasets]
+        logger.info(
+            "Catalog synced: %d station datasets (%d dead, %d stale)",
+            len(datasets),
+            statuses.count('dead'),
+            statuses.count('stale')
+        )
+        return self._datasets
+
+    def status_of(self, station_id: str) -> str:
+        """
+        Classify the dataset of a station, syncing the catalog first if it
+        has expired.
+
+        Args:
+            station_id: Dataset id of the station
+
+        Returns:
+            str: 'active', 'stale' or 'dead' (a dataset missing from a known
+                catalog is dead), or 'unknown' if the catalog was never synced
+        """
+        self.sync()
+        if not self._datasets:
+            return 'unknown'
+        dataset = self._datasets.get(station_id)
+        if dataset is None:
+            return 'dead'
+        # Judged when the entry was fetched, not against the process uptime
+        return dataset.status(self.stale_after, self._fetched_at)
+
+    def is_fetchable(self, station: Station, include_stale: bool = False) -> bool:
+        """
+        Check whether fetching a station's data can return anything new.
+
+        Args:
+            station: Station to check
+            include_stale: Also accept stale datasets, whose history can
+                still be fetched (e.g. by a backfill)
+
+        Returns:
+            bool: False for dead (and, unless `include_stale`, stale)
+                datasets, True otherwise
+        """
+        accepted = ('active', 'unknown', 'stale') if include_stale else ('active', 'unknown')
+        return self.status_of(station.id) in accepted
+
+    def _should_sync(self) -> bool:
+        """True if the copy has expired and no failed sync is too recent (lock held)."""
+        if not self.is_expired:
+            return False
+        return (self._failed_at is None
+                or datetime.now(timezone.utc) - self._failed_at >= self.retry_interval)
+
+    def _fetch_catalog(self) -> list[DatasetStatus]:
+        """
+        Query the catalog for every station dataset.
+
+        Returns:
+            list[DatasetStatus]: Entries of the matching datasets
+
+        Raises:
+            requests.exceptions.RequestException: If the request fails
+            ValueError: If the response is not valid JSON
+        """
+        url = self.extractor.base_url.rstrip('/')
+        datasets = []
+        offset = 0
+        while True:
+            document = self.extractor.fetch_json(url, {
+                'where': f'search("{self.dataset_pattern}")',
+                'limit': str(MAX_PAGE_SIZE),
+                'offset': str(offset),
+                'include_links': 'false',
+                'include_app_metas': 'false'
+            })
+            results = document['results']
+            for result in results:
+                if self.dataset_pattern not in result['dataset_id']:
+                    continue
+                metas = result.get('metas', {}).get('default', {})
+                datasets.append(DatasetStatus(
+                    dataset_id=result['dataset_id'],
+                    records_count=int(metas.get('records_count') or 0),
+                    modified=metas.get('data_processed') or metas.get('modified')
+                ))
+            offset += len(results)
+            if not results or offset >= document.get('total_count', 0):
+                return datasets
+
+    def _load_cache(self) -> None:
+        """Load the local copy of the catalog, if any."""
+        if not self.cache_path.exists():
+            return
+        try:
+            cached = json.loads(self.cache_path.read_text(encoding='utf-8'))
+            self._fetched_at = datetime.fromisoformat(cached['fetched_at'])
+            self._datasets = {
+                entry['dataset_id']: DatasetStatus(**entry) for entry in cached['datasets']
+            }
+            logger.info("Loaded %d datasets from catalog copy %s",
+                        len(self._datasets), self.cache_path)
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning("Ignoring unreadable catalog copy %s: %s", self.cache_path, e)
+
+    def _save_cache(self) -> None:
+        """Write the local copy of the catalog."""
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        cached = {
+            'fetched_at': self._fetched_at.isoformat(),
+            'datasets': [asdict(dataset) for dataset in self._datasets.values()]
+        }
+        self.cache_path.write_text(json.dumps(cached, indent=2), encoding='utf-8')
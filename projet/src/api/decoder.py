@@ -0,0 +1,89 @@
+"""
+Module for decoding API responses into columnar data.
+"""
+
+import json
+import logging
+
+import pandas as pd
+import pyarrow as pa
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional accelerator
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+
+def loads(body: bytes | str) -> object:
+    """
+    Parse a JSON document, with orjson when it is installed.
+
+    Args:
+        body: Raw JSON document
+
+    Returns:
+        object: The decoded document
+
+    Raises:
+        ValueError: If the document is not valid JSON
+    """
+    if orjson is not None:
+        return orjson.loads(body)
+    return json.loads(body)
+
+
+# Largest body parsed by `is_empty_page` (an empty page is a few dozen bytes)
+EMPTY_PAGE_MAX_BYTES = 512
+
+
+def is_empty_page(body: bytes | str) -> bool:
+    """
+    Check whether a `/records` response holds no records, without parsing
+    bodies too large to be empty.
+
+    Args:
+        body: Raw body of a response
+
+    Returns:
+        bool: True if the document has an empty 'results' array
+    """
+    if len(body) > EMPTY_PAGE_MAX_BYTES:
+        return False
+    try:
+        document = loads(body)
+    except ValueError:
+        return False
+    return isinstance(document, dict) and document.get('results') == []
+
+
+def decode_records(body: bytes | str) -> pd.DataFrame | None:
+    """
+    Decode the `results` array of a `/records` response into a DataFrame.
+
+    The records are never iterated in Python: the parser output is handed
+    to Arrow, which builds one typed column array per field in C++ before
+    the conversion to pandas.
+
+    Args:
+        body: Raw body of a `/records` response
+
+    Returns:
+        pd.DataFrame | None: One column per selected field (empty if there
+            are no records), or None if the document has no 'results' key
+
+    Raises:
+        ValueError: If the document is not valid JSON
+    """
+    document = loads(body)
+    if not isinstance(document, dict) or 'results' not in document:
+        return None
+
+    results = document['results']
+    if not results:
+        return pd.DataFrame()
+
+    table = pa.Table.from_pylist(results)
+    logger.debug("Decoded %d records into columns %s", table.num_rows, table.column_names)
+    return table.to_pandas()
@@ -0,0 +1,236 @@
+"""
+Module for extracting weather data through the dataset export endpoint.
+"""
+
+import logging
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+import requests
+
+from projet.src.api.extractor import APIExtractor, DEFAULT_SELECT, _to_utc
+from projet.src.entities.station import Station
+
+logger = logging.getLogger(__name__)
+
+
+class ExportExtractor(APIExtractor):
+    """
+    Extracts weather data from the `/exports/{format}` endpoint.
+
+    Unlike `/records`, an export is not paginated: the whole result is
+    streamed to a temporary file in chunks, then read column by column with
+    Arrow. This is the fastest way to ingest long histories, with a memory
+    footprint bounded by the batch size rather than by the number of records.
+
+    The connection pool, retries, circuit breaker and rate limiter are
+    inherited from `APIExtractor`. The response cache and recorder are not
+    used: exports are streamed to disk rather than read into memory.
+    """
+
+    FORMATS = ('parquet', 'csv')
+
+    def __init__(
+            self,
+            *args,
+            export_format: str = 'parquet',
+            chunk_size: int = 1024 * 1024,
+            batch_size: int = 10_000,
+            **kwargs
+    ):
+        """
+        Initialize the export extractor.
+
+        Args:
+            *args: Positional arguments of `APIExtractor`
+            export_format: Export format, 'parquet' or 'csv' (default: 'parquet')
+            chunk_size: Size of the chunks written to disk while downloading, in bytes
+            batch_size: Number of rows per DataFrame yielded by `extract_pages`
+            **kwargs: Keyword arguments of `APIExtractor`
+        """
+        if export_format not in self.FORMATS:
+            raise ValueError(f"Unsupported export format: {export_format}")
+        super().__init__(*args, **kwargs)
+        self.export_format = export_format
+        self.chunk_size = chunk_size
+        self.batch_size = batch_size
+
+    def extract(
+            self,
+            station: Station,
+            url_base: str | None = None,
+            select: str = DEFAULT_SELECT,
+            since: datetime | None = None,
+            **kwargs
+    ) -> pd.DataFrame:
+        """
+        Fetches the last 7 days of hourly records of a station in one export.
+
+        Args:
+            station (Station): Station object containing the target station's ID.
+            url_base (str, optional): Base URL overriding the extractor's `base_url`.
+            select (str, optional): Comma-separated list of fields to retrieve.
+            since (datetime, optional): Only fetch records strictly newer than this timestamp.
+
+        Returns:
+            pd.DataFrame: Records ordered by descending timestamp,
+                or an empty DataFrame if none matched or the request failed
+                (then with `df.attrs['request_failed']` set).
+        """
+        # pylint: disable=too-many-arguments, too-many-positional-arguments
+        try:
+            pages = list(self._export_batches(station, 7, since, select, url_base))
+        except requests.exceptions.RequestException as errex:
+            logger.error("Exception request: %s", errex)
+            failed = pd.DataFrame()
+            failed.attrs['request_failed'] = True
+            return failed
+        if not pages:
+            return pd.DataFrame()
+        return pd.concat(pages, ignore_index=True)
+
+    def extract_pages(
+            self,
+            station: Station,
+            days: int = 365,
+            window_days: int = 30,
+            stop_at: datetime | None = None,
+            select: str = DEFAULT_SELECT,
+            until: datetime | None = None
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Streams a long history for a station from a single export.
+
+        Args:
+            station (Station): Station object containing the target station's ID.
+            days (int, optional): Depth of the history to fetch, in days. Defaults to 365.
+            window_days (int, optional): Unused, exports are not paginated.
+            stop_at (datetime, optional): Timestamp of the most recent record already
+                stored; only newer records are exported.
+            select (str, optional): Comma-separated list of fields to retrieve.
+            until (datetime, optional): Only export records strictly older than this
+                timestamp (to resume an interrupted backfill).
+
+        Yields:
+            pd.DataFrame: Batches of at most `batch_size` records, most recent first.
+                Nothing is yielded if the request failed.
+        """
+        # pylint: disable=too-many-arguments, too-many-positional-arguments, unused-argument
+        try:
+            yield from self._export_batches(station, days, stop_at, select, until=until)
+        except requests.exceptions.RequestException as errex:
+            logger.error("Exception request: %s", errex)
+
+    def _export_batches(
+            self,
+            station: Station,
+            days: int,
+            since: datetime | None,
+            select: str,
+            url_base: str | None = None,
+            until: datetime | None = None
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Download an export to a temporary file and read it back in batches.
+
+        Args:
+            station: Station whose dataset is exported
+            days: Depth of the export, in days
+            since: Only export records strictly newer than this timestamp
+            select: Comma-separated list of fields to export
+            url_base: Base URL overriding the extractor's `base_url`
+            until: Only export records strictly older than this timestamp
+
+        Yields:
+            pd.DataFrame: Batches of records
+
+        Raises:
+            requests.exceptions.RequestException: If the download fails
+        """
+        # pylint: disable=too-many-arguments, too-many-positional-arguments, too-many-locals
+        url = f"{(url_base or self.base_url) + station.id}/exports/{self.export_format}"
+        where = self._sampled(f'heure_de_paris >= now(days=-{days})')
+        if since is not None:
+            where += f" and heure_de_paris > date'{_to_utc(since).isoformat()}'"
+        if until is not None:
+            where += f" and heure_de_paris < date'{_to_utc(until).isoformat()}'"
+        params = {'select': select, 'where': where, 'order_by': 'heure_de_paris desc'}
+        if self.export_format == 'csv':
+            params['delimiter'] = ';'
+
+        logger.info(
+            "Exporting data for station %s (ID: %s) from %s",
+            station.name,
+            station.id,
+            url
+        )
+
+        with tempfile.TemporaryDirectory(prefix='export_') as tmp_dir:
+            path = Path(tmp_dir) / f"{station.id}.{self.export_format}"
+            size = self._download(url, params, path)
+            logger.info("Downloaded %d bytes for station %s", size, station.name)
+            rows = 0
+            for batch in self._read_batches(path):
+                rows += batch.num_rows
+                yield batch.to_pandas()
+
+        if rows == 0:
+            logger.warning("No data returned for station %s (empty export)", station.name)
+        else:
+            logger.info("Successfully exported %d records for station %s", rows, station.name)
+
+    def _download(self, url: str, params: dict, path: Path) -> int:
+        """
+        Stream a response body to a file.
+
+        Args:
+            url: Export URL
+            params: Query parameters
+            path: Destination file
+
+        Returns:
+            int: Number of bytes written
+
+        Raises:
+            requests.exceptions.RequestException: If the request fails
+        """
+        size = 0
+        with self._send(url, params, stream=True) as response:
+            response.raise_for_status()
+            with open(path, 'wb') as file:
+                for chunk in response.iter_content(chunk_size=self.chunk_size):
+                    file.write(chunk)
+                    size += len(chunk)
+        return size
+
+    def _read_batches(self, path: Path) -> Iterator[pa.RecordBatch]:
+        """
+        Read a downloaded export as Arrow record batches.
+
+        Args:
+            path: Downloaded export file
+
+        Yields:
+            pa.RecordBatch: Non-empty batches of at most `batch_size` rows
+        """
+        if path.stat().st_size == 0:
+            return
+
+        if self.export_format == 'parquet':
+            batches = pq.ParquetFile(path).iter_batches(batch_size=self.batch_size)
+        else:
+            batches = pa_csv.open_csv(
+                path,
+                parse_options=pa_csv.ParseOptions(delimiter=';'),
+                read_options=pa_csv.ReadOptions(block_size=self.chunk_size)
+            )
+
+        for batch in batches:
+            if batch.num_rows:
+                yield batch
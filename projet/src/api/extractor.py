@@ -3,20 +3,81 @@ Module for extracting weather data from the Toulouse Métropole API.
 """
 
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, Iterator, Mapping
 import logging
+import time
+from urllib.parse import urlsplit
 import pandas as pd
 import requests
 
+from projet.src.api.decoder import decode_records, is_empty_page, loads
+from projet.src.api.http_session import HttpSessionPool
+from projet.src.api.rate_limiter import RateLimiter
+from projet.src.api.recorder import ResponseRecorder
+from projet.src.api.resilience import CircuitBreaker, RetryPolicy
+from projet.src.api.response_cache import ResponseCache
 from projet.src.entities.station import Station
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_SELECT = 'heure_de_paris, temperature_en_degre_c, humidite, pression'
+HOURLY_FILTER = 'minute(heure_de_paris) = 0'
+QUARTER_HOURLY_FILTER = (
+    'minute(heure_de_paris) = 0 or minute(heure_de_paris) = 15 '
+    'or minute(heure_de_paris) = 30 or minute(heure_de_paris) = 45'
+)
+
+# Ingestion resolutions: ODSQL sampling filter and number of pages fetched
+# by `extract`, so that every resolution covers about the same time span
+INGESTION_FILTERS = {
+    'hourly': HOURLY_FILTER,
+    '15min': QUARTER_HOURLY_FILTER,
+    'raw': None
+}
+INGESTION_PAGES = {
+    'hourly': 1,
+    '15min': 4,
+    'raw': 4
+}
+
+# Opendatasoft v2.1 limits: 100 records per call and offset + limit <= 10 000
+MAX_PAGE_SIZE = 100
+MAX_OFFSET = 10000
+# Grouped queries return one row per group, up to 20 000 groups per call
+MAX_GROUPS = 20000
+
+AGGREGATED_FIELDS = ('temperature_en_degre_c', 'humidite', 'pression')
+AGGREGATE_FUNCTIONS = ('avg', 'min', 'max')
+# Bucket format of each aggregation resolution, as understood by ODSQL date_format
+RESOLUTIONS = {
+    'hour': 'yyyy-MM-dd HH:00:00',
+    'day': 'yyyy-MM-dd',
+    'month': 'yyyy-MM'
+}
+
+
+@dataclass
+class ExtractionResult:
+    """
+    Outcome of the extraction of a single station within a batch.
+    """
+    station_id: str
+    data: pd.DataFrame
+    error: Exception | None = None
+
+    @property
+    def ok(self) -> bool:
+        """True if the extraction succeeded and returned records."""
+        return self.error is None and not self.data.empty
+
 
 class IDataExtractor(ABC):
     """
     Interface for data extraction.
     """
-    # pylint: disable=too-few-public-methods
 
     @abstractmethod
     def extract(self, station: Station, **kwargs) -> pd.DataFrame:
@@ -31,17 +92,67 @@ class IDataExtractor(ABC):
             pd.DataFrame: DataFrame containing the retrieved records.
         """
 
+    def extract_many(
+            self,
+            stations: Iterable[Station],
+            max_concurrency: int = 8,
+            since: Mapping[str, datetime | None] | None = None,
+            **kwargs
+    ) -> Iterator[ExtractionResult]:
+        """
+        Extract data for many stations in parallel.
+
+        Each station is extracted by `extract` on a thread pool; results are
+        yielded in completion order and an error on one station never
+        interrupts the others.
+
+        Args:
+            stations: Stations to extract.
+            max_concurrency: Maximum number of extractions running at once.
+            since: Most recent stored timestamp per station id, forwarded to
+                `extract` for an incremental extraction.
+            **kwargs: Additional arguments forwarded to `extract`.
+
+        Yields:
+            ExtractionResult: Result of each station, as soon as it completes.
+        """
+        executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix='extract')
+        try:
+            futures = {
+                executor.submit(
+                    self.extract, station, since=(since or {}).get(station.id), **kwargs
+                ): station
+                for station in stations
+            }
+            for future in as_completed(futures):
+                station = futures[future]
+                try:
+                    yield ExtractionResult(station.id, future.result())
+                except Exception as e:  # pylint: disable=broad-exception-caught
+                    logger.error("Extraction failed for station %s: %s", station.name, e)
+                    yield ExtractionResult(station.id, pd.DataFrame(), e)
+        finally:
+            # Drop pending extractions if the caller stops iterating early
+            executor.shutdown(wait=False, cancel_futures=True)
+
 
 class APIExtractor(IDataExtractor):
     """
     Extracts weather data from the Toulouse Métropole API.
     """
-    # pylint: disable=too-few-public-methods
+    # pylint: disable=too-many-instance-attributes
 
     def __init__(
             self,
             base_url: str = "https://data.toulouse-metropole.fr/api/explore/v2.1/catalog/datasets/",
-            timeout: int = 30
+            timeout: int = 30,
+            session_pool: HttpSessionPool | None = None,
+            cache: ResponseCache | None = None,
+            retry_policy: RetryPolicy | None = None,
+            circuit_breaker: CircuitBreaker | None = None,
+            rate_limiter: RateLimiter | None = None,
+            recorder: ResponseRecorder | None = None,
+            resolution: str = 'hourly'
     ):
         """
         Initialize the API extractor.
@@ -49,17 +160,41 @@ class APIExtractor(IDataExtractor):
         Args:
             base_url: Base URL of the API
             timeout: Request timeout in seconds (default: 10)
+            session_pool: Keep-alive connection pool shared with other clients
+                (default: a new pool owned by this extractor)
+            cache: On-disk response cache (default: no caching)
+            retry_policy: Retry policy for transient errors (default: 3 attempts)
+            circuit_breaker: Per-host circuit breaker shared with other clients
+                (default: a new breaker owned by this extractor)
+            rate_limiter: Rate limiter applied to every request
+                (default: the process-wide shared limiter)
+            recorder: Records responses to disk, or replays them without
+                any network access (default: disabled)
+            resolution: Sampling of the ingested records, 'hourly', '15min'
+                or 'raw' (every sample published by the station)
         """
+        # pylint: disable=too-many-arguments, too-many-positional-arguments
+        if resolution not in INGESTION_FILTERS:
+            raise ValueError(f"Unknown ingestion resolution: {resolution}")
         super().__init__()
         self.base_url = base_url
         self.timeout = timeout
-        logger.info("APIExtractor initialized with base_url: %s", base_url)
+        self.session_pool = session_pool or HttpSessionPool()
+        self.cache = cache
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.circuit_breaker = circuit_breaker or CircuitBreaker()
+        self.rate_limiter = rate_limiter or RateLimiter.shared()
+        self.recorder = recorder
+        self.resolution = resolution
+        logger.info("APIExtractor initialized with base_url: %s (%s records)",
+                    base_url, resolution)
 
     def extract(
             self,
             station: Station,
-            url_base: str = "https://data.toulouse-metropole.fr/api/explore/v2.1/catalog/datasets/",
-            select: str = 'heure_de_paris, temperature_en_degre_c, humidite, pression',
+            url_base: str | None = None,
+            select: str = DEFAULT_SELECT,
+            since: datetime | None = None,
             **kwargs
     ) -> pd.DataFrame:
         """
@@ -68,65 +203,503 @@ class APIExtractor(IDataExtractor):
         Args:
             station (Station): Station object containing the target station's ID.
             url_base (str, optional):
-                Base URL of the API endpoint. Defaults to Toulouse Métropole API.
+                Base URL of the API endpoint. Defaults to the extractor's `base_url`.
             select (str, optional): Comma-separated list of fields to retrieve. Defaults to:
                 - heure_de_paris (timestamp)
                 - temperature_en_degre_c (temperature in °C)
                 - humidite (humidity in %)
                 - pression (pressure in Pa)
+            since (datetime, optional): Timestamp of the most recent stored record.
+                When given, only strictly newer records are requested (incremental mode).
 
         Returns:
             pd.DataFrame:
                 DataFrame containing the retrieved records with columns as specified in `select`.
                 Rows are ordered by descending timestamp (most recent first).
-                Returns empty DataFrame if no records match the criteria.
+                Returns empty DataFrame if no records match the criteria; when
+                a request failed, `df.attrs['request_failed']` is set and the
+                pages already fetched are dropped, so that an incremental run
+                does not skip the missing older records.
 
         API Query Details:
-            - Time range: Last 7 days (heure_de_paris >= now(days=-7))
-            - Temporal resolution: Hourly data (minute(heure_de_paris) = 0)
-            - Limit: 100 most recent records matching criteria
+            - Time range: Last 7 days (heure_de_paris >= now(days=-7)),
+              and after `since` in incremental mode (heure_de_paris > since)
+            - Temporal resolution: The extractor's `resolution`
+              (hourly: minute(heure_de_paris) = 0)
+            - Limit: 100 most recent records matching criteria per page; sub-hourly
+              resolutions fetch several pages to cover the same time span
             """
-        station_name = station.name
-        station_id = station.id
-        url_final = f"{url_base + station_id}/records"
+        # pylint: disable=too-many-arguments, too-many-positional-arguments
+        url_final = self._records_url(station, url_base)
+        where = self._sampled('heure_de_paris >= now(days=-7)')
+        if since is not None:
+            where += f" and heure_de_paris > date'{_to_utc(since).isoformat()}'"
+
+        logger.info(
+            "Fetching data for station %s (ID: %s) from %s",
+            station.name,
+            station.id,
+            url_final
+        )
+        pages = []
+        for page_number in range(INGESTION_PAGES[self.resolution]):
+            param = {
+                'select': select,
+                'where': where,
+                'order_by': 'heure_de_paris desc',
+                'limit': str(MAX_PAGE_SIZE)
+            }
+            if page_number:
+                param['offset'] = str(page_number * MAX_PAGE_SIZE)
+            page = self._fetch_records(url_final, param, station.name)
+            if page is None:
+                if pages:
+                    logger.warning("Page %d failed for station %s: %d records dropped",
+                                   page_number + 1, station.name, sum(map(len, pages)))
+                failed = pd.DataFrame()
+                failed.attrs['request_failed'] = True
+                return failed
+            if page.empty:
+                break
+            pages.append(page)
+            if len(page) < MAX_PAGE_SIZE:
+                break
+
+        if not pages:
+            return pd.DataFrame()
+        df = pd.concat(pages, ignore_index=True) if len(pages) > 1 else pages[0]
+
+        logger.info("Successfully fetched %d records for station %s", len(df), station.name)
+        logger.debug("DataFrame columns: %s", df.columns.tolist())
+
+        return df
+
+    def extract_pages(
+            self,
+            station: Station,
+            days: int = 365,
+            window_days: int = 30,
+            stop_at: datetime | None = None,
+            select: str = DEFAULT_SELECT,
+            until: datetime | None = None
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Lazily fetches a long history for a station, one page at a time.
+
+        The requested range is split into date windows walked from the most
+        recent to the oldest; each window is paged with `offset` so that no
+        single query exceeds the API's offset limit.
+
+        Args:
+            station (Station): Station object containing the target station's ID.
+            days (int, optional): Depth of the history to fetch, in days. Defaults to 365.
+            window_days (int, optional): Size of a date window, in days. Defaults to 30.
+            stop_at (datetime, optional): Timestamp of the most recent record already
+                stored. Paging stops as soon as this timestamp is reached and only
+                newer records are yielded.
+            select (str, optional): Comma-separated list of fields to retrieve.
+            until (datetime, optional): Only fetch records strictly older than this
+                timestamp (to resume an interrupted backfill).
+
+        Yields:
+            pd.DataFrame: Pages of at most 100 records, most recent first.
+                Iteration stops early on a request error.
+        """
+        # pylint: disable=too-many-arguments, too-many-positional-arguments, too-many-locals
+        url_final = self._records_url(station)
+        now = datetime.now(timezone.utc).replace(microsecond=0)
+        oldest = now - timedelta(days=days)
+        newest = now if until is None else min(now, _to_utc(until).to_pydatetime())
+        if stop_at is not None:
+            stop_at = _to_utc(stop_at)
+            oldest = max(oldest, stop_at.to_pydatetime())
+
+        fetched = 0
+        logger.info(
+            "Backfilling station %s (ID: %s) from %s",
+            station.name,
+            station.id,
+            oldest.isoformat()
+        )
+
+        for where in self._date_windows(newest, oldest, window_days, self._sampling_filter):
+            for offset in range(0, MAX_OFFSET, MAX_PAGE_SIZE):
+                page = self._fetch_records(
+                    url_final,
+                    {
+                        'select': select,
+                        'where': where,
+                        'order_by': 'heure_de_paris desc',
+                        'limit': str(MAX_PAGE_SIZE),
+                        'offset': str(offset)
+                    },
+                    station.name
+                )
+                if page is None:
+                    return
+                if page.empty:
+                    break
+
+                page_size = len(page)
+                reached_stored = False
+                if stop_at is not None:
+                    is_new = pd.to_datetime(page['heure_de_paris'], utc=True) > stop_at
+                    reached_stored = not is_new.all()
+                    page = page[is_new].reset_index(drop=True)
+
+                if not page.empty:
+                    fetched += len(page)
+                    yield page
+
+                if reached_stored:
+                    logger.info(
+                        "Reached stored data for station %s after %d records",
+                        station.name,
+                        fetched
+                    )
+                    return
+
+                if page_size < MAX_PAGE_SIZE:
+                    break
+            else:
+                logger.warning(
+                    "Offset limit reached for station %s, window '%s' is truncated",
+                    station.name,
+                    where
+                )
+
+        logger.info("Backfill finished for station %s: %d records", station.name, fetched)
+
+    def extract_aggregates(
+            self,
+            station: Station,
+            resolution: str = 'day',
+            days: int = 365,
+            fields: Iterable[str] = AGGREGATED_FIELDS,
+            url_base: str | None = None
+    ) -> pd.DataFrame:
+        """
+        Fetches pre-aggregated records, computed server-side.
+
+        The grouping and the `avg` / `min` / `max` aggregations are pushed
+        down to the API with `group_by`, so a year of daily aggregates is a
+        single request of 365 rows instead of thousands of raw records.
+
+        Args:
+            station (Station): Station object containing the target station's ID.
+            resolution (str, optional): Size of the buckets, 'hour', 'day' or 'month'.
+                Defaults to 'day'.
+            days (int, optional): Depth of the range to aggregate, in days. Defaults to 365.
+            fields (Iterable[str], optional): Numeric fields to aggregate.
+            url_base (str, optional): Base URL overriding the extractor's `base_url`.
+
+        Returns:
+            pd.DataFrame: One row per bucket, most recent first, with the bucket
+                start in `heure_de_paris` (UTC) and one `<field>_<avg|min|max>`
+                column per aggregate. The resolution is stored in
+                `df.attrs['resolution']`. Empty if the request failed.
+
+        Raises:
+            ValueError: If the resolution is unknown
+        """
+        # pylint: disable=too-many-arguments, too-many-positional-arguments
+        if resolution not in RESOLUTIONS:
+            raise ValueError(f"Unknown aggregation resolution: {resolution}")
+
+        bucket = f"date_format(heure_de_paris, '{RESOLUTIONS[resolution]}')"
+        aggregates = ', '.join(
+            f'{function}({field}) as {field}_{function}'
+            for field in fields
+            for function in AGGREGATE_FUNCTIONS
+        )
         param = {
-            'select': select,
-            'where': 'heure_de_paris >= now(days=-7) and minute(heure_de_paris) = 0',
-            'order_by': 'heure_de_paris desc',
-            'limit': '100'
+            'select': f'{bucket} as periode, {aggregates}',
+            'where': f'heure_de_paris >= now(days=-{days})',
+            'group_by': 'periode',
+            'order_by': 'periode desc',
+            'timezone': 'UTC',
+            'limit': str(MAX_GROUPS)
         }
 
-        try:
+        logger.info(
+            "Fetching %s aggregates over %d days for station %s (ID: %s)",
+            resolution,
+            days,
+            station.name,
+            station.id
+        )
+        df = self._fetch_records(self._records_url(station, url_base), param, station.name)
+
+        if df is None or df.empty:
+            df = pd.DataFrame()
+        else:
+            df = df.rename(columns={'periode': 'heure_de_paris'})
+            df['heure_de_paris'] = pd.to_datetime(df['heure_de_paris'], utc=True)
             logger.info(
-                "Fetching data for station %s (ID: %s) from %s",
-                station_name,
-                station_id,
-                url_final
+                "Successfully fetched %d %s aggregates for station %s",
+                len(df),
+                resolution,
+                station.name
             )
-            logger.debug("Query parameters: %s", param)
 
-            response = requests.get(url_final, params=param, timeout=self.timeout)
+        df.attrs['resolution'] = resolution
+        return df
 
-            response.raise_for_status()
+    @property
+    def _sampling_filter(self) -> str | None:
+        """ODSQL filter selecting the samples of the ingestion resolution."""
+        return INGESTION_FILTERS[self.resolution]
 
-            json_data = response.json()
+    def _sampled(self, where: str) -> str:
+        """
+        Restrict a `where` clause to the samples of the ingestion resolution.
 
-            if 'results' not in json_data:
-                logger.warning("No 'results' key in API response for station %s", station_name)
-                return pd.DataFrame()
+        Args:
+            where: ODSQL `where` clause
 
-            results = json_data['results']
+        Returns:
+            str: The clause, with the sampling filter appended if any
+        """
+        if self._sampling_filter is None:
+            return where
+        return f'{where} and ({self._sampling_filter})'
 
-            if not results:
-                logger.warning("No data returned for station %s (empty results)", station_name)
-                return pd.DataFrame()
+    @staticmethod
+    def _date_windows(
+            newest: datetime,
+            oldest: datetime,
+            window_days: int,
+            sampling_filter: str | None = HOURLY_FILTER
+    ) -> Iterator[str]:
+        """
+        Split a time range into `where` clauses of consecutive date windows.
 
-            df = pd.DataFrame(results)
-            logger.info("Successfully fetched %d records for station %s", len(df), station_name)
-            logger.debug("DataFrame columns: %s", df.columns.tolist())
+        Args:
+            newest: Upper bound of the range
+            oldest: Lower bound of the range
+            window_days: Size of a window, in days
+            sampling_filter: ODSQL filter appended to every window (None for all samples)
 
-            return df
+        Yields:
+            str: ODSQL `where` clause of each window, most recent first
+        """
+        window_end = newest
+        while window_end > oldest:
+            window_start = max(window_end - timedelta(days=window_days), oldest)
+            where = (
+                f"heure_de_paris >= date'{window_start.isoformat()}' "
+                f"and heure_de_paris < date'{window_end.isoformat()}'"
+            )
+            yield where if sampling_filter is None else f'{where} and ({sampling_filter})'
+            window_end = window_start
 
-        except requests.exceptions.RequestException as errex:
+    def _records_url(self, station: Station, url_base: str | None = None) -> str:
+        """
+        Build the records endpoint URL of a station dataset.
+
+        Args:
+            station: Station whose dataset is queried
+            url_base: Base URL overriding the extractor's `base_url`
+
+        Returns:
+            str: URL of the `/records` endpoint
+        """
+        return f"{(url_base or self.base_url) + station.id}/records"
+
+    def _fetch_records(self, url: str, params: dict, station_name: str) -> pd.DataFrame | None:
+        """
+        Execute a single query against the records endpoint.
+
+        Args:
+            url: URL of the `/records` endpoint
+            params: Query parameters
+            station_name: Name of the station (for log messages)
+
+        Returns:
+            pd.DataFrame | None: The `results` array decoded into columns
+                (possibly empty), or None if the request failed.
+        """
+        logger.debug("Query parameters: %s", params)
+        try:
+            records = decode_records(self._get_body(url, params))
+
+        except (requests.exceptions.RequestException, ValueError) as errex:
             logger.error("Exception request: %s", errex)
+            return None
+
+        if records is None:
+            logger.warning("No 'results' key in API response for station %s", station_name)
             return pd.DataFrame()
+
+        if records.empty:
+            logger.warning("No data returned for station %s (empty results)", station_name)
+        return records
+
+    def fetch_json(self, url: str, params: dict) -> object:
+        """
+        GET any JSON document of the API through this extractor's transport
+        (recorder, cache, retries, circuit breaker and rate limiter).
+
+        Args:
+            url: Request URL
+            params: Query parameters
+
+        Returns:
+            object: The decoded document
+
+        Raises:
+            requests.exceptions.RequestException: If the request fails
+            ValueError: If the response is not valid JSON
+        """
+        return loads(self._get_body(url, params))
+
+    def _get_body(self, url: str, params: dict) -> bytes:
+        """
+        GET a response body, recording it or replaying it when enabled.
+
+        Args:
+            url: Request URL
+            params: Query parameters
+
+        Returns:
+            bytes: Raw response body
+
+        Raises:
+            requests.exceptions.RequestException: If the request fails,
+                or if no response was recorded for it in replay mode
+        """
+        if self.recorder is not None and self.recorder.is_replaying:
+            return self.recorder.load(url, params)
+
+        body = self._fetch_body(url, params)
+        if self.recorder is not None:
+            self.recorder.save(url, params, body)
+        return body
+
+    def _fetch_body(self, url: str, params: dict) -> bytes:
+        """
+        GET a response body, going through the response cache when enabled.
+
+        A fresh cached response is served without any request; a stale one
+        is revalidated with its ETag / Last-Modified validators. Pages
+        without records are not cached: an incremental query run before the
+        hourly record is published must not hide it until the entry expires.
+
+        Args:
+            url: Request URL
+            params: Query parameters
+
+        Returns:
+            bytes: Raw response body
+
+        Raises:
+            requests.exceptions.RequestException: If the request fails
+        """
+        if self.cache is None:
+            response = self._send(url, params)
+            response.raise_for_status()
+            return response.content
+
+        key = self.cache.make_key(url, params)
+        cached = self.cache.get(key)
+        if cached is not None and cached.is_fresh:
+            logger.debug("Cache hit for %s", url)
+            return cached.body
+
+        headers = cached.revalidation_headers() if cached is not None else {}
+        response = self._send(url, params, headers)
+
+        if response.status_code == 304 and cached is not None:
+            logger.debug("Cached response revalidated for %s", url)
+            return self.cache.refresh(key, cached).body
+
+        response.raise_for_status()
+        if is_empty_page(response.content):
+            logger.debug("Empty page not cached for %s", url)
+        else:
+            self.cache.put(key, response.content, response.headers)
+        return response.content
+
+    def _send(
+            self,
+            url: str,
+            params: dict,
+            headers: dict | None = None,
+            stream: bool = False
+    ) -> requests.Response:
+        """
+        GET a URL with retries and circuit breaking.
+
+        Connection errors, timeouts and retryable statuses (429, 5xx) are
+        retried with jittered exponential backoff; every attempt waits for
+        a token of the rate limiter. Once retries are exhausted, or on any
+        other error, the failure counts towards opening the host's circuit;
+        while it is open, requests fail immediately instead of waiting for
+        the timeout.
+
+        Args:
+            url: Request URL
+            params: Query parameters
+            headers: Additional request headers
+            stream: Defer the download of the body (see `Response.iter_content`)
+
+        Returns:
+            requests.Response: The last response received (may be an error status)
+
+        Raises:
+            CircuitOpenError: If the host's circuit is open
+            requests.exceptions.RequestException: If every attempt failed without response
+        """
+        host = urlsplit(url).netloc
+        self.circuit_breaker.before_request(host)
+        session = self.session_pool.session
+        policy = self.retry_policy
+
+        for attempt in range(policy.max_attempts):
+            retry_after = None
+            self.rate_limiter.acquire()
+            try:
+                response = session.get(url, params=params, headers=headers,
+                                       timeout=self.timeout, stream=stream)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as errex:
+                error, response = errex, None
+                logger.warning("Attempt %d/%d failed for %s: %s",
+                               attempt + 1, policy.max_attempts, url, errex)
+            except Exception:
+                # Not retried, but counted: a half-open trial must never stay pending
+                self.circuit_breaker.record_failure(host)
+                raise
+            else:
+                if not policy.is_retryable(response.status_code):
+                    self.circuit_breaker.record_success(host)
+                    return response
+                error, retry_after = None, response.headers.get('Retry-After')
+                logger.warning("Attempt %d/%d for %s returned HTTP %s",
+                               attempt + 1, policy.max_attempts, url, response.status_code)
+
+            if attempt + 1 < policy.max_attempts:
+                if response is not None:
+                    # Give the pooled connection back before retrying
+                    response.close()
+                time.sleep(policy.delay(attempt, retry_after))
+
+        self.circuit_breaker.record_failure(host)
+        if response is None:
+            raise error
+        return response
+
+
+def _to_utc(timestamp: datetime) -> pd.Timestamp:
+    """
+    Convert a timestamp to UTC, assuming UTC for naive values.
+
+    Args:
+        timestamp: Naive or timezone-aware timestamp
+
+    Returns:
+        pd.Timestamp: Timezone-aware UTC timestamp
+    """
+    timestamp = pd.Timestamp(timestamp)
+    if timestamp.tzinfo is None:
+        return timestamp.tz_localize('UTC')
+    return timestamp.tz_convert('UTC')
@@ -0,0 +1,76 @@
+"""
+Module providing a pooled, keep-alive HTTP session shared by the API clients.
+"""
+
+import logging
+import threading
+import weakref
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+
+logger = logging.getLogger(__name__)
+
+
+class HttpSessionPool:
+    """
+    Thread-safe pool of keep-alive HTTP connections.
+
+    A single `HTTPAdapter` (and therefore a single urllib3 connection pool)
+    is mounted in one `requests.Session` per thread: connections and their
+    TLS handshakes are reused by every thread, while each thread keeps its
+    own session state. Sessions are only tracked weakly: the session of a
+    finished thread (e.g. a worker of a short-lived executor) is released
+    with it, and never owns connections of its own.
+    """
+
+    def __init__(self, pool_size: int = 10):
+        """
+        Initialize the connection pool.
+
+        Args:
+            pool_size: Maximum number of connections kept alive per host
+        """
+        self.pool_size = pool_size
+        self._adapter = HTTPAdapter(pool_maxsize=pool_size)
+        self._local = threading.local()
+        self._sessions: weakref.WeakSet[requests.Session] = weakref.WeakSet()
+        self._lock = threading.Lock()
+        logger.info(
+            "HttpSessionPool initialized with pool_size: %s (Accept-Encoding: %s)",
+            pool_size,
+            ACCEPT_ENCODING
+        )
+
+    @property
+    def session(self) -> requests.Session:
+        """
+        Get the session bound to the calling thread, creating it on first use.
+
+        Returns:
+            requests.Session: Session sharing the pool's connections
+        """
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            # Compressed payloads: gzip/deflate, plus brotli when installed
+            session.headers['Accept-Encoding'] = ACCEPT_ENCODING
+            session.mount('https://', self._adapter)
+            session.mount('http://', self._adapter)
+            self._local.session = session
+            with self._lock:
+                self._sessions.add(session)
+        return session
+
+    def close(self) -> None:
+        """
+        Close every session and release the pooled connections.
+        """
+        with self._lock:
+            sessions, self._sessions = list(self._sessions), weakref.WeakSet()
+        for session in sessions:
+            session.close()
+        self._adapter.close()
+        self._local = threading.local()
+        logger.info("HttpSessionPool closed (%d sessions)", len(sessions))
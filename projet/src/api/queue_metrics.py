@@ -0,0 +1,135 @@
+"""
+Module recording the wait times, run times and depth of the request queue.
+"""
+
+import math
+import threading
+import time
+from collections import Counter, deque
+from typing import NamedTuple
+
+# Upper bounds of the histogram buckets, in seconds
+HISTOGRAM_BUCKETS = (0.1, 0.5, 1, 2, 5, 10, 30, 60, math.inf)
+
+PERCENTILES = (50, 90, 99)
+
+
+class TaskSample(NamedTuple):
+    """
+    Measures of one finished task.
+    """
+    name: str
+    priority: str
+    wait: float
+    run: float
+    outcome: str
+
+
+def summarize(values: list[float]) -> dict:
+    """
+    Summarize a series of durations.
+
+    Args:
+        values: Durations, in seconds
+
+    Returns:
+        dict: 'count', 'mean', 'max', the 'p50'/'p90'/'p99' percentiles
+            (nearest rank) and the 'histogram' of counts per bucket upper bound
+    """
+    if not values:
+        return {'count': 0}
+    ordered = sorted(values)
+    summary = {
+        'count': len(ordered),
+        'mean': sum(ordered) / len(ordered),
+        'max': ordered[-1]
+    }
+    for percentile in PERCENTILES:
+        rank = max(1, math.ceil(percentile / 100 * len(ordered)))
+        summary[f'p{percentile}'] = ordered[rank - 1]
+    histogram = dict.fromkeys(HISTOGRAM_BUCKETS, 0)
+    for value in ordered:
+        histogram[next(bound for bound in HISTOGRAM_BUCKETS if value <= bound)] += 1
+    summary['histogram'] = histogram
+    return summary
+
+
+class QueueMetrics:
+    """
+    Rolling in-memory metrics of the `ApiRequestQueue`.
+
+    The last `window` finished tasks are kept with their enqueue-to-start
+    latency, execution time and outcome, and the queue depth is sampled at
+    most every `depth_interval` seconds over the last `window` samples, so
+    memory stays bounded however long the application runs.
+    """
+
+    def __init__(self, window: int = 1000, depth_interval: float = 1.0):
+        """
+        Args:
+            window: Number of tasks and depth samples kept
+            depth_interval: Minimum delay between two depth samples, in seconds
+        """
+        self.depth_interval = depth_interval
+        self._tasks: deque[TaskSample] = deque(maxlen=window)
+        self._depths: deque[tuple[float, int]] = deque(maxlen=window)
+        self._outcomes: Counter[str] = Counter()
+        self._lock = threading.Lock()
+
+    def record_task(self, sample: TaskSample) -> None:
+        """
+        Record a finished task.
+
+        Args:
+            sample: Measures of the task
+        """
+        with self._lock:
+            self._tasks.append(sample)
+            self._outcomes[sample.outcome] += 1
+
+    def record_depth(self, depth: int, now: float | None = None) -> None:
+        """
+        Sample the number of waiting tasks.
+
+        Args:
+            depth: Number of waiting tasks
+            now: Wall-clock time of the sample (default: now)
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            if self._depths and now - self._depths[-1][0] < self.depth_interval:
+                # Keep the highest depth of the interval
+                if depth > self._depths[-1][1]:
+                    self._depths[-1] = (self._depths[-1][0], depth)
+                return
+            self._depths.append((now, depth))
+
+    def snapshot(self) -> dict:
+        """
+        Summarize the recorded metrics.
+
+        Returns:
+            dict: 'outcomes' (total count of each outcome since start), 'wait'
+                and 'run' summaries of the recent tasks (see `summarize`),
+                'by_task' run time summaries per task name, and 'depth' with
+                the 'max' and the '(time, depth)' 'history' of the samples
+        """
+        with self._lock:
+            tasks = list(self._tasks)
+            depths = list(self._depths)
+            outcomes = dict(self._outcomes)
+
+        started = [task for task in tasks if task.outcome in ('succeeded', 'failed')]
+        by_task: dict[str, list[float]] = {}
+        for task in started:
+            by_task.setdefault(task.name, []).append(task.run)
+        return {
+            'outcomes': outcomes,
+            'wait': summarize([task.wait for task in started]),
+            'run': summarize([task.run for task in started]),
+            'by_task': {name: summarize(runs) for name, runs in by_task.items()},
+            'depth': {
+                'max': max((depth for _, depth in depths), default=0),
+                'history': depths
+            }
+        }
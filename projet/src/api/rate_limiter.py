@@ -0,0 +1,90 @@
+"""
+Module providing the client-side rate limiter shared by all API traffic.
+"""
+
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimiter:
+    """
+    Token bucket rate limiter, thread-safe and fair.
+
+    The bucket is implemented as a virtual schedule (GCRA): each caller
+    reserves the next free slot under a lock, then sleeps outside of it
+    until that slot. Callers are therefore served in arrival order and
+    never fail, they only wait.
+
+    `RateLimiter.shared()` returns the process-wide instance used by
+    default by every API client.
+    """
+
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, rate: float | None = 5.0, burst: int = 10):
+        """
+        Args:
+            rate: Sustained number of requests per second (None or 0 disables limiting)
+            burst: Number of requests allowed back to back when the bucket is full
+        """
+        self._lock = threading.Lock()
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tat = 0.0  # Theoretical arrival time of the next request
+
+    @classmethod
+    def shared(cls) -> 'RateLimiter':
+        """
+        Get the process-wide rate limiter, creating it with defaults on first use.
+
+        Returns:
+            RateLimiter: The shared instance
+        """
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    def configure(self, rate: float | None, burst: int) -> None:
+        """
+        Change the limits, keeping the callers already waiting in line.
+
+        Args:
+            rate: Sustained number of requests per second (None or 0 disables limiting)
+            burst: Number of requests allowed back to back
+        """
+        with self._lock:
+            self.rate = rate
+            self.burst = max(1, burst)
+        logger.info("RateLimiter configured: %s req/s, burst %s", rate, burst)
+
+    def acquire(self, timeout: float | None = None) -> bool:
+        """
+        Wait for a token.
+
+        Args:
+            timeout: Maximum wait in seconds (None waits as long as needed)
+
+        Returns:
+            bool: True once a token is acquired, False if it could not be
+                acquired within `timeout` (no token is consumed then)
+        """
+        with self._lock:
+            if not self.rate:
+                return True
+            interval = 1.0 / self.rate
+            now = time.monotonic()
+            tat = max(self._tat, now) + interval
+            wait = tat - self.burst * interval - now
+            if timeout is not None and wait > timeout:
+                return False
+            self._tat = tat
+
+        if wait > 0:
+            logger.debug("Rate limit reached, waiting %.3fs", wait)
+            time.sleep(wait)
+        return True
@@ -0,0 +1,116 @@
+"""
+Module for recording API responses to disk and replaying them offline.
+"""
+
+import json
+import logging
+from pathlib import Path
+from typing import Iterator, Mapping
+from urllib.parse import urlsplit
+
+import requests
+
+from projet.src.api.response_cache import ResponseCache
+
+logger = logging.getLogger(__name__)
+
+
+class ReplayMissError(requests.exceptions.RequestException):
+    """Exception raised in replay mode when no response was recorded for a request."""
+
+
+class ResponseRecorder:
+    """
+    Records API responses as JSON "cassettes" and replays them.
+
+    Cassettes are keyed by URL path and query parameters, not by host, so a
+    recording made against the live API can be replayed by the extractor or
+    served by the local `StubApiServer`.
+
+    Modes:
+        - 'record': every response received is written to disk
+        - 'replay': responses are served from disk, the network is never used
+    """
+
+    MODES = ('record', 'replay')
+
+    def __init__(self, cassette_dir: Path, mode: str = 'replay'):
+        """
+        Args:
+            cassette_dir: Cassette storage directory
+            mode: 'record' or 'replay'
+        """
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown recorder mode: {mode}")
+        self.cassette_dir = Path(cassette_dir)
+        self.cassette_dir.mkdir(parents=True, exist_ok=True)
+        self.mode = mode
+        logger.info("ResponseRecorder in '%s' mode with cassettes in %s", mode, self.cassette_dir)
+
+    @property
+    def is_replaying(self) -> bool:
+        """True if responses must be served from the cassettes."""
+        return self.mode == 'replay'
+
+    @staticmethod
+    def make_key(url: str, params: Mapping[str, str] | None = None) -> str:
+        """
+        Build the host-independent key of a request.
+
+        Args:
+            url: Request URL (or path)
+            params: Query parameters
+
+        Returns:
+            str: Key of the cassette
+        """
+        return ResponseCache.make_key(urlsplit(url).path, params)
+
+    def save(self, url: str, params: Mapping[str, str] | None, body: bytes) -> None:
+        """
+        Record a response (no-op unless in 'record' mode).
+
+        Args:
+            url: Request URL
+            params: Query parameters
+            body: Raw response body
+        """
+        if self.mode != 'record':
+            return
+        cassette = {
+            'path': urlsplit(url).path,
+            'params': dict(params or {}),
+            'body': body.decode('utf-8')
+        }
+        path = self.cassette_dir / f"{self.make_key(url, params)}.json"
+        path.write_text(json.dumps(cassette, ensure_ascii=False), encoding='utf-8')
+        logger.debug("Recorded response for %s into %s", url, path.name)
+
+    def load(self, url: str, params: Mapping[str, str] | None) -> bytes:
+        """
+        Replay a recorded response.
+
+        Args:
+            url: Request URL
+            params: Query parameters
+
+        Returns:
+            bytes: Recorded response body
+
+        Raises:
+            ReplayMissError: If no response was recorded for this request
+        """
+        path = self.cassette_dir / f"{self.make_key(url, params)}.json"
+        if not path.exists():
+            raise ReplayMissError(f"No recorded response for {url} with {dict(params or {})}")
+        return json.loads(path.read_text(encoding='utf-8'))['body'].encode('utf-8')
+
+    def cassettes(self) -> Iterator[dict]:
+        """
+        Iterate over every recorded cassette.
+
+        Yields:
+            dict: Cassette with its 'path', 'params' and 'body'
+        """
+        for path in sorted(self.cassette_dir.glob('*.json')):
+            yield json.loads(path.read_text(encoding='utf-8'))
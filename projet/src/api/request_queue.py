@@ -2,27 +2,419 @@
 Module for managing a queue to execute tasks (such as API requests)
 in the background to avoid blocking the main application.
 """
+# pylint: disable=too-many-lines
 
+import itertools
 import queue
 import logging
+import sqlite3
 import threading
-from typing import Callable, Any
+import time
+from collections import Counter, deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from functools import partial
+from enum import IntEnum
+from typing import Callable, Any, Hashable, Mapping, NamedTuple
+
+from projet.src.api.queue_metrics import QueueMetrics, TaskSample
+from projet.src.api.task_store import SqliteTaskStore, decode_kwargs
+from projet.src.entities.station import Station
 
 
 logger = logging.getLogger(__name__)
 
 
+OVERFLOW_POLICIES = ('reject', 'drop_oldest', 'drop_lowest_priority', 'block')
+
+
+class QueueFullError(Exception):
+    """Exception set on the handle of a task rejected or evicted by a full queue."""
+
+
+class TaskPriority(IntEnum):
+    """
+    Priority of a queued task (lower values run first).
+    """
+    INTERACTIVE = 0  # Refresh of the station displayed to the user
+    PREFETCH = 1     # Anticipated refresh of a station the user may display next
+    BACKGROUND = 2   # Scheduled refreshes and backfills
+
+
+class TaskHandle(Future):
+    """
+    Future of a request added to the `ApiRequestQueue`.
+
+    Every request gets its own handle, even when it is merged into a task
+    with the same key: cancelling it withdraws only this request, and the
+    task is dropped before execution once all its requests are cancelled.
+    A running task cannot be cancelled.
+    """
+
+    def __init__(self, dedupe_key: Hashable | None = None, queued: bool = True):
+        """
+        Args:
+            dedupe_key: Key of the task, if any
+            queued: False if the request was merged into a pending or running task
+        """
+        super().__init__()
+        self.dedupe_key = dedupe_key
+        self.queued = queued
+
+    @property
+    def status(self) -> str:
+        """
+        State of the request.
+
+        Returns:
+            str: 'pending', 'running', 'cancelled', 'failed' or 'done'
+        """
+        if self.cancelled():
+            return 'cancelled'
+        if self.running():
+            return 'running'
+        if not self.done():
+            return 'pending'
+        return 'failed' if self.exception() is not None else 'done'
+
+
+class _QueuedTask(NamedTuple):
+    """
+    Task waiting in the queue.
+    """
+    task: Callable[..., Any]
+    args: tuple
+    kwargs: dict
+    on_complete: Callable[[], None] | None
+    dedupe_key: Hashable | None = None
+    sequence: int = 0
+    cpu_bound: bool = False
+    priority: TaskPriority = TaskPriority.BACKGROUND
+    enqueued_at: float = 0.0
+    handle: TaskHandle | None = None
+    deadline: float | None = None
+    task_id: int | None = None
+    ordered: bool = False
+
+# Completion callback and handle of a request merged into a keyed task
+_Waiter = tuple[Callable[[], None] | None, TaskHandle]
+
+
+class _PriorityTaskQueue:
+    """
+    Task queue with one FIFO lane per priority, and aging.
+
+    The next task is the head of the lane with the best effective priority:
+    its priority, raised by one level per `aging_interval` seconds spent
+    waiting, so that background work is never starved by a steady flow of
+    interactive tasks. It has the interface of `queue.Queue` used by the
+    workers (`put`, `get`, `task_done`, `join`, `empty`, `qsize`, `full`).
+    """
+    # pylint: disable=too-many-instance-attributes
+
+    def __init__(self, aging_interval: float | None = 10.0, maxsize: int = 0):
+        """
+        Args:
+            aging_interval: Waiting time that raises a task by one priority
+                level, in seconds (None disables aging)
+            maxsize: Maximum number of waiting tasks (0 for no limit)
+        """
+        self.aging_interval = aging_interval
+        self.maxsize = maxsize
+        self._lanes: dict[TaskPriority, deque[_QueuedTask]] = {
+            priority: deque() for priority in TaskPriority
+        }
+        self._size = 0
+        self._unfinished = 0
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._not_full = threading.Condition(self._lock)
+        self._all_done = threading.Condition(self._lock)
+
+    def put(self, item: _QueuedTask) -> None:
+        """
+        Append a task to the lane of its priority.
+
+        Raises:
+            queue.Full: If `maxsize` tasks are already waiting
+        """
+        with self._lock:
+            if self.full():
+                raise queue.Full
+            self._lanes[item.priority].append(item)
+            self._size += 1
+            self._unfinished += 1
+            self._not_empty.notify()
+
+    def get(self, timeout: float | None = None) -> _QueuedTask:
+        """
+        Remove and return the next task; ordered tasks are numbered in start order.
+
+        Args:
+            timeout: Maximum wait for a task, in seconds (None waits forever)
+
+        Raises:
+            queue.Empty: If no task arrived within `timeout`
+        """
+        with self._not_empty:
+            if not self._not_empty.wait_for(lambda: self._size > 0, timeout):
+                raise queue.Empty
+            now = time.monotonic()
+            lane = min(
+                (lane for lane in self._lanes.values() if lane),
+                key=lambda lane: (self._effective_priority(lane[0], now), lane[0].enqueued_at)
+            )
+            self._size -= 1
+            self._not_full.notify()
+            item = lane.popleft()
+            if item.ordered:
+                item = item._replace(sequence=next(self._sequence))
+            return item
+
+    def wait_for_room(self, timeout: float | None = None) -> bool:
+        """
+        Wait until a task can be added.
+
+        Args:
+            timeout: Maximum wait, in seconds (None waits forever)
+
+        Returns:
+            bool: True if the queue is no longer full
+        """
+        with self._not_full:
+            return self._not_full.wait_for(lambda: not self.full(), timeout)
+
+    def evict_oldest(self) -> _QueuedTask | None:
+        """
+        Remove the task that has been waiting the longest.
+
+        Returns:
+            _QueuedTask | None: Removed task, None if the queue is empty
+        """
+        with self._lock:
+            lanes = [lane for lane in self._lanes.values() if lane]
+            if not lanes:
+                return None
+            lane = min(lanes, key=lambda lane: lane[0].enqueued_at)
+            return self._remove(lane, lane[0])
+
+    def evict_lowest(self, priority: TaskPriority) -> _QueuedTask | None:
+        """
+        Remove the most recent task of the lowest priority lane, if that
+        priority is lower than the one of the task to add.
+
+        Args:
+            priority: Priority of the task to add
+
+        Returns:
+            _QueuedTask | None: Removed task, None if no waiting task has a lower priority
+        """
+        with self._lock:
+            for lane_priority in reversed(TaskPriority):
+                if lane_priority <= priority:
+                    return None
+                lane = self._lanes[lane_priority]
+                if lane:
+                    return self._remove(lane, lane[-1])
+            return None
+
+    def discard(self, predicate: Callable[[_QueuedTask], bool]) -> _QueuedTask | None:
+        """
+        Remove the first waiting task matching a predicate.
+
+        Args:
+            predicate: Test selecting the task to remove
+
+        Returns:
+            _QueuedTask | None: Removed task, None if no waiting task matches
+        """
+        with self._lock:
+            for lane in self._lanes.values():
+                for item in lane:
+                    if predicate(item):
+                        return self._remove(lane, item)
+            return None
+
+    def promote(self, dedupe_key: Hashable, priority: TaskPriority) -> bool:
+        """
+        Move a pending task to a higher priority lane, keeping its age.
+
+        Args:
+            dedupe_key: Key of the pending task
+            priority: New priority
+
+        Returns:
+            bool: True if a task with a lower priority was promoted
+        """
+        with self._lock:
+            for lane_priority in TaskPriority:
+                if lane_priority <= priority:
+                    continue
+                lane = self._lanes[lane_priority]
+                for item in lane:
+                    if item.dedupe_key == dedupe_key:
+                        lane.remove(item)
+                        promoted = item._replace(priority=priority)
+                        target = self._lanes[priority]
+                        # Keep the target lane ordered by enqueue time
+                        index = sum(1 for other in target if other.enqueued_at <= item.enqueued_at)
+                        target.insert(index, promoted)
+                        return True
+        return False
+
+    def task_done(self) -> None:
+        """Mark a task taken with `get` as finished."""
+        with self._lock:
+            self._unfinished -= 1
+            if self._unfinished <= 0:
+                self._all_done.notify_all()
+
+    def join(self) -> None:
+        """Block until every queued task is finished."""
+        with self._all_done:
+            self._all_done.wait_for(lambda: self._unfinished <= 0)
+
+    def empty(self) -> bool:
+        """True if no task is waiting."""
+        return self._size == 0
+
+    def full(self) -> bool:
+        """True if `maxsize` tasks are waiting."""
+        return 0 < self.maxsize <= self._size
+
+    def qsize(self) -> int:
+        """Number of waiting tasks."""
+        return self._size
+
+    def _remove(self, lane: deque[_QueuedTask], item: _QueuedTask) -> _QueuedTask:
+        """Remove a waiting task that will never be run (the lock must be held)."""
+        lane.remove(item)
+        self._size -= 1
+        self._unfinished -= 1
+        self._not_full.notify()
+        if self._unfinished <= 0:
+            self._all_done.notify_all()
+        return item
+
+    def _effective_priority(self, item: _QueuedTask, now: float) -> float:
+        """Priority of a task, raised by the time it has been waiting."""
+        if not self.aging_interval:
+            return item.priority
+        return item.priority - (now - item.enqueued_at) / self.aging_interval
+
+
 class ApiRequestQueue:
     """
     Manages a queue to execute tasks (such as API requests)
     in the background to avoid blocking the main application.
+
+    Tasks are executed by a pool of worker threads, so that one slow API
+    call does not hold back the others; CPU-heavy tasks can be offloaded to
+    a pool of processes. Completion callbacks run as soon as their task
+    finishes, except for tasks added with `ordered=True`, whose callbacks
+    run in the order in which they were started, whatever the order in
+    which they finish. Tasks with the same key never run concurrently, so
+    their callbacks are always in order.
+
+    Each task has a `TaskPriority`: interactive refreshes of the displayed
+    station start before prefetches and background work, which age so
+    that they are not starved.
+
+    Tasks added with a `dedupe_key` (e.g. a station id) are coalesced: a
+    task whose key is already pending or running is not queued again, its
+    callback is attached to the existing task instead. The queue depth is
+    therefore bounded by the number of distinct keys, whatever the rate at
+    which tasks are added. `is_pending` tells whether work is queued or
+    running for a key, and `completions` counts the successful tasks of a
+    key, whoever requested them, so that a UI can tell when the data it
+    displays was refreshed.
+
+    `add_task` returns a `TaskHandle` (a `concurrent.futures.Future`) giving
+    the status, result or exception of the request and allowing to cancel
+    it while it is pending. A task is withdrawn from the queue as soon as all
+    its requests are cancelled, so that it no longer counts as pending nor
+    takes room in a bounded queue; expired tasks are dropped before execution.
+
+    The number of waiting tasks can be bounded by `max_size`, so that memory
+    and latency stay predictable when the API is down. When the queue is
+    full, `overflow_policy` decides what happens to a new task:
+        - 'reject': the new task is refused
+        - 'drop_oldest': the task waiting the longest is dropped
+        - 'drop_lowest_priority': the most recent task of the lowest priority
+          is dropped, or the new task if none has a lower priority
+        - 'block': the caller waits up to `block_timeout` for room, then the
+          new task is refused
+    Refused and dropped tasks fail with `QueueFullError` and are counted in
+    `dropped`.
+
+    With a `store`, the tasks registered with `register_durable` are also
+    written to disk while they are pending or running, and `resume` queues
+    again those a previous process left unfinished or that failed with an
+    exception, until the store's `max_attempts` (at-least-once execution:
+    durable tasks must be idempotent). Store writes never happen under the
+    queue lock, so callers and workers do not wait on disk I/O.
+
+    The wait time, run time and outcome of every task and the queue depth
+    are recorded in `metrics`; `snapshot` summarizes them with the state of
+    the workers.
     """
-    def __init__(self, task_status: dict | None = None):
-        self._task_status = task_status
-        self._tasks = queue.Queue()
+    # pylint: disable=too-many-instance-attributes
+    def __init__(
+        self,
+        workers: int = 1,
+        process_workers: int = 0,
+        aging_interval: float | None = 10.0,
+        max_size: int = 0,
+        overflow_policy: str = 'reject',
+        block_timeout: float | None = 1.0,
+        store: SqliteTaskStore | None = None,
+        metrics: QueueMetrics | None = None
+    ):
+        """
+        Args:
+            workers: Number of worker threads
+            process_workers: Size of the process pool for tasks added with
+                `cpu_bound=True` (0 runs them in the worker threads)
+            aging_interval: Waiting time that raises a task by one priority
+                level, in seconds (None disables aging)
+            max_size: Maximum number of waiting tasks (0 for no limit)
+            overflow_policy: Behavior when the queue is full (see `OVERFLOW_POLICIES`)
+            block_timeout: Maximum wait for room with the 'block' policy, in seconds
+            store: Durable backend of the registered tasks (None keeps tasks in memory only)
+            metrics: Recorder of the queue metrics (default: a new one)
+
+        Raises:
+            ValueError: If the overflow policy is unknown
+        """
+        # pylint: disable=too-many-arguments, too-many-positional-arguments
+        if overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {overflow_policy}")
+        self._tasks = _PriorityTaskQueue(aging_interval, max_size)
+        self.overflow_policy = overflow_policy
+        self.block_timeout = block_timeout
+        # Tasks refused ('rejected') or removed from the queue ('evicted') because it was full
+        self.dropped: Counter[str] = Counter()
+        self._store = store
+        self.metrics = metrics or QueueMetrics()
+        # Durable tasks: name -> (task, keyword receiving the checkpoint callback)
+        self._durable: dict[str, tuple[Callable[..., Any], str | None]] = {}
+        self._durable_names: dict[Callable[..., Any], str] = {}
         self._stop_event = threading.Event()
-        self._worker_thread = None
-        self._is_busy = False
+        self.workers = max(1, workers)
+        self.process_workers = process_workers
+        self._worker_threads: list[threading.Thread] = []
+        self._process_pool = None
+        self._busy_workers = 0
+        self._lock = threading.Lock()
+        # Requests merged into the pending / running task of each key
+        self._pending: dict[Hashable, list[_Waiter]] = {}
+        self._in_flight: dict[Hashable, list[_Waiter]] = {}
+        # Number of successful tasks of each key
+        self._completions: Counter[Hashable] = Counter()
+        # Completion callbacks of ordered tasks waiting for the ones of earlier tasks
+        self._callback_lock = threading.Lock()
+        self._completed: dict[int, list[Callable[[], None] | None]] = {}
+        self._next_callbacks = 0
 
     @property
     def is_working(self):
@@ -32,25 +424,368 @@ class ApiRequestQueue:
         Returns:
             bool: True if the queue is working, False otherwise
         """
-        return self._is_busy or not self._tasks.empty()
+        return self._busy_workers > 0 or not self._tasks.empty()
+
+    def is_pending(self, dedupe_key: Hashable) -> bool:
+        """
+        Check if a task with a given key is queued or running.
+
+        Args:
+            dedupe_key: Key of the task
+
+        Returns:
+            bool: True if work for the key is not finished yet
+        """
+        with self._lock:
+            return dedupe_key in self._pending or dedupe_key in self._in_flight
+
+    def completions(self, dedupe_key: Hashable) -> int:
+        """
+        Count the tasks with a given key that succeeded, whoever added them.
+
+        Args:
+            dedupe_key: Key of the task
+
+        Returns:
+            int: Number of successful tasks, which grows after each refresh
+        """
+        with self._lock:
+            return self._completions[dedupe_key]
+
+    def snapshot(self) -> dict:
+        """
+        Get the metrics of the queue, to size the worker pool and spot API slowdowns.
+
+        Returns:
+            dict: Summary of `QueueMetrics.snapshot`, with the current 'depth',
+                the number of 'workers' and 'busy_workers', and the 'dropped' counts
+        """
+        snapshot = self.metrics.snapshot()
+        snapshot['depth']['current'] = self._tasks.qsize()
+        snapshot['workers'] = self.workers
+        snapshot['busy_workers'] = self._busy_workers
+        snapshot['dropped'] = dict(self.dropped)
+        return snapshot
+
+    def register_durable(
+        self,
+        name: str,
+        task: Callable[..., Any],
+        progress_kwarg: str | None = None
+    ) -> None:
+        """
+        Register a task to persist in the store when it is added.
+
+        Durable tasks must be added with keyword arguments only, whose values
+        are stations, datetimes or JSON serializable.
+
+        Args:
+            name: Name identifying the task in the store
+            task: Task (e.g. a bound method of a service)
+            progress_kwarg: Keyword argument receiving a `checkpoint(**kwargs)`
+                callback, with which the task records the arguments to resume
+                it with if it is interrupted
+        """
+        self._durable[name] = (task, progress_kwarg)
+        self._durable_names[task] = name
+
+    def resume(self, stations: Mapping[str, Station]) -> int:
+        """
+        Queue again the durable tasks left unfinished by a previous run.
+
+        Args:
+            stations: Known stations by id, to restore the station arguments
+
+        Returns:
+            int: Number of tasks queued again
+        """
+        if self._store is None:
+            return 0
+        resumed = 0
+        for stored in self._store.unfinished():
+            try:
+                task, _ = self._durable[stored.name]
+                kwargs = decode_kwargs(stored.kwargs, stations)
+            except (KeyError, ValueError) as e:
+                logger.warning("Dropping stored task '%s' that cannot be restored: %s",
+                               stored.name, e)
+                self._forget(stored.task_id)
+                continue
+            with self._lock:
+                try:
+                    handle = self._add_request(
+                        task, (), kwargs, None, stored.dedupe_key, False,
+                        TaskPriority(stored.priority), None, stored.task_id
+                    )
+                except queue.Full:
+                    logger.warning("Request queue full: remaining stored tasks kept for later")
+                    break
+            if handle.queued:
+                resumed += 1
+            else:
+                self._forget(stored.task_id)
+        logger.info("%d stored tasks resumed", resumed)
+        return resumed
 
     def add_task(
         self,
         task: Callable[..., Any],
         *args,
         on_complete: Callable[[], None] = None,
+        dedupe_key: Hashable | None = None,
+        cpu_bound: bool = False,
+        priority: TaskPriority = TaskPriority.BACKGROUND,
+        timeout: float | None = None,
+        ordered: bool = False,
         **kwargs
-    ):
+    ) -> TaskHandle:
         """
         Add a task to the queue.
 
         Args:
             task: Task to add
             on_complete: Callback to execute after task completion
+            dedupe_key: Key identifying the work done by the task; if a task with
+                the same key is pending or running, it satisfies this request
+                (a pending task is promoted to this request's priority if higher)
+            cpu_bound: Run the task in the process pool (the task and its
+                arguments must then be picklable)
+            priority: Priority of the task (default: background)
+            timeout: Delay in seconds after which the task is no longer worth
+                running: it is dropped if it has not started by then, and a task
+                run in the process pool is abandoned (its handle then raises
+                `TimeoutError`; a task run in a worker thread cannot be interrupted)
+            ordered: Run `on_complete` only once the callbacks of the ordered
+                tasks started before this one have run
             *args: Arguments to pass to the task
             **kwargs: Keyword arguments to pass to the task
+
+        Returns:
+            TaskHandle: Handle of the request (its `queued` attribute is False if
+                it was merged into a pending or running task with the same key, or
+                refused by the full queue, in which case it fails with `QueueFullError`)
+        """
+        # pylint: disable=too-many-arguments
+        if (self.overflow_policy == 'block' and dedupe_key not in self._pending
+                and not self._tasks.wait_for_room(self.block_timeout)):
+            logger.warning("Request queue still full after %ss", self.block_timeout)
+        # Written before taking the lock, and deleted again if the task is not queued
+        task_id = self._persist(task, args, kwargs, dedupe_key, priority)
+        with self._lock:
+            evicted = None
+            try:
+                handle = self._add_request(
+                    task, args, kwargs, on_complete, dedupe_key, cpu_bound, priority, timeout,
+                    task_id, ordered
+                )
+            except queue.Full:
+                evicted = self._make_room(priority)
+                if evicted is None:
+                    handle = self._reject(task, dedupe_key)
+                else:
+                    handle = self._add_request(
+                        task, args, kwargs, on_complete, dedupe_key, cpu_bound, priority, timeout,
+                        task_id, ordered
+                    )
+
+        self.metrics.record_depth(self._tasks.qsize())
+        if not handle.queued:
+            self._forget(task_id)
+        # Handle callbacks take the lock: they may only run once it is released
+        if evicted is not None:
+            self._forget(evicted[0].task_id)
+            for handle_to_fail in evicted[1]:
+                self._fail(handle_to_fail, QueueFullError("Task dropped from the full queue"))
+        return handle
+
+    def _make_room(
+        self,
+        priority: TaskPriority
+    ) -> tuple[_QueuedTask, list[TaskHandle]] | None:
+        """
+        Drop a waiting task according to the overflow policy (the lock must be held).
+
+        Args:
+            priority: Priority of the task to add
+
+        Returns:
+            tuple[_QueuedTask, list[TaskHandle]] | None: Dropped task and the
+                handles of its requests, None if the new task must be refused instead
+        """
+        if self.overflow_policy == 'drop_oldest':
+            victim = self._tasks.evict_oldest()
+        elif self.overflow_policy == 'drop_lowest_priority':
+            victim = self._tasks.evict_lowest(priority)
+        else:
+            victim = None
+        if victim is None:
+            return None
+
+        self.dropped['evicted'] += 1
+        logger.warning("Request queue full: task '%s' (%s) dropped",
+                       victim.task.__name__, victim.priority.name)
+        handles = [victim.handle]
+        if victim.dedupe_key is not None:
+            handles.extend(handle for _, handle in self._pending.pop(victim.dedupe_key, []))
+        return victim, handles
+
+    def _reject(self, task: Callable[..., Any], dedupe_key: Hashable | None) -> TaskHandle:
+        """Refuse a task because the queue is full (the lock must be held)."""
+        self.dropped['rejected'] += 1
+        logger.warning("Request queue full: task '%s' rejected", task.__name__)
+        handle = TaskHandle(dedupe_key, queued=False)
+        handle.set_exception(QueueFullError("Request queue is full"))
+        return handle
+
+    @staticmethod
+    def _fail(handle: TaskHandle, error: Exception) -> None:
+        """Fail the handle of a task that will never run, unless it was cancelled."""
+        if handle.set_running_or_notify_cancel():
+            handle.set_exception(error)
+
+    def _add_request(
+        self,
+        task: Callable[..., Any],
+        args: tuple,
+        kwargs: dict,
+        on_complete: Callable[[], None] | None,
+        dedupe_key: Hashable | None,
+        cpu_bound: bool,
+        priority: TaskPriority,
+        timeout: float | None,
+        task_id: int | None = None,
+        ordered: bool = False
+    ) -> TaskHandle:
+        """
+        Queue a task or merge it into the one with the same key (the lock must be held).
+
+        Args:
+            task_id: Id of the task in the store, if it is durable
+            ordered: Run the completion callback in start order (see `add_task`)
+
+        Raises:
+            queue.Full: If the task cannot be merged and the queue is full
+        """
+        # pylint: disable=too-many-arguments, too-many-positional-arguments
+        if dedupe_key is not None:
+            if dedupe_key in self._pending:
+                if self._tasks.promote(dedupe_key, priority):
+                    logger.debug("Task queued for %s promoted to %s", dedupe_key, priority.name)
+                handle = TaskHandle(dedupe_key, queued=False)
+                handle.add_done_callback(self._withdraw)
+                self._pending[dedupe_key].append((on_complete, handle))
+                logger.debug("Task '%s' merged into the task already queued for %s",
+                             task.__name__, dedupe_key)
+                return handle
+            if dedupe_key in self._in_flight:
+                handle = TaskHandle(dedupe_key, queued=False)
+                handle.set_running_or_notify_cancel()
+                self._in_flight[dedupe_key].append((on_complete, handle))
+                logger.debug("Task '%s' merged into the running task for %s",
+                             task.__name__, dedupe_key)
+                return handle
+
+        if self._tasks.full():
+            raise queue.Full
+        now = time.monotonic()
+        handle = TaskHandle(dedupe_key)
+        handle.add_done_callback(self._withdraw)
+        self._tasks.put(_QueuedTask(
+            task, args, kwargs, on_complete, dedupe_key,
+            cpu_bound=cpu_bound, priority=priority, enqueued_at=now,
+            handle=handle, deadline=None if timeout is None else now + timeout,
+            task_id=task_id, ordered=ordered
+        ))
+        if dedupe_key is not None:
+            self._pending[dedupe_key] = []
+        return handle
+
+    def _withdraw(self, handle: TaskHandle) -> None:
+        """
+        Remove a waiting task from the queue once all its requests are cancelled.
+
+        Called back when a handle is done; a task already taken by a worker
+        is left to `_execute`, which drops it.
+
+        Args:
+            handle: Handle of a request of the task
+        """
+        if not handle.cancelled():
+            return
+        key = handle.dedupe_key
+        with self._lock:
+            if key is None:
+                item = self._tasks.discard(lambda item: item.handle is handle)
+            elif all(waiter.cancelled() for _, waiter in self._pending.get(key, [])):
+                item = self._tasks.discard(
+                    lambda item: item.dedupe_key == key and item.handle.cancelled()
+                )
+                if item is not None:
+                    del self._pending[key]
+            else:
+                item = None
+        if item is None:
+            return
+        logger.info("Task '%s' withdrawn: all its requests were cancelled", item.task.__name__)
+        self.metrics.record_task(TaskSample(
+            item.task.__name__, item.priority.name,
+            time.monotonic() - item.enqueued_at, 0.0, 'cancelled'
+        ))
+        self.metrics.record_depth(self._tasks.qsize())
+        self._forget(item.task_id)
+
+    def _persist(
+        self,
+        task: Callable[..., Any],
+        args: tuple,
+        kwargs: dict,
+        dedupe_key: Hashable | None,
+        priority: TaskPriority
+    ) -> int | None:
+        """
+        Write a durable task to the store.
+
+        Returns:
+            int | None: Id of the stored task, None if it is not durable or
+                could not be stored (it then only runs from memory)
         """
-        self._tasks.put((task, args, kwargs, on_complete))
+        # pylint: disable=too-many-arguments, too-many-positional-arguments
+        name = self._durable_names.get(task) if self._store is not None else None
+        if name is None:
+            return None
+        if args:
+            logger.warning("Task '%s' not persisted: positional arguments are not stored", name)
+            return None
+        try:
+            return self._store.add(name, kwargs, dedupe_key, priority)
+        except (TypeError, sqlite3.Error) as e:
+            logger.error("Failed to persist task '%s': %s", name, e)
+            return None
+
+    def _forget(self, task_id: int | None) -> None:
+        """Delete a finished or dropped task from the store."""
+        if task_id is None or self._store is None:
+            return
+        try:
+            self._store.remove(task_id)
+        except sqlite3.Error as e:
+            logger.error("Failed to remove stored task %s: %s", task_id, e)
+
+    def _settle_stored(self, item: _QueuedTask, outcome: str) -> None:
+        """
+        Delete a durable task once it is over, unless it failed.
+
+        A failed task stays stored: its start was counted by the store, so it
+        is retried at the next `resume` until it reaches `max_attempts`.
+
+        Args:
+            item: Finished task
+            outcome: Outcome recorded in the metrics
+        """
+        if outcome == 'failed' and item.task_id is not None:
+            logger.warning("Stored task %s failed: kept to be resumed", item.task_id)
+            return
+        self._forget(item.task_id)
 
     def _worker(self):
         """
@@ -58,45 +793,225 @@ class ApiRequestQueue:
         """
         while not self._stop_event.is_set():
             try:
-                task, args, kwargs, on_complete = self._tasks.get(timeout=1)
-                self._is_busy = True
+                item = self._tasks.get(timeout=1)
+            except queue.Empty:
+                continue
+            self._execute(item)
+        logger.info("API request worker stopped.")
+
+    def _execute(self, item: _QueuedTask) -> None:
+        """
+        Execute a queued task, then run its completion callbacks (in start
+        order if it is ordered).
+
+        The task is dropped if all its requests were cancelled, or if its
+        deadline passed while it was waiting.
+
+        Args:
+            item: Task taken from the queue
+        """
+        waiters = self._claim(item)
+        self.metrics.record_depth(self._tasks.qsize())
+        started = time.monotonic()
+        result = error = None
+        outcome, run = 'succeeded', 0.0
+        try:
+            if not waiters:
+                outcome = 'cancelled'
+                logger.info("Task '%s' cancelled before execution.", item.task.__name__)
+            elif item.deadline is not None and started > item.deadline:
+                outcome = 'expired'
+                error = TimeoutError(f"Task '{item.task.__name__}' expired before execution")
+                logger.warning("Task '%s' expired before execution.", item.task.__name__)
+            else:
+                logger.info("Executing task '%s'...", item.task.__name__)
                 try:
-                    logger.info("Executing task '%s'...", task.__name__)
-                    task(*args, **kwargs)
-
-                    # Direct update of shared status (thread-safe for dicts)
-                    if self._task_status is not None:
-                        self._task_status["refresh_needed"] = True
-
-                    if on_complete:
-                        on_complete()
-                    logger.info("Task '%s' finished.", task.__name__)
-                except Exception as e:  # pylint: disable=broad-except
-                    logger.error("Error executing task: %s", e, exc_info=True)
+                    result = self._run(self._with_checkpoint(item))
                 finally:
-                    self._is_busy = False
-                    self._tasks.task_done()
+                    run = time.monotonic() - started
+                logger.info("Task '%s' finished.", item.task.__name__)
+        except Exception as e:  # pylint: disable=broad-except
+            error = e
+            outcome = 'failed'
+            logger.error("Error executing task: %s", e, exc_info=True)
+        finally:
+            self.metrics.record_task(TaskSample(
+                item.task.__name__, item.priority.name, started - item.enqueued_at, run, outcome
+            ))
+            waiters = self._release(item, waiters, succeeded=error is None)
+            for _, handle in waiters:
+                if error is None:
+                    handle.set_result(result)
+                else:
+                    handle.set_exception(error)
+            succeeded = bool(waiters) and error is None
+            callbacks = [callback for callback, _ in waiters] if succeeded else []
+            if item.ordered:
+                self._complete_in_order(item.sequence, callbacks)
+            else:
+                self._run_callbacks(callbacks)
+            with self._lock:
+                self._busy_workers -= 1
+            self._tasks.task_done()
+        # Not reached if the process is stopping: the task stays stored and is resumed
+        self._settle_stored(item, outcome)
 
-            except queue.Empty:
+    def _claim(self, item: _QueuedTask) -> list[_Waiter]:
+        """
+        Mark a task as running and collect its requests.
+
+        Args:
+            item: Task taken from the queue
+
+        Returns:
+            list[_Waiter]: Requests still waiting for the task (cancelled ones are withdrawn)
+        """
+        with self._lock:
+            self._busy_workers += 1
+            waiters = [(item.on_complete, item.handle)]
+            if item.dedupe_key is not None:
+                waiters.extend(self._pending.pop(item.dedupe_key, []))
+            waiters = [waiter for waiter in waiters if waiter[1].set_running_or_notify_cancel()]
+            if item.dedupe_key is not None and waiters:
+                self._in_flight[item.dedupe_key] = waiters
+            return waiters
+
+    def _release(
+        self,
+        item: _QueuedTask,
+        waiters: list[_Waiter],
+        succeeded: bool
+    ) -> list[_Waiter]:
+        """
+        Free the key of a finished task, counting it if it succeeded.
+
+        Args:
+            item: Finished task
+            waiters: Requests collected when it started
+            succeeded: True if the task ran without error
+
+        Returns:
+            list[_Waiter]: Those requests, plus the ones merged while it was running
+        """
+        with self._lock:
+            if item.dedupe_key is not None and waiters:
+                if succeeded:
+                    self._completions[item.dedupe_key] += 1
+                return self._in_flight.pop(item.dedupe_key, waiters)
+            return waiters
+
+    def _with_checkpoint(self, item: _QueuedTask) -> _QueuedTask:
+        """
+        Record the start of a durable task, and give it its checkpoint callback.
+
+        Args:
+            item: Task about to run
+
+        Returns:
+            _QueuedTask: The task, with the callback in its keyword arguments if registered
+        """
+        if item.task_id is None:
+            return item
+        try:
+            self._store.start(item.task_id)
+        except sqlite3.Error as e:
+            logger.error("Failed to record start of stored task %s: %s", item.task_id, e)
+        _, progress_kwarg = self._durable[self._durable_names[item.task]]
+        if progress_kwarg is None or item.cpu_bound:
+            return item
+        return item._replace(kwargs={
+            **item.kwargs, progress_kwarg: partial(self._checkpoint, item.task_id)
+        })
+
+    def _checkpoint(self, task_id: int, **updates) -> None:
+        """Record the progress of a durable task, without failing it if the store fails."""
+        try:
+            self._store.checkpoint(task_id, **updates)
+        except (TypeError, sqlite3.Error) as e:
+            logger.error("Failed to checkpoint stored task %s: %s", task_id, e)
+
+    def _run(self, item: _QueuedTask) -> Any:
+        """
+        Run a task in the calling worker thread, or in the process pool if it is CPU-bound.
+
+        Args:
+            item: Task to run
+
+        Returns:
+            Any: Result of the task
+
+        Raises:
+            TimeoutError: If a task run in the process pool exceeds its deadline
+        """
+        if not item.cpu_bound or self._process_pool is None:
+            return item.task(*item.args, **item.kwargs)
+        remaining = None
+        if item.deadline is not None:
+            remaining = max(0.0, item.deadline - time.monotonic())
+        future = self._process_pool.submit(item.task, *item.args, **item.kwargs)
+        return future.result(timeout=remaining)
+
+    def _complete_in_order(
+        self,
+        sequence: int,
+        callbacks: list[Callable[[], None] | None]
+    ) -> None:
+        """
+        Run the callbacks of a finished ordered task once those of every
+        earlier ordered task have run.
+
+        Args:
+            sequence: Start order of the task among the ordered tasks
+            callbacks: Callbacks of the task (empty if it failed)
+        """
+        with self._callback_lock:
+            self._completed[sequence] = callbacks
+            while self._next_callbacks in self._completed:
+                self._run_callbacks(self._completed.pop(self._next_callbacks))
+                self._next_callbacks += 1
+
+    @staticmethod
+    def _run_callbacks(callbacks: list[Callable[[], None] | None]) -> None:
+        """Run completion callbacks, logging their errors."""
+        for callback in callbacks:
+            if callback is None:
                 continue
-        logger.info("API request worker stopped.")
+            try:
+                callback()
+            except Exception as e:  # pylint: disable=broad-except
+                logger.error("Error in completion callback: %s", e, exc_info=True)
 
     def start(self):
         """
-        Start the worker thread.
+        Start the worker threads (and the process pool, if any).
         """
-        if self._worker_thread is None or not self._worker_thread.is_alive():
-            self._stop_event.clear()
-            self._worker_thread = threading.Thread(target=self._worker, daemon=True)
-            self._worker_thread.start()
-            logger.info("Worker thread started.")
+        self._worker_threads = [thread for thread in self._worker_threads if thread.is_alive()]
+        if len(self._worker_threads) >= self.workers:
+            return
+
+        self._stop_event.clear()
+        if self.process_workers > 0 and self._process_pool is None:
+            self._process_pool = ProcessPoolExecutor(max_workers=self.process_workers)
+
+        while len(self._worker_threads) < self.workers:
+            worker_thread = threading.Thread(
+                target=self._worker,
+                name=f"api-queue-{len(self._worker_threads)}",
+                daemon=True
+            )
+            worker_thread.start()
+            self._worker_threads.append(worker_thread)
+        logger.info("%d worker threads started.", len(self._worker_threads))
 
     def stop(self):
         """
-        Stop the worker thread.
+        Stop the worker threads.
         """
-        logger.info("Stopping worker thread...")
+        logger.info("Stopping worker threads...")
         self._stop_event.set()
-        if self._worker_thread:
-            self._worker_thread.join()
-        logger.info("Worker thread stopped successfully.")
+        for worker_thread in self._worker_threads:
+            worker_thread.join()
+        if self._process_pool is not None:
+            self._process_pool.shutdown(wait=True, cancel_futures=True)
+            self._process_pool = None
+        logger.info("Worker threads stopped successfully.")
@@ -0,0 +1,143 @@
+"""
+Module providing retry and circuit breaker policies for the API clients.
+"""
+
+import logging
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitOpenError(requests.exceptions.RequestException):
+    """Exception raised when a request is refused because the host's circuit is open."""
+
+
+@dataclass
+class RetryPolicy:
+    """
+    Bounded retries with jittered exponential backoff.
+    """
+    max_attempts: int = 3
+    backoff_base: float = 0.5
+    backoff_max: float = 8.0
+    retry_statuses: frozenset[int] = field(
+        default_factory=lambda: frozenset({429, 500, 502, 503, 504})
+    )
+
+    def is_retryable(self, status_code: int) -> bool:
+        """True if a response with this status code is worth retrying."""
+        return status_code in self.retry_statuses
+
+    def delay(self, attempt: int, retry_after: str | None = None) -> float:
+        """
+        Compute the wait before the next attempt ("full jitter" backoff).
+
+        Args:
+            attempt: Index of the attempt that just failed (0 for the first one)
+            retry_after: Value of the server's Retry-After header, if any
+
+        Returns:
+            float: Delay in seconds
+        """
+        if retry_after is not None and retry_after.isdigit():
+            return min(float(retry_after), self.backoff_max)
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+
+class CircuitBreaker:
+    """
+    Per-host circuit breaker.
+
+    After `failure_threshold` consecutive failed requests to a host, its
+    circuit opens and every request to it fails immediately for `cooldown`
+    seconds. A single trial request is then let through (half-open): its
+    success closes the circuit, its failure opens it again.
+    """
+
+    def __init__(self, failure_threshold: int = 3, cooldown: float = 60.0):
+        """
+        Args:
+            failure_threshold: Consecutive failures opening the circuit
+            cooldown: Duration of the open state, in seconds
+        """
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self._lock = threading.Lock()
+        self._failures: dict[str, int] = {}
+        self._opened_at: dict[str, float] = {}
+        self._trial_running: set[str] = set()
+
+    def is_open(self, host: str) -> bool:
+        """
+        Check whether requests to a host are currently refused.
+
+        Args:
+            host: Host name
+
+        Returns:
+            bool: True if the circuit is open and the cooldown is not over
+        """
+        with self._lock:
+            opened_at = self._opened_at.get(host)
+            return opened_at is not None and time.monotonic() - opened_at < self.cooldown
+
+    def before_request(self, host: str) -> None:
+        """
+        Let a request through, or refuse it if the host's circuit is open.
+
+        Args:
+            host: Host name
+
+        Raises:
+            CircuitOpenError: If the circuit is open, or half-open with a trial running
+        """
+        with self._lock:
+            opened_at = self._opened_at.get(host)
+            if opened_at is None:
+                return
+            remaining = self.cooldown - (time.monotonic() - opened_at)
+            if remaining > 0 or host in self._trial_running:
+                raise CircuitOpenError(
+                    f"Circuit open for {host}, retry in {max(remaining, 0):.0f}s"
+                )
+            self._trial_running.add(host)
+            logger.info("Circuit half-open for %s, sending a trial request", host)
+
+    def record_success(self, host: str) -> None:
+        """
+        Record a successful request, closing the host's circuit.
+
+        Args:
+            host: Host name
+        """
+        with self._lock:
+            if host in self._opened_at:
+                logger.info("Circuit closed for %s", host)
+            self._failures.pop(host, None)
+            self._opened_at.pop(host, None)
+            self._trial_running.discard(host)
+
+    def record_failure(self, host: str) -> None:
+        """
+        Record a failed request, opening the host's circuit past the threshold.
+
+        Args:
+            host: Host name
+        """
+        with self._lock:
+            failures = self._failures.get(host, 0) + 1
+            self._failures[host] = failures
+            if failures >= self.failure_threshold or host in self._trial_running:
+                self._opened_at[host] = time.monotonic()
+                self._trial_running.discard(host)
+                logger.warning(
+                    "Circuit opened for %s after %d failures (cooldown %ss)",
+                    host,
+                    failures,
+                    self.cooldown
+                )
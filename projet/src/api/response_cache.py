@@ -0,0 +1,265 @@
+"""
+Module for caching API responses on disk.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Mapping
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CachedResponse:
+    """
+    A cached response body with its validators.
+    """
+    body: bytes
+    stored_at: float
+    expires_at: float
+    etag: str | None = None
+    last_modified: str | None = None
+
+    @property
+    def is_fresh(self) -> bool:
+        """True if the response can be served without contacting the server."""
+        return time.time() < self.expires_at
+
+    def revalidation_headers(self) -> dict[str, str]:
+        """
+        Build the conditional request headers for this response.
+
+        Returns:
+            dict[str, str]: If-None-Match / If-Modified-Since headers
+        """
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """
+    Size-bounded LRU cache of HTTP response bodies stored on disk.
+
+    Each entry is a `<key>.body` file holding the raw body and a `<key>.meta`
+    JSON file holding its validators. The most recently used entries are
+    also kept in memory so that repeated lookups never touch the disk.
+    """
+    # pylint: disable=too-many-instance-attributes
+
+    def __init__(
+            self,
+            cache_dir: Path,
+            ttl: int = 3600,
+            max_bytes: int = 50 * 1024 * 1024,
+            align_to_hour: bool = True,
+            memory_entries: int = 128
+    ):
+        """
+        Initialize the cache and index the entries already on disk.
+
+        Args:
+            cache_dir: Cache storage directory
+            ttl: Time to live of an entry, in seconds
+            max_bytes: Maximum total size of the bodies stored on disk
+            align_to_hour: Also expire entries at the next top of the hour,
+                when the stations publish new data
+            memory_entries: Number of entries kept in memory
+        """
+        # pylint: disable=too-many-arguments, too-many-positional-arguments
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.align_to_hour = align_to_hour
+        self.memory_entries = memory_entries
+        self._lock = threading.Lock()
+        self._memory: OrderedDict[str, CachedResponse] = OrderedDict()
+
+        # LRU index of the entries on disk: key -> body size, least recent first
+        entries = sorted(self.cache_dir.glob('*.body'), key=lambda p: p.stat().st_mtime)
+        self._index: OrderedDict[str, int] = OrderedDict(
+            (path.stem, path.stat().st_size) for path in entries
+        )
+        self._size = sum(self._index.values())
+        logger.info(
+            "ResponseCache initialized in %s (%d entries, %d bytes)",
+            self.cache_dir,
+            len(self._index),
+            self._size
+        )
+
+    @staticmethod
+    def make_key(url: str, params: Mapping[str, str] | None = None) -> str:
+        """
+        Build the cache key of a request.
+
+        Args:
+            url: Request URL
+            params: Query parameters
+
+        Returns:
+            str: Hex digest identifying the URL and its parameters
+        """
+        payload = json.dumps([url, sorted((params or {}).items())], ensure_ascii=False)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> CachedResponse | None:
+        """
+        Get a cached response, fresh or stale.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            CachedResponse | None: The cached response, or None on a miss
+        """
+        with self._lock:
+            cached = self._memory.get(key)
+            if cached is not None:
+                self._memory.move_to_end(key)
+                self._index.move_to_end(key)
+                return cached
+            if key not in self._index:
+                return None
+
+        try:
+            meta = json.loads(self._path(key, 'meta').read_text(encoding='utf-8'))
+            body = self._path(key, 'body').read_bytes()
+        except (OSError, ValueError) as e:
+            logger.warning("Unreadable cache entry %s: %s", key, e)
+            with self._lock:
+                self._discard(key)
+            return None
+
+        cached = CachedResponse(body=body, **meta)
+        with self._lock:
+            if key not in self._index:
+                # Evicted while it was being read: served once, not kept
+                return cached
+            self._index.move_to_end(key)
+            self._remember(key, cached)
+            # LRU order kept on disk for the next process; never recreate a removed file
+            try:
+                os.utime(self._path(key, 'body'))
+            except FileNotFoundError:
+                pass
+        return cached
+
+    def put(self, key: str, body: bytes, headers: Mapping[str, str] | None = None) -> None:
+        """
+        Store a response, evicting the least recently used entries if needed.
+
+        Args:
+            key: Cache key
+            body: Raw response body
+            headers: Response headers (ETag and Last-Modified are kept)
+        """
+        headers = headers or {}
+        now = time.time()
+        cached = CachedResponse(
+            body=body,
+            stored_at=now,
+            expires_at=self._expiry(now),
+            etag=headers.get('ETag'),
+            last_modified=headers.get('Last-Modified')
+        )
+        meta = {k: v for k, v in vars(cached).items() if k != 'body'}
+
+        try:
+            self._path(key, 'body').write_bytes(body)
+            self._path(key, 'meta').write_text(json.dumps(meta), encoding='utf-8')
+        except OSError as e:
+            logger.error("Failed to write cache entry %s: %s", key, e)
+            return
+
+        with self._lock:
+            self._size -= self._index.pop(key, 0)
+            self._index[key] = len(body)
+            self._size += len(body)
+            self._remember(key, cached)
+            self._evict()
+
+    def refresh(self, key: str, cached: CachedResponse) -> CachedResponse:
+        """
+        Extend the lifetime of an entry revalidated by the server (304).
+
+        Args:
+            key: Cache key
+            cached: The revalidated response
+
+        Returns:
+            CachedResponse: The response with its new expiry
+        """
+        now = time.time()
+        cached.stored_at = now
+        cached.expires_at = self._expiry(now)
+        meta = {k: v for k, v in vars(cached).items() if k != 'body'}
+        try:
+            self._path(key, 'meta').write_text(json.dumps(meta), encoding='utf-8')
+        except OSError as e:
+            logger.error("Failed to refresh cache entry %s: %s", key, e)
+        return cached
+
+    def clear(self) -> None:
+        """
+        Remove every entry from the cache.
+        """
+        with self._lock:
+            for key in list(self._index):
+                self._discard(key)
+            self._memory.clear()
+        logger.info("ResponseCache cleared")
+
+    def _expiry(self, stored_at: float) -> float:
+        """
+        Compute the expiry timestamp of an entry stored at `stored_at`.
+        """
+        expires_at = stored_at + self.ttl
+        if self.align_to_hour:
+            next_hour = (stored_at // 3600 + 1) * 3600
+            expires_at = min(expires_at, next_hour)
+        return expires_at
+
+    def _remember(self, key: str, cached: CachedResponse) -> None:
+        """
+        Keep an entry in the in-memory LRU (lock held).
+        """
+        self._memory[key] = cached
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _evict(self) -> None:
+        """
+        Drop least recently used entries until the size bound holds (lock held).
+        """
+        while self._size > self.max_bytes and len(self._index) > 1:
+            key = next(iter(self._index))
+            logger.debug("Evicting cache entry %s", key)
+            self._discard(key)
+
+    def _discard(self, key: str) -> None:
+        """
+        Remove an entry from disk and from the indexes (lock held).
+        """
+        self._size -= self._index.pop(key, 0)
+        self._memory.pop(key, None)
+        for suffix in ('body', 'meta'):
+            self._path(key, suffix).unlink(missing_ok=True)
+
+    def _path(self, key: str, suffix: str) -> Path:
+        """
+        Get the path of one of the files of an entry.
+        """
+        return self.cache_dir / f"{key}.{suffix}"
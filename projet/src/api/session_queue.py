@@ -0,0 +1,97 @@
+"""
+Module giving each user session its own view of the shared request queue.
+"""
+
+import threading
+from functools import partial
+from typing import Any, Callable, Hashable
+
+from projet.src.api.request_queue import ApiRequestQueue, TaskHandle
+
+
+class SessionRequestQueue:
+    """
+    View of the process-wide `ApiRequestQueue` for one user session.
+
+    The session keeps the handle of its latest keyed request, so that it can
+    withdraw it (e.g. when the user navigates away) without touching the
+    requests of other sessions. The state of a key (`is_pending`,
+    `completions`) is read from the shared queue: the UI is told when the
+    station it displays was refreshed, whether the refresh was requested by
+    this session, another one, a prefetch or the scheduler.
+    """
+
+    def __init__(self, shared_queue: ApiRequestQueue):
+        """
+        Args:
+            shared_queue: Queue shared by every session
+        """
+        self.shared_queue = shared_queue
+        self._handles: dict[Hashable, TaskHandle] = {}
+        self._lock = threading.Lock()
+
+    def add_task(self, task: Callable[..., Any], *args, **kwargs) -> TaskHandle:
+        """
+        Add a task to the shared queue on behalf of the session.
+
+        Args:
+            task: Task to add
+            *args: Arguments of `ApiRequestQueue.add_task`
+            **kwargs: Keyword arguments of `ApiRequestQueue.add_task`
+
+        Returns:
+            TaskHandle: Handle of the request
+        """
+        handle = self.shared_queue.add_task(task, *args, **kwargs)
+        if handle.dedupe_key is not None:
+            with self._lock:
+                self._handles[handle.dedupe_key] = handle
+            handle.add_done_callback(partial(self._on_done, handle.dedupe_key))
+        return handle
+
+    def is_pending(self, dedupe_key: Hashable) -> bool:
+        """
+        Check if work for a key is queued or running, whoever requested it.
+
+        Args:
+            dedupe_key: Key of the request
+
+        Returns:
+            bool: True if the work is not finished yet
+        """
+        return self.shared_queue.is_pending(dedupe_key)
+
+    def completions(self, dedupe_key: Hashable) -> int:
+        """
+        Count the successful tasks of a key, whoever requested them.
+
+        Args:
+            dedupe_key: Key of the request
+
+        Returns:
+            int: Number of successful tasks (see `ApiRequestQueue.completions`)
+        """
+        return self.shared_queue.completions(dedupe_key)
+
+    def cancel(self, dedupe_key: Hashable) -> bool:
+        """
+        Withdraw the session's pending request for a key (e.g. when the user
+        navigates away from a station before its refresh started).
+
+        Requests of other sessions for the same key are not affected.
+
+        Args:
+            dedupe_key: Key of the request
+
+        Returns:
+            bool: True if a pending request was cancelled
+        """
+        with self._lock:
+            handle = self._handles.pop(dedupe_key, None)
+        return handle is not None and handle.cancel()
+
+    def _on_done(self, dedupe_key: Hashable, handle: TaskHandle) -> None:
+        """Forget the handle of a finished request, unless a newer one replaced it."""
+        with self._lock:
+            if self._handles.get(dedupe_key) is handle:
+                del self._handles[dedupe_key]
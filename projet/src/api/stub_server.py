@@ -0,0 +1,377 @@
+"""
+Module providing a local stand-in for the Opendatasoft API.
+
+It serves recorded or synthetic `/records`, `/exports` and catalog
+responses for any station id, with configurable latency, error rate and
+payload size, so that the extractor, the fetcher and the request queue can
+be load-tested offline and deterministically.
+"""
+
+import csv
+import io
+import json
+import logging
+import math
+import random
+import re
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Iterable
+from urllib.parse import parse_qsl, urlsplit
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from projet.src.api.recorder import ResponseRecorder
+
+logger = logging.getLogger(__name__)
+
+API_PREFIX = "/api/explore/v2.1/catalog/datasets/"
+# Fields of the synthetic records
+FIELDS = ('heure_de_paris', 'temperature_en_degre_c', 'humidite', 'pression')
+
+# Time bounds of an ODSQL `where` clause: `heure_de_paris >= date'...'` or `>= now(days=-7)`
+_TIME_BOUND = re.compile(
+    r"heure_de_paris\s*(>=|>|<=|<)\s*(?:date'([^']+)'|now\(days=(-?\d+)\))"
+)
+_BUCKET = re.compile(r"date_format\(heure_de_paris,\s*'([^']+)'\)\s+as\s+(\w+)")
+_AGGREGATE = re.compile(r"(avg|min|max)\((\w+)\)\s+as\s+(\w+)")
+_SEARCH = re.compile(r'search\("([^"]*)"\)')
+# ODSQL date_format tokens and their strftime equivalent
+_DATE_TOKENS = (('yyyy', '%Y'), ('MM', '%m'), ('dd', '%d'), ('HH', '%H'))
+_COMPARISONS = {
+    '>=': lambda value, bound: value >= bound,
+    '>': lambda value, bound: value > bound,
+    '<=': lambda value, bound: value <= bound,
+    '<': lambda value, bound: value < bound
+}
+_AGGREGATIONS = {
+    'avg': lambda values: round(sum(values) / len(values), 2),
+    'min': min,
+    'max': max
+}
+
+
+class StubApiServer:
+    """
+    Threaded HTTP server imitating the endpoints of the API used by the app.
+
+    Requests matching a recorded cassette get the recorded body. Otherwise
+    every dataset has a synthetic hourly history of `history_hours`:
+        - `.../<dataset_id>/records` honors the time bounds of `where`,
+          `order_by` on the timestamp, `limit` and `offset`, and
+          `group_by` on a `date_format` bucket with avg / min / max
+        - `.../<dataset_id>/exports/{csv,parquet}` returns every record
+          matching `where` in one file
+        - the catalog lists `dataset_ids` (matching `search("...")`)
+    """
+    # pylint: disable=too-many-instance-attributes
+
+    def __init__(
+            self,
+            host: str = "127.0.0.1",
+            port: int = 0,
+            latency: float = 0.0,
+            error_rate: float = 0.0,
+            payload_size: int | None = None,
+            cassette_dir: Path | None = None,
+            history_hours: int = 24 * 365,
+            seed: int | None = 0,
+            dataset_ids: Iterable[str] = ()
+    ):
+        """
+        Args:
+            host: Listening address
+            port: Listening port (0 picks a free port)
+            latency: Delay added to every response, in seconds
+            error_rate: Probability of answering with an HTTP 503
+            payload_size: Number of records per synthetic response
+                (default: the request's `limit`)
+            cassette_dir: Directory of recorded responses to serve
+            history_hours: Depth of the synthetic history, in hours
+            seed: Seed of the error draws (None for non-deterministic draws)
+            dataset_ids: Datasets listed by the catalog (none: the catalog is
+                empty and the application considers every station fetchable)
+        """
+        # pylint: disable=too-many-arguments, too-many-positional-arguments
+        self.latency = latency
+        self.error_rate = error_rate
+        self.payload_size = payload_size
+        self.history_hours = history_hours
+        self.dataset_ids = list(dataset_ids)
+        self.request_count = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._cassettes = {}
+        if cassette_dir is not None:
+            recorder = ResponseRecorder(cassette_dir, mode='replay')
+            self._cassettes = {
+                recorder.make_key(c['path'], c['params']): c['body'].encode('utf-8')
+                for c in recorder.cassettes()
+            }
+        self._httpd = ThreadingHTTPServer((host, port), _StubRequestHandler)
+        self._httpd.daemon_threads = True
+        self._httpd.stub = self
+        self._thread = None
+        logger.info(
+            "StubApiServer listening on %s (%d cassettes, latency %ss, error rate %s)",
+            self.url_base,
+            len(self._cassettes),
+            latency,
+            error_rate
+        )
+
+    @property
+    def url_base(self) -> str:
+        """Base URL to give to the extractor instead of the live API."""
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}{API_PREFIX}"
+
+    def start(self) -> 'StubApiServer':
+        """
+        Serve requests in a background thread.
+
+        Returns:
+            StubApiServer: The server itself
+        """
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        """
+        Serve requests in the calling thread until interrupted.
+        """
+        try:
+            self._httpd.serve_forever()
+        finally:
+            self._httpd.server_close()
+
+    def stop(self) -> None:
+        """
+        Stop serving and release the port.
+        """
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+        logger.info("StubApiServer stopped after %d requests", self.request_count)
+
+    def __enter__(self) -> 'StubApiServer':
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def respond(self, path: str, params: dict[str, str]) -> tuple[int, bytes]:
+        """
+        Build the response to a request.
+
+        Args:
+            path: URL path of the request
+            params: Query parameters
+
+        Returns:
+            tuple[int, bytes]: HTTP status and body (JSON, or the export file)
+        """
+        with self._lock:
+            self.request_count += 1
+            failed = self._random.random() < self.error_rate
+        if self.latency:
+            time.sleep(self.latency)
+        if failed:
+            return 503, b'{"error": "Service temporarily unavailable (stub)"}'
+
+        recorded = self._cassettes.get(ResponseRecorder.make_key(path, params))
+        if recorded is not None:
+            return 200, recorded
+
+        if path.rstrip('/') == API_PREFIX.rstrip('/'):
+            return 200, self._catalog(params)
+
+        dataset_id, _, endpoint = path[len(API_PREFIX):].partition('/')
+        generators = {
+            'records': (self._synthetic_aggregates if params.get('group_by')
+                        else self._synthetic_records),
+            'exports/csv': self._synthetic_csv,
+            'exports/parquet': self._synthetic_parquet
+        }
+        if not path.startswith(API_PREFIX) or endpoint not in generators:
+            return 404, b'{"error": "Unknown endpoint (stub)"}'
+        return 200, generators[endpoint](dataset_id, params)
+
+    def _synthetic_records(self, dataset_id: str, params: dict[str, str]) -> bytes:
+        """
+        Generate a page of plausible hourly records for a dataset.
+
+        Args:
+            dataset_id: Station dataset id
+            params: Query parameters (`where`, `order_by`, `limit` and `offset` are honored)
+
+        Returns:
+            bytes: JSON body of a `/records` response
+        """
+        records = self._matching_records(dataset_id, params)
+        offset = int(params.get('offset', 0))
+        count = self.payload_size or int(params.get('limit', 10))
+        page = records[offset:offset + max(0, count)]
+        return json.dumps({'total_count': len(records), 'results': page}).encode()
+
+    def _synthetic_aggregates(self, dataset_id: str, params: dict[str, str]) -> bytes:
+        """
+        Aggregate the synthetic records of a dataset by `date_format` bucket.
+
+        Args:
+            dataset_id: Station dataset id
+            params: Query parameters (`select` gives the bucket and the
+                avg / min / max aggregates, `limit` the number of buckets)
+
+        Returns:
+            bytes: JSON body of a grouped `/records` response, most recent bucket first
+        """
+        select = params.get('select', '')
+        bucket = _BUCKET.search(select)
+        if bucket is None:
+            return json.dumps({'total_count': 0, 'results': []}).encode()
+        date_format, alias = bucket.groups()
+        for token, directive in _DATE_TOKENS:
+            date_format = date_format.replace(token, directive)
+
+        groups = defaultdict(list)
+        for record in self._matching_records(dataset_id, params):
+            period = datetime.fromisoformat(record['heure_de_paris']).strftime(date_format)
+            groups[period].append(record)
+
+        aggregates = _AGGREGATE.findall(select)
+        results = [
+            {alias: period, **{
+                name: _AGGREGATIONS[function]([record[field] for record in groups[period]])
+                for function, field, name in aggregates
+            }}
+            for period in sorted(groups, reverse=True)
+        ]
+        limit = int(params.get('limit', len(results)))
+        return json.dumps({'total_count': len(results), 'results': results[:limit]}).encode()
+
+    def _matching_records(self, dataset_id: str, params: dict[str, str]) -> list[dict]:
+        """
+        Generate the synthetic records of a dataset within the time bounds of `where`.
+
+        Other `where` conditions (e.g. the sampling filters) are ignored:
+        synthetic records are all on the hour.
+
+        Args:
+            dataset_id: Station dataset id
+            params: Query parameters (`where` and `order_by`)
+
+        Returns:
+            list[dict]: Matching records, most recent first unless ordered ascending
+        """
+        now = datetime.now(timezone.utc)
+        latest = now.replace(minute=0, second=0, microsecond=0)
+        bounds = []
+        for operator, date, days in _TIME_BOUND.findall(params.get('where', '')):
+            if date:
+                bound = datetime.fromisoformat(date)
+                bound = bound if bound.tzinfo else bound.replace(tzinfo=timezone.utc)
+            else:
+                bound = now + timedelta(days=int(days))
+            bounds.append((_COMPARISONS[operator], bound))
+
+        phase = sum(map(ord, dataset_id)) % 24
+        records = []
+        for i in range(self.history_hours):
+            hour = latest - timedelta(hours=i)
+            if all(compare(hour, bound) for compare, bound in bounds):
+                records.append(self._record(hour, phase))
+        if params.get('order_by', '').strip().endswith(' asc'):
+            records.reverse()
+        return records
+
+    @staticmethod
+    def _record(hour: datetime, phase: int) -> dict:
+        """Plausible record of a given hour, always the same for a dataset."""
+        daily = math.sin(2 * math.pi * (hour.hour + phase) / 24)
+        return {
+            'heure_de_paris': hour.isoformat(),
+            'temperature_en_degre_c': round(12 + 6 * daily, 1),
+            'humidite': int(70 - 15 * daily),
+            'pression': 101300 + 100 * (int(hour.timestamp()) // 3600 % 7)
+        }
+
+    def _synthetic_csv(self, dataset_id: str, params: dict[str, str]) -> bytes:
+        """Body of a CSV export (';' delimited, with a header)."""
+        output = io.StringIO()
+        writer = csv.DictWriter(output, fieldnames=FIELDS, delimiter=';', lineterminator='\n')
+        writer.writeheader()
+        writer.writerows(self._matching_records(dataset_id, params))
+        return output.getvalue().encode('utf-8')
+
+    def _synthetic_parquet(self, dataset_id: str, params: dict[str, str]) -> bytes:
+        """Body of a Parquet export, with the timestamps typed as such."""
+        records = self._matching_records(dataset_id, params)
+        columns = {field: [record[field] for record in records] for field in FIELDS}
+        columns['heure_de_paris'] = pa.array(
+            [datetime.fromisoformat(value) for value in columns['heure_de_paris']],
+            type=pa.timestamp('s', tz='UTC')
+        )
+        table = pa.table(columns)
+        output = io.BytesIO()
+        pq.write_table(table, output)
+        return output.getvalue()
+
+    def _catalog(self, params: dict[str, str]) -> bytes:
+        """
+        List the configured datasets, as the catalog endpoint does.
+
+        Args:
+            params: Query parameters (`search("...")` in `where`, `limit` and `offset`)
+
+        Returns:
+            bytes: JSON body of a catalog response
+        """
+        search = _SEARCH.search(params.get('where', ''))
+        dataset_ids = [
+            dataset_id for dataset_id in self.dataset_ids
+            if search is None or search.group(1) in dataset_id
+        ]
+        offset = int(params.get('offset', 0))
+        limit = int(params.get('limit', 10))
+        modified = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0)
+        results = [
+            {'dataset_id': dataset_id,
+             'metas': {'default': {'records_count': self.history_hours,
+                                   'data_processed': modified.isoformat()}}}
+            for dataset_id in dataset_ids[offset:offset + limit]
+        ]
+        return json.dumps({'total_count': len(dataset_ids), 'results': results}).encode()
+
+
+class _StubRequestHandler(BaseHTTPRequestHandler):
+    """
+    Request handler delegating to the owning `StubApiServer`.
+    """
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        """Answer a GET request."""
+        url = urlsplit(self.path)
+        status, body = self.server.stub.respond(url.path, dict(parse_qsl(url.query)))
+        content_type = 'application/json; charset=utf-8'
+        if status == 200 and url.path.endswith('/exports/csv'):
+            content_type = 'text/csv; charset=utf-8'
+        elif status == 200 and url.path.endswith('/exports/parquet'):
+            content_type = 'application/octet-stream'
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        logger.debug("Stub API: " + format, *args)
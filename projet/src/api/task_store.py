@@ -0,0 +1,230 @@
+"""
+Module persisting queued tasks in SQLite, so that they survive restarts.
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Hashable, Iterator, Mapping
+
+import pandas as pd
+
+from projet.src.entities.station import Station
+
+logger = logging.getLogger(__name__)
+
+
+def encode_kwargs(kwargs: Mapping[str, Any]) -> str:
+    """
+    Serialize the keyword arguments of a task.
+
+    Stations are stored by id and datetimes in ISO format; any other value
+    must be JSON serializable.
+
+    Args:
+        kwargs: Keyword arguments of the task
+
+    Returns:
+        str: JSON document
+
+    Raises:
+        TypeError: If an argument cannot be serialized
+    """
+    def default(value):
+        if isinstance(value, Station):
+            return {'__station__': value.id}
+        if isinstance(value, (datetime, pd.Timestamp)):
+            return {'__datetime__': value.isoformat()}
+        raise TypeError(f"Object of type {type(value).__name__} cannot be stored")
+    return json.dumps(dict(kwargs), default=default)
+
+
+def decode_kwargs(document: str, stations: Mapping[str, Station]) -> dict[str, Any]:
+    """
+    Deserialize the keyword arguments of a task.
+
+    Args:
+        document: JSON document written by `encode_kwargs`
+        stations: Known stations by id
+
+    Returns:
+        dict[str, Any]: Keyword arguments of the task
+
+    Raises:
+        KeyError: If a stored station is no longer known
+    """
+    def object_hook(value):
+        if '__station__' in value:
+            return stations[value['__station__']]
+        if '__datetime__' in value:
+            return datetime.fromisoformat(value['__datetime__'])
+        return value
+    return json.loads(document, object_hook=object_hook)
+
+
+@dataclass
+class StoredTask:
+    """
+    Task read back from the store.
+    """
+    task_id: int
+    name: str
+    kwargs: str
+    dedupe_key: str | None
+    priority: int
+    attempts: int
+
+
+class SqliteTaskStore:
+    """
+    Durable backend of the `ApiRequestQueue`.
+
+    A task is written when it is queued and deleted once it is finished, so
+    that the tasks pending or running when the process stopped can be queued
+    again at the next start (at-least-once execution). Tasks are identified
+    by a registered name and their keyword arguments, which may be updated
+    while they run to checkpoint their progress.
+    """
+
+    def __init__(self, path: Path, max_attempts: int = 5):
+        """
+        Args:
+            path: SQLite database file
+            max_attempts: Number of starts after which a task that never
+                finished is abandoned instead of being resumed
+        """
+        self.path = Path(path)
+        self.max_attempts = max_attempts
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS tasks ("
+                " task_id INTEGER PRIMARY KEY AUTOINCREMENT,"
+                " name TEXT NOT NULL,"
+                " kwargs TEXT NOT NULL,"
+                " dedupe_key TEXT,"
+                " priority INTEGER NOT NULL,"
+                " attempts INTEGER NOT NULL DEFAULT 0,"
+                " created_at TEXT NOT NULL)"
+            )
+
+    def add(
+            self,
+            name: str,
+            kwargs: Mapping[str, Any],
+            dedupe_key: Hashable | None = None,
+            priority: int = 0
+    ) -> int:
+        """
+        Store a queued task.
+
+        Args:
+            name: Registered name of the task
+            kwargs: Keyword arguments of the task
+            dedupe_key: Key of the task, if any
+            priority: Priority of the task
+
+        Returns:
+            int: Id of the stored task
+
+        Raises:
+            TypeError: If an argument cannot be serialized
+        """
+        document = encode_kwargs(kwargs)
+        with self._lock, self._connect() as connection:
+            cursor = connection.execute(
+                "INSERT INTO tasks (name, kwargs, dedupe_key, priority, created_at)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (name, document, None if dedupe_key is None else str(dedupe_key),
+                 int(priority), datetime.now(timezone.utc).isoformat())
+            )
+            return cursor.lastrowid
+
+    def start(self, task_id: int) -> None:
+        """
+        Record that a task is being executed.
+
+        Args:
+            task_id: Id of the task
+        """
+        self._execute("UPDATE tasks SET attempts = attempts + 1 WHERE task_id = ?", (task_id,))
+
+    def checkpoint(self, task_id: int, **updates) -> None:
+        """
+        Update some keyword arguments of a running task, so that it resumes
+        from this point if it is interrupted.
+
+        Args:
+            task_id: Id of the task
+            **updates: Keyword arguments to replace
+        """
+        with self._lock, self._connect() as connection:
+            row = connection.execute(
+                "SELECT kwargs FROM tasks WHERE task_id = ?", (task_id,)
+            ).fetchone()
+            if row is None:
+                return
+            kwargs = json.loads(row[0])
+            kwargs.update(json.loads(encode_kwargs(updates)))
+            connection.execute(
+                "UPDATE tasks SET kwargs = ? WHERE task_id = ?", (json.dumps(kwargs), task_id)
+            )
+
+    def remove(self, task_id: int) -> None:
+        """
+        Delete a finished (or abandoned) task.
+
+        Args:
+            task_id: Id of the task
+        """
+        self._execute("DELETE FROM tasks WHERE task_id = ?", (task_id,))
+
+    def unfinished(self) -> list[StoredTask]:
+        """
+        Read the tasks left by a previous run, in the order they were queued.
+
+        Tasks already started `max_attempts` times are deleted instead, so
+        that a task crashing the process is not retried forever.
+
+        Returns:
+            list[StoredTask]: Tasks to queue again
+        """
+        with self._lock, self._connect() as connection:
+            rows = connection.execute(
+                "SELECT task_id, name, kwargs, dedupe_key, priority, attempts"
+                " FROM tasks ORDER BY task_id"
+            ).fetchall()
+            tasks = [StoredTask(*row) for row in rows]
+            abandoned = [task for task in tasks if task.attempts >= self.max_attempts]
+            for task in abandoned:
+                logger.warning("Abandoning task '%s' (%s) after %d attempts",
+                               task.name, task.dedupe_key, task.attempts)
+            connection.executemany(
+                "DELETE FROM tasks WHERE task_id = ?", [(task.task_id,) for task in abandoned]
+            )
+        return [task for task in tasks if task.attempts < self.max_attempts]
+
+    def __len__(self) -> int:
+        with self._lock, self._connect() as connection:
+            return connection.execute("SELECT COUNT(*) FROM tasks").fetchone()[0]
+
+    def _execute(self, statement: str, parameters: tuple) -> None:
+        """Run a single write statement."""
+        with self._lock, self._connect() as connection:
+            connection.execute(statement, parameters)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open a connection for a single transaction."""
+        connection = sqlite3.connect(self.path, timeout=10)
+        try:
+            with connection:
+                yield connection
+        finally:
+            connection.close()
@@ -92,6 +92,31 @@ class LinkedListNavigator(IStationNavigator):
             return self._current.station
         return None
 
+    def peek_neighbours(self, count: int) -> list[Station]:
+        """
+        Returns the stations around the current one without moving the pointer.
+
+        Args:
+            count: Number of stations to look ahead and behind
+
+        Returns:
+            List of up to `count` next and `count` previous stations, nearest
+            first (next before previous), without duplicates nor the current one
+        """
+        if self._current is None:
+            return []
+
+        neighbours = []
+        seen = {id(self._current)}
+        ahead = behind = self._current
+        for _ in range(count):
+            ahead, behind = ahead.next, behind.previous
+            for node in (ahead, behind):
+                if id(node) not in seen:
+                    seen.add(id(node))
+                    neighbours.append(node.station)
+        return neighbours
+
     def set_current(self, station: Station) -> None:
         """
         Sets the current station to the specified one.
@@ -27,6 +27,10 @@ class IStationNavigator(ABC):
     def get_next(self) -> Station | None:
         """Returns the next station, or None if at the end."""
 
+    @abstractmethod
+    def peek_neighbours(self, count: int) -> list[Station]:
+        """Returns the `count` next and previous stations, without moving."""
+
     @abstractmethod
     def set_current(self, station: Station) -> None:
         """Sets the current station to the given station."""
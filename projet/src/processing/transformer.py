@@ -17,16 +17,28 @@ class DataTransformer:
     DATE_COLUMN = 'heure_de_paris'
     DISPLAY_DATE_COLUMN = 'display_date'
 
-    def __init__(self, date_format: str = "%d/%m/%Y %Hh"):
+    # pandas frequency of each resolution (None keeps every sample)
+    RESOLUTION_FREQUENCIES = {
+        'raw': None,
+        '15min': '15min',
+        'hourly': 'h'
+    }
+
+    def __init__(self, date_format: str = "%d/%m/%Y %Hh", resolution: str = 'hourly'):
         """
         Initialize the DataTransformer.
 
         Args:
             date_format: Format string for display date
                 Default: "%d/%m/%Y %Hh"
+            resolution: Resolution of the ingested records, 'hourly', '15min' or 'raw'
         """
+        if resolution not in self.RESOLUTION_FREQUENCIES:
+            raise ValueError(f"Unknown resolution: {resolution}")
         self.date_format = date_format
-        logger.info("DataTransformer initialized with date_format: %s", date_format)
+        self.resolution = resolution
+        logger.info("DataTransformer initialized with date_format: %s, resolution: %s",
+                    date_format, resolution)
 
     def format_data(self, data: pd.DataFrame) -> pd.DataFrame:
         """
@@ -51,6 +63,7 @@ class DataTransformer:
             logger.info("Transforming DataFrame with %s records", len(data))
 
             data['heure_de_paris'] = pd.to_datetime(data['heure_de_paris'])
+            data = self._align_to_resolution(data)
             data['display_date'] = data['heure_de_paris'].dt.strftime('%Y-%m-%d %H:%M')
             data['temperature_en_degre_c'] = data['temperature_en_degre_c'].astype(np.float64)
             data['humidite'] = data['humidite'].astype(np.int64)
@@ -63,6 +76,67 @@ class DataTransformer:
             logger.error("Transformation failed: %s - %s", type(e).__name__, str(e))
             return pd.DataFrame()
 
+    def _align_to_resolution(self, data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Snap timestamps to the start of their resolution bucket and keep
+        one record per bucket (the first one, i.e. the most recent fetched).
+
+        Args:
+            data: DataFrame with a parsed 'heure_de_paris' column
+
+        Returns:
+            pd.DataFrame: Aligned DataFrame (unchanged for the 'raw' resolution)
+        """
+        frequency = self.RESOLUTION_FREQUENCIES[self.resolution]
+        if frequency is None:
+            return data
+
+        data['heure_de_paris'] = data['heure_de_paris'].dt.floor(frequency)
+        duplicates = data['heure_de_paris'].duplicated()
+        if duplicates.any():
+            logger.debug("Dropping %d records sharing a %s bucket",
+                         duplicates.sum(), self.resolution)
+            data = data[~duplicates].reset_index(drop=True)
+        return data
+
+    @classmethod
+    def downsample(cls, data: pd.DataFrame, resolution: str) -> pd.DataFrame:
+        """
+        Average normalized records into buckets of a coarser resolution.
+
+        Used on read, so that full-resolution data stays on disk while
+        charts get a bounded number of points.
+
+        Args:
+            data: Normalized DataFrame ('date', 'temperature', 'humidity', 'pressure')
+            resolution: Target resolution, 'hourly', '15min' or 'raw' (no-op)
+
+        Returns:
+            pd.DataFrame: One record per non-empty bucket, sorted by date, with
+                the internal dtypes and a regenerated 'display_date' column
+        """
+        frequency = cls.RESOLUTION_FREQUENCIES[resolution]
+        if frequency is None or data.empty:
+            return data
+
+        date = pd.to_datetime(data['date'])
+        buckets = date.dt.floor(frequency)
+        if not buckets.duplicated().any():
+            return data
+
+        df = (
+            data[['temperature', 'humidity', 'pressure']]
+            .groupby(buckets.rename('date'), sort=True)
+            .mean()
+            .reset_index()
+        )
+        df['temperature'] = df['temperature'].round(1)
+        df['humidity'] = df['humidity'].round().astype(np.int64)
+        df['pressure'] = df['pressure'].round().astype(np.int64)
+        df['display_date'] = df['date'].dt.strftime('%Y-%m-%d %H:%M')
+        logger.debug("Downsampled %d records to %d %s records", len(data), len(df), resolution)
+        return df
+
     def normalize_columns(self, data: pd.DataFrame) -> pd.DataFrame:
         """
         Normalize column names to internal format.
@@ -21,15 +21,26 @@ class DataValidator:
         'date': 'datetime64'
     }
 
-    def __init__(self, rules: dict):
+    # Minutes past the hour allowed by each resolution (None allows any)
+    RESOLUTION_MINUTES = {
+        'hourly': {0},
+        '15min': {0, 15, 30, 45},
+        'raw': None
+    }
+
+    def __init__(self, rules: dict, resolution: str = 'hourly'):
         """
         Initializes the validator with a set of rules.
 
         Args:
             rules (dict): Dictionnary of rules set in config.yaml
+            resolution (str): Expected resolution of the records, 'hourly', '15min' or 'raw'
         """
+        if resolution not in self.RESOLUTION_MINUTES:
+            raise ValueError(f"Unknown resolution: {resolution}")
         self.rules = rules
-        logger.info("DataValidator initialized with rules: %s", rules)
+        self.resolution = resolution
+        logger.info("DataValidator initialized with rules: %s, resolution: %s", rules, resolution)
 
     def is_format_correct(self, data: pd.DataFrame) -> bool:
         """
@@ -121,3 +132,36 @@ class DataValidator:
         except Exception as e:  # pylint: disable=broad-exception-caught
             logger.error("Value validation failed: %s - %s", type(e).__name__, str(e))
             return False
+
+    def is_resolution_consistent(self, data: pd.DataFrame) -> bool:
+        """
+        Check that every record falls on a sample of the expected resolution.
+
+        Args:
+            data: Normalized DataFrame with a 'date' column
+
+        Returns:
+            True if all timestamps match the resolution, False otherwise
+        """
+        allowed = self.RESOLUTION_MINUTES[self.resolution]
+        if allowed is None or data.empty:
+            return True
+
+        try:
+            dates = data['date']
+            minutes = dates.dt.minute
+            off_grid = ~minutes.isin(allowed) | (dates.dt.second != 0)
+            if off_grid.any():
+                logger.error(
+                    "%d records do not match the %s resolution",
+                    off_grid.sum(),
+                    self.resolution
+                )
+                return False
+
+            logger.debug("✓ dates match the %s resolution", self.resolution)
+            return True
+
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logger.error("Resolution validation failed: %s - %s", type(e).__name__, str(e))
+            return False
@@ -3,13 +3,18 @@ Module for fetching and loading weather data into Station entities.
 """
 
 import logging
+from datetime import datetime
+from typing import Callable
+import pandas as pd
 
+from projet.src.api.catalog import CatalogSync
 from projet.src.api.extractor import APIExtractor
 from projet.src.storage.parquet_handler import ParquetHandler
 from projet.src.entities.station import Station
 from projet.src.processing.transformer import DataTransformer
 from projet.src.processing.validator import DataValidator
 from projet.src.services.loader import DataLoader
+from projet.src.services.negative_cache import NegativeCache
 
 logger = logging.getLogger(__name__)
 
@@ -24,6 +29,7 @@ class DataFetcher:
     - Validate data quality
     - Load validated data into Station entities
     """
+    # pylint: disable=too-many-instance-attributes
 
     def __init__(
         self,
@@ -31,32 +37,95 @@ class DataFetcher:
         transformer: DataTransformer,
         validator: DataValidator,
         loader: DataLoader,
-        parquet_handler: ParquetHandler
+        parquet_handler: ParquetHandler,
+        incremental: bool = True,
+        backfill_extractor: APIExtractor | None = None,
+        catalog: CatalogSync | None = None,
+        negative_cache: NegativeCache | None = None
     ):
+        """
+        Args:
+            incremental: Only fetch records newer than the latest stored one
+                (falls back to the full window when nothing is stored)
+            backfill_extractor: Extractor used for long histories, e.g. an
+                ExportExtractor (default: `extractor`)
+            catalog: Dataset catalog used to skip dead and stale stations
+                (default: every station is fetched)
+            negative_cache: Remembers stations that returned no data, to
+                re-check them at growing intervals (default: disabled)
+        """
         # pylint: disable=too-many-arguments, too-many-positional-arguments
         self.extractor = extractor
         self.transformer = transformer
         self.validator = validator
         self.loader = loader
         self.parquet_handler = parquet_handler
+        self.incremental = incremental
+        self.backfill_extractor = backfill_extractor or extractor
+        self.catalog = catalog
+        self.negative_cache = negative_cache
 
-    def fetch_and_load(self, station: Station) -> bool:
+    def fetch_and_load(self, station: Station, since: datetime | None = None) -> bool:
         """
         Fetch weather data for a station and load it into the entity.
 
         Args:
             station: The Station entity to update with fresh data
+            since: Only fetch records strictly newer than this timestamp
 
         Returns:
             bool: True if data was successfully fetched and loaded, False otherwise
         """
         # 1. Extract
-        raw_data = self.extractor.extract(station)
+        raw_data = self.extractor.extract(station, since=since)
+        self._record_outcome(station, raw_data, since)
 
         if raw_data.empty:
-            logger.warning("Aucune donnée récupérée pour la station %s", station.name)
+            if since is not None:
+                logger.info("Station %s déjà à jour (depuis %s)", station.name, since)
+            else:
+                logger.warning("Aucune donnée récupérée pour la station %s", station.name)
             return False
 
+        return self._process_and_load(station, raw_data)
+
+    def _record_outcome(
+        self,
+        station: Station,
+        raw_data: pd.DataFrame,
+        since: datetime | None
+    ) -> None:
+        """
+        Update the negative cache after a fetch.
+
+        Only a full fetch (nothing stored yet) that succeeded without
+        records counts as empty: an empty incremental fetch just means the
+        station is up to date, and failed requests are left to the retries
+        and circuit breaker.
+
+        Args:
+            station: The fetched Station entity
+            raw_data: Records returned by the extractor
+            since: Lower bound of the fetch (None for a full fetch)
+        """
+        if self.negative_cache is None:
+            return
+        if not raw_data.empty:
+            self.negative_cache.record_data(station.id)
+        elif since is None and not raw_data.attrs.get('request_failed', False):
+            self.negative_cache.record_empty(station.id)
+
+    def _process_and_load(self, station: Station, raw_data: pd.DataFrame) -> bool:
+        """
+        Transform, validate and load raw API records into the entity.
+
+        Args:
+            station: The Station entity to update
+            raw_data: Non-empty DataFrame of raw API records
+
+        Returns:
+            bool: True if data was successfully loaded, False otherwise
+        """
         # 2. Transform
         formatted_data = self.transformer.format_data(raw_data)
         formatted_data = self.transformer.normalize_columns(formatted_data)
@@ -66,6 +135,10 @@ class DataFetcher:
             logger.error("Format de données invalide pour la station %s", station.name)
             return False
 
+        if not self.validator.is_resolution_consistent(formatted_data):
+            logger.error("Résolution temporelle inattendue pour la station %s", station.name)
+            return False
+
         if not self.validator.are_values_valid(formatted_data):
             logger.warning(
                 "Valeurs de données invalides détectées pour la station %s",
@@ -89,6 +162,198 @@ class DataFetcher:
             bool: True if the entire process was successful, False otherwise.
         """
         logger.info("Starting full refresh and save for station %s", station.name)
-        if self.fetch_and_load(station):
+        if not self._is_fetchable(station):
+            return False
+        if self.fetch_and_load(station, since=self._latest_stored_date(station)):
             return self.parquet_handler.save_station_reports(station)
         return False
+
+    def prefetch_station(self, station: Station) -> bool:
+        """
+        Refreshes a station the user may display next and reads its stored
+        reports into the memory cache of the Parquet handler.
+
+        Args:
+            station: The Station entity to prefetch.
+
+        Returns:
+            bool: True if the station's reports are now cached, False otherwise.
+        """
+        self.refresh_and_save_station_data(station)
+        return self.parquet_handler.preload(station)
+
+    def refresh_stations(
+        self,
+        stations: list[Station],
+        max_concurrency: int = 8
+    ) -> dict[str, bool]:
+        """
+        Refreshes and saves many stations, extracting them concurrently.
+
+        Extractions run in parallel; each station is then transformed,
+        validated and saved as soon as its data arrives.
+
+        Args:
+            stations: The Station entities to refresh.
+            max_concurrency: Maximum number of concurrent API requests.
+
+        Returns:
+            dict[str, bool]: Success of the refresh for each station id.
+        """
+        outcome = {station.id: False for station in stations if not self._is_fetchable(station)}
+        stations_to_fetch = [station for station in stations if station.id not in outcome]
+        by_id = {station.id: station for station in stations_to_fetch}
+
+        since = {station.id: self._latest_stored_date(station) for station in stations_to_fetch}
+        results = self.extractor.extract_many(
+            stations_to_fetch,
+            max_concurrency=max_concurrency,
+            since=since
+        )
+        for result in results:
+            station = by_id[result.station_id]
+            if result.error is None:
+                self._record_outcome(station, result.data, since[station.id])
+            if not result.ok:
+                if since[station.id] is None or result.error is not None:
+                    logger.warning("Aucune donnée récupérée pour la station %s", station.name)
+                outcome[station.id] = False
+                continue
+
+            try:
+                outcome[station.id] = self._process_and_load(station, result.data)
+                if outcome[station.id]:
+                    self.parquet_handler.save_station_reports(station)
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                logger.error("Échec du rafraîchissement de la station %s : %s", station.name, e)
+                outcome[station.id] = False
+
+        logger.info(
+            "Rafraîchissement groupé terminé : %d/%d stations à jour",
+            sum(outcome.values()),
+            len(stations)
+        )
+        return outcome
+
+    def _is_fetchable(
+        self,
+        station: Station,
+        use_negative_cache: bool = True,
+        include_stale: bool = False
+    ) -> bool:
+        """
+        Check the catalog and the negative cache before spending API requests on a station.
+
+        Args:
+            station: The Station entity to check
+            use_negative_cache: Also skip stations that recently returned no data
+            include_stale: Accept stale datasets, whose history is still there
+
+        Returns:
+            bool: False if the catalog marks the station's dataset as dead (or
+                stale, unless `include_stale`), or if it returned no data and
+                its re-check interval is not over
+        """
+        if (self.catalog is not None
+                and not self.catalog.is_fetchable(station, include_stale=include_stale)):
+            logger.info(
+                "Station %s ignorée : jeu de données %s",
+                station.name,
+                self.catalog.status_of(station.id)
+            )
+            return False
+
+        if (use_negative_cache and self.negative_cache is not None
+                and self.negative_cache.should_skip(station.id)):
+            logger.info(
+                "Station %s ignorée : aucune donnée, prochaine vérification à %s",
+                station.name,
+                self.negative_cache.next_check(station.id)
+            )
+            return False
+        return True
+
+    def no_data_since(self, station: Station) -> tuple[datetime, datetime] | None:
+        """
+        Tell since when a station has returned no data, and when it will be re-checked.
+
+        Args:
+            station: The Station entity to look up
+
+        Returns:
+            tuple[datetime, datetime] | None: First empty fetch and next check,
+                or None if the station is not known to be empty
+        """
+        if self.negative_cache is None:
+            return None
+        empty_since = self.negative_cache.empty_since(station.id)
+        if empty_since is None:
+            return None
+        return empty_since, self.negative_cache.next_check(station.id)
+
+    def _latest_stored_date(self, station: Station) -> datetime | None:
+        """
+        Get the lower bound of an incremental fetch for a station.
+
+        Args:
+            station: The Station entity to look up
+
+        Returns:
+            datetime | None: Latest stored date, or None for a full fetch
+        """
+        if not self.incremental:
+            return None
+        return self.parquet_handler.get_latest_date(station)
+
+    def backfill_station(
+        self,
+        station: Station,
+        days: int = 365,
+        stop_at: datetime | None = None,
+        until: datetime | None = None,
+        on_progress: Callable[..., None] | None = None
+    ) -> int:
+        """
+        Fetches a long history for a station and saves it page by page.
+
+        Each page is transformed, validated and merged into the station's
+        Parquet file as soon as it arrives, so memory stays bounded by the
+        page size and an interrupted backfill keeps what was already saved.
+        After each saved page, `on_progress(until=...)` is called with the
+        oldest record reached, from which an interrupted backfill can resume.
+
+        Args:
+            station: The Station entity to backfill.
+            days: Depth of the history to fetch, in days.
+            stop_at: Timestamp of the most recent stored record; paging stops there.
+            until: Only fetch records older than this timestamp (resumption).
+            on_progress: Callback receiving the arguments to resume the backfill with.
+
+        Returns:
+            int: Number of records saved.
+        """
+        # A long history may exist even if the last days were empty or the
+        # dataset stopped being updated: only dead datasets are skipped
+        if not self._is_fetchable(station, use_negative_cache=False, include_stale=True):
+            return 0
+        saved = 0
+        pages = self.backfill_extractor.extract_pages(
+            station, days=days, stop_at=stop_at, until=until
+        )
+        for page in pages:
+            oldest = None
+            if on_progress is not None:
+                oldest = pd.to_datetime(page['heure_de_paris'], utc=True).min()
+            if not self._process_and_load(station, page):
+                logger.warning("Page ignorée pour la station %s", station.name)
+                continue
+            self.parquet_handler.save_station_reports(station)
+            saved += len(station.reports)
+            if on_progress is not None:
+                on_progress(until=oldest)
+
+        if saved and self.negative_cache is not None:
+            self.negative_cache.record_data(station.id)
+
+        logger.info("Backfill terminé pour %s : %d relevés sauvegardés", station.name, saved)
+        return saved
@@ -0,0 +1,178 @@
+"""
+Module scheduling the periodic ingestion of every station, independently of the UI.
+"""
+
+import logging
+import random
+import threading
+from datetime import datetime, timedelta, timezone
+
+import pandas as pd
+
+from projet.src.api.request_queue import ApiRequestQueue, TaskPriority
+from projet.src.entities.station import Station
+from projet.src.services.data_fetcher import DataFetcher
+
+logger = logging.getLogger(__name__)
+
+
+class IngestionScheduler:
+    """
+    Refreshes every configured station once an hour, in the background.
+
+    The API publishes new records at the top of each hour: each pass runs
+    `offset` seconds after it, plus a random jitter of up to `jitter`
+    seconds so that several instances do not hit the API at the same time.
+    A pass queues a background refresh for every station whose latest
+    stored record is older than `max_age`; stations already fresh are
+    skipped, and refreshes requested meanwhile by users are coalesced with
+    them by station id.
+    """
+    # pylint: disable=too-many-instance-attributes
+
+    def __init__(
+            self,
+            api_queue: ApiRequestQueue,
+            data_fetcher: DataFetcher,
+            stations: list[Station],
+            offset: float = 300,
+            jitter: float = 300,
+            max_age: float = 3600,
+            rng: random.Random | None = None
+    ):
+        """
+        Args:
+            api_queue: Process-wide request queue running the refreshes
+            data_fetcher: Service refreshing and saving a station's data
+            stations: Stations to keep up to date
+            offset: Delay after the top of the hour, in seconds
+            jitter: Maximum random delay added to the offset, in seconds
+            max_age: Age of the latest stored record beyond which a station
+                is refreshed, in seconds
+            rng: Random generator of the jitter (default: a new one)
+        """
+        # pylint: disable=too-many-arguments, too-many-positional-arguments
+        self.api_queue = api_queue
+        self.data_fetcher = data_fetcher
+        self.stations = stations
+        self.offset = offset
+        self.jitter = jitter
+        self.max_age = timedelta(seconds=max_age)
+        self._random = rng or random.Random()
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def is_running(self) -> bool:
+        """True if the scheduler thread is alive."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def next_run(self, now: datetime | None = None) -> datetime:
+        """
+        Compute the time of the next pass.
+
+        Once the offset of the current hour is reached, its pass is due or
+        done, so the next one is always in the following hour: a jitter
+        drawn again after a pass can not schedule a second pass in the same
+        hour.
+
+        Args:
+            now: Reference time (default: now)
+
+        Returns:
+            datetime: Next top of the hour plus the offset and a random jitter
+        """
+        now = now or datetime.now(timezone.utc)
+        top_of_hour = now.replace(minute=0, second=0, microsecond=0)
+        if now >= top_of_hour + timedelta(seconds=self.offset):
+            top_of_hour += timedelta(hours=1)
+        return top_of_hour + timedelta(seconds=self.offset + self._random.uniform(0, self.jitter))
+
+    def is_fresh(self, station: Station, now: datetime | None = None) -> bool:
+        """
+        Check whether the stored data of a station is recent enough.
+
+        Args:
+            station: Station to check
+            now: Reference time (default: now)
+
+        Returns:
+            bool: True if its latest stored record is newer than `max_age`
+        """
+        latest = self.data_fetcher.parquet_handler.get_latest_date(station)
+        if latest is None:
+            return False
+        latest = pd.Timestamp(latest)
+        if latest.tzinfo is None:
+            latest = latest.tz_localize('UTC')
+        return (now or datetime.now(timezone.utc)) - latest < self.max_age
+
+    def run_once(self, now: datetime | None = None) -> int:
+        """
+        Queue a background refresh for every station that is not fresh.
+
+        Args:
+            now: Reference time (default: now)
+
+        Returns:
+            int: Number of refreshes requested
+        """
+        stale = [station for station in self.stations if not self.is_fresh(station, now)]
+        for station in stale:
+            self.api_queue.add_task(
+                self.data_fetcher.refresh_and_save_station_data,
+                station=station,
+                dedupe_key=station.id,
+                priority=TaskPriority.BACKGROUND
+            )
+        logger.info("Ingestion planifiée : %d/%d stations à rafraîchir",
+                    len(stale), len(self.stations))
+        return len(stale)
+
+    def start(self, run_now: bool = True) -> None:
+        """
+        Start the scheduler thread.
+
+        Args:
+            run_now: Catch up with a first pass immediately, without waiting
+                for the next hour
+        """
+        if self.is_running:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._run, args=(run_now,), name="ingestion-scheduler", daemon=True
+        )
+        self._thread.start()
+        logger.info("Ingestion scheduler started for %d stations", len(self.stations))
+
+    def stop(self) -> None:
+        """
+        Stop the scheduler thread.
+        """
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+        logger.info("Ingestion scheduler stopped.")
+
+    def _run(self, run_now: bool) -> None:
+        """
+        Scheduler loop: run a pass, then sleep until the next one.
+
+        Args:
+            run_now: Run a first pass before waiting
+        """
+        if run_now:
+            self._safe_run_once()
+        while True:
+            delay = (self.next_run() - datetime.now(timezone.utc)).total_seconds()
+            if self._stop_event.wait(max(0.0, delay)):
+                return
+            self._safe_run_once()
+
+    def _safe_run_once(self) -> None:
+        """Run a pass, keeping the scheduler alive if it fails."""
+        try:
+            self.run_once()
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logger.error("Scheduled ingestion pass failed: %s", e, exc_info=True)
@@ -51,10 +51,7 @@ class DataLoader:
                 station.name
             )
 
-            reports = [
-                self._create_report(row)
-                for _, row in data.iterrows()
-            ]
+            reports = self._create_reports(data)
 
             station.reports = reports
             logger.info(
@@ -95,20 +92,32 @@ class DataLoader:
                 "Data must be transformed by DataTransformer before loading."
             )
 
-    def _create_report(self, row: pd.Series) -> WeatherReport:
+    def _create_reports(self, data: pd.DataFrame) -> list[WeatherReport]:
         """
-        Create a single WeatherReport from a DataFrame row.
+        Create the WeatherReport objects of a DataFrame.
+
+        Columns are zipped instead of iterating over rows, which avoids
+        building one pandas Series per record on full-resolution data.
 
         Args:
-            row: pandas Series with weather data
+            data: DataFrame with weather data
 
         Returns:
-            WeatherReport: Initialized weather report object
+            list[WeatherReport]: One initialized weather report per row
         """
-        return WeatherReport(
-            date=row['date'],
-            temperature=row['temperature'],
-            humidity=row['humidity'],
-            pressure=row['pressure'],
-            display_date=row['display_date']
-        )
+        return [
+            WeatherReport(
+                date=date,
+                temperature=temperature,
+                humidity=humidity,
+                pressure=pressure,
+                display_date=display_date
+            )
+            for date, temperature, humidity, pressure, display_date in zip(
+                data['date'],
+                data['temperature'],
+                data['humidity'],
+                data['pressure'],
+                data['display_date']
+            )
+        ]
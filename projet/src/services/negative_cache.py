@@ -0,0 +1,147 @@
+"""
+Module remembering which stations returned no data, to avoid re-fetching them.
+"""
+
+import json
+import logging
+import threading
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class EmptyStation:
+    """
+    Negative cache entry of a station whose fetches returned no data.
+    """
+    empty_since: str
+    last_checked: str
+    misses: int = 1
+
+
+class NegativeCache:
+    """
+    Persistent negative cache of stations returning no data.
+
+    After each empty fetch, the station is not fetched again before a
+    re-check interval that doubles with every consecutive miss, from
+    `base_interval` up to `max_interval`. Any fetch returning data clears
+    the entry. Entries are stored in a JSON file and survive restarts.
+    """
+
+    def __init__(self, path: Path, base_interval: int = 900, max_interval: int = 24 * 3600):
+        """
+        Args:
+            path: JSON file storing the entries
+            base_interval: Re-check interval after the first miss, in seconds
+            max_interval: Upper bound of the re-check interval, in seconds
+        """
+        self.path = Path(path)
+        self.base_interval = base_interval
+        self.max_interval = max_interval
+        self._lock = threading.Lock()
+        self._entries: dict[str, EmptyStation] = self._load()
+
+    def record_empty(self, station_id: str, now: datetime | None = None) -> None:
+        """
+        Record an empty fetch for a station.
+
+        Args:
+            station_id: Id of the station
+            now: Time of the fetch (default: now)
+        """
+        now = (now or datetime.now(timezone.utc)).isoformat()
+        with self._lock:
+            entry = self._entries.get(station_id)
+            if entry is None:
+                entry = EmptyStation(empty_since=now, last_checked=now)
+                self._entries[station_id] = entry
+            else:
+                entry.last_checked = now
+                entry.misses += 1
+            self._save()
+        logger.info("Station %s sans données (%d échecs), prochaine vérification dans %s",
+                    station_id, entry.misses, self._interval(entry))
+
+    def record_data(self, station_id: str) -> None:
+        """
+        Record a fetch that returned data, clearing the station's entry.
+
+        Args:
+            station_id: Id of the station
+        """
+        with self._lock:
+            if self._entries.pop(station_id, None) is None:
+                return
+            self._save()
+        logger.info("Station %s renvoie de nouveau des données", station_id)
+
+    def should_skip(self, station_id: str, now: datetime | None = None) -> bool:
+        """
+        Check whether a station is still within its re-check interval.
+
+        Args:
+            station_id: Id of the station
+            now: Reference time (default: now)
+
+        Returns:
+            bool: True if the station must not be fetched yet
+        """
+        next_check = self.next_check(station_id)
+        return next_check is not None and (now or datetime.now(timezone.utc)) < next_check
+
+    def empty_since(self, station_id: str) -> datetime | None:
+        """
+        Get the time of the first of the consecutive empty fetches of a station.
+
+        Args:
+            station_id: Id of the station
+
+        Returns:
+            datetime | None: First empty fetch, or None if the station has data
+        """
+        entry = self._entries.get(station_id)
+        return datetime.fromisoformat(entry.empty_since) if entry else None
+
+    def next_check(self, station_id: str) -> datetime | None:
+        """
+        Get the time from which a station may be fetched again.
+
+        Args:
+            station_id: Id of the station
+
+        Returns:
+            datetime | None: End of the re-check interval, or None if the station has data
+        """
+        entry = self._entries.get(station_id)
+        if entry is None:
+            return None
+        return datetime.fromisoformat(entry.last_checked) + self._interval(entry)
+
+    def _interval(self, entry: EmptyStation) -> timedelta:
+        """Re-check interval of an entry, doubling with each consecutive miss."""
+        seconds = self.base_interval * 2 ** min(entry.misses - 1, 32)
+        return timedelta(seconds=min(seconds, self.max_interval))
+
+    def _load(self) -> dict[str, EmptyStation]:
+        """Load the persisted entries, if any."""
+        if not self.path.exists():
+            return {}
+        try:
+            stored = json.loads(self.path.read_text(encoding='utf-8'))
+            return {station_id: EmptyStation(**entry) for station_id, entry in stored.items()}
+        except (OSError, ValueError, TypeError) as e:
+            logger.warning("Ignoring unreadable negative cache %s: %s", self.path, e)
+            return {}
+
+    def _save(self) -> None:
+        """Persist the entries (the lock must be held)."""
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            stored = {station_id: asdict(entry) for station_id, entry in self._entries.items()}
+            self.path.write_text(json.dumps(stored, indent=2), encoding='utf-8')
+        except OSError as e:
+            logger.error("Failed to save negative cache %s: %s", self.path, e)
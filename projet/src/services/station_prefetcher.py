@@ -0,0 +1,79 @@
+"""
+Module prefetching the stations around the one displayed, to make navigation instant.
+"""
+
+import logging
+
+from projet.src.api.request_queue import ApiRequestQueue, TaskHandle, TaskPriority
+from projet.src.entities.station import Station
+from projet.src.interfaces.station_navigator import IStationNavigator
+from projet.src.services.data_fetcher import DataFetcher
+
+logger = logging.getLogger(__name__)
+
+
+class StationPrefetcher:
+    """
+    Prefetches the neighbours of the current station for one user session.
+
+    Whenever the current station changes, the `count` next and previous
+    stations are queued with the PREFETCH priority: they are refreshed and
+    their reports read into memory, so that "Next" and "Previous" display
+    them without waiting. Prefetches of stations that left the window are
+    cancelled if they have not started yet. Requests are keyed by station
+    id, so the refresh queued when the user lands on a station is merged
+    into (and promotes) its pending prefetch instead of fetching it twice.
+    """
+    # pylint: disable=too-few-public-methods
+
+    def __init__(self, api_queue: ApiRequestQueue, data_fetcher: DataFetcher, count: int = 1):
+        """
+        Args:
+            api_queue: Process-wide request queue running the prefetches
+            data_fetcher: Service refreshing and caching a station's data
+            count: Number of stations prefetched on each side (0 disables it)
+        """
+        self.api_queue = api_queue
+        self.data_fetcher = data_fetcher
+        self.count = count
+        self._current_id: str | None = None
+        self._handles: dict[str, TaskHandle] = {}
+
+    def update(self, navigator: IStationNavigator) -> None:
+        """
+        Adjust the prefetches to the current station of the navigator.
+
+        Nothing is done while the current station stays the same.
+
+        Args:
+            navigator: Navigator of the session
+        """
+        current = navigator.get_current()
+        if current is None or current.id == self._current_id or self.count <= 0:
+            return
+        self._current_id = current.id
+        neighbours = navigator.peek_neighbours(self.count)
+        wanted = {station.id for station in neighbours}
+
+        for station_id in list(self._handles):
+            if station_id in wanted:
+                continue
+            handle = self._handles.pop(station_id)
+            # The new current station is refreshed anyway: its request may go on
+            if station_id != current.id and handle.cancel():
+                logger.debug("Prefetch of station %s cancelled", station_id)
+
+        for station in neighbours:
+            handle = self._handles.get(station.id)
+            if handle is None or handle.cancelled():
+                self._handles[station.id] = self._prefetch(station)
+
+    def _prefetch(self, station: Station) -> TaskHandle:
+        """Queue the prefetch of a station."""
+        logger.debug("Prefetching station %s", station.name)
+        return self.api_queue.add_task(
+            self.data_fetcher.prefetch_station,
+            station=station,
+            dedupe_key=station.id,
+            priority=TaskPriority.PREFETCH
+        )
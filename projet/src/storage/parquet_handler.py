@@ -3,11 +3,15 @@ Module for handling Parquet files.
 """
 
 import logging
+import threading
+from collections import OrderedDict
 from pathlib import Path
 from typing import Optional
 import pandas as pd
+import pyarrow.parquet as pq
 
 from projet.src.entities.station import Station
+from projet.src.processing.transformer import DataTransformer
 from projet.src.services.loader import DataLoader
 
 logger = logging.getLogger(__name__)
@@ -16,13 +20,29 @@ logger = logging.getLogger(__name__)
 class ParquetHandler:
     """
     Manages the saving and loading of weather reports in Parquet format.
+
+    The last `cache_size` frames read are kept in memory, keyed by file and
+    modification time, so that displaying a station again (or one that was
+    prefetched with `preload`) skips the read and the downsampling.
     """
 
-    def __init__(self, data_dir: Path | None = None, compression: Optional[str] = 'snappy'):
+    def __init__(
+            self,
+            data_dir: Path | None = None,
+            compression: Optional[str] = 'snappy',
+            read_resolution: str = 'raw',
+            cache_size: int = 0
+    ):
         """
         Args:
             data_dir: Parquet file storage directory
+            compression: Parquet compression codec
+            read_resolution: Resolution of the reports loaded for display
+                ('hourly', '15min' or 'raw'); files always keep every stored record
+            cache_size: Number of downsampled frames kept in memory (0 disables it)
         """
+        if read_resolution not in DataTransformer.RESOLUTION_FREQUENCIES:
+            raise ValueError(f"Unknown resolution: {read_resolution}")
         if data_dir is None:
             project_root = Path(__file__).parent.parent.parent
             data_dir = project_root / "data" / "parquet"
@@ -30,6 +50,10 @@ class ParquetHandler:
         self.data_dir = data_dir
         self.data_dir.mkdir(parents=True, exist_ok=True)
         self.compression = compression
+        self.read_resolution = read_resolution
+        self.cache_size = cache_size
+        self._frames: OrderedDict[Path, tuple[int, pd.DataFrame]] = OrderedDict()
+        self._lock = threading.Lock()
         logger.info("ParquetHandler initialized with directory: %s", self.data_dir)
 
     def save_station_reports(self, station: Station) -> None:
@@ -72,7 +96,7 @@ class ParquetHandler:
 
         # Save to Parquet
         try:
-            df.to_parquet(filepath, engine='pyarrow', compression='snappy', index=False)
+            df.to_parquet(filepath, engine='pyarrow', compression=self.compression, index=False)
             logger.info("Saved %s reports for station '%s' to %s", len(df), station.name, filepath)
 
         except Exception as e:  # pylint: disable=broad-exception-caught
@@ -84,6 +108,9 @@ class ParquetHandler:
         """
         Loads weather reports from a station from Parquet.
 
+        Records are downsampled to `read_resolution` after reading, so that
+        full-resolution files do not slow down the dashboard.
+
         Args:
             station: Station to be filled with reports (modifies station.reports)
             loader: DataLoader instance to handle report conversion (default: new DataLoader)
@@ -100,8 +127,7 @@ class ParquetHandler:
             return
 
         try:
-            df = pd.read_parquet(filepath, engine='pyarrow')
-            loader.load_reports(station, df)
+            loader.load_reports(station, self._read_frame(filepath))
             logger.info("Loaded %s reports for station '%s'", len(station.reports), station.name)
 
         except Exception as e:  # pylint: disable=broad-exception-caught
@@ -109,6 +135,56 @@ class ParquetHandler:
                          station.name, type(e).__name__, str(e))
             station.reports = []
 
+    def preload(self, station: Station) -> bool:
+        """
+        Reads the reports of a station into the memory cache, without
+        loading them into the station (e.g. before the user displays it).
+
+        Args:
+            station: Station whose file is read
+
+        Returns:
+            bool: True if the frame is now cached, False otherwise
+        """
+        filepath = self._get_filepath(station)
+        if self.cache_size <= 0 or not filepath.exists():
+            return False
+        try:
+            self._read_frame(filepath)
+            return True
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logger.error("Failed to preload reports for station '%s': %s - %s",
+                         station.name, type(e).__name__, str(e))
+            return False
+
+    def _read_frame(self, filepath: Path) -> pd.DataFrame:
+        """
+        Read and downsample a Parquet file, from the memory cache if the file
+        has not changed since it was cached.
+
+        Args:
+            filepath: Parquet file to read
+
+        Returns:
+            pd.DataFrame: Records at `read_resolution` (must not be modified)
+        """
+        modified = filepath.stat().st_mtime_ns
+        with self._lock:
+            cached = self._frames.get(filepath)
+            if cached is not None and cached[0] == modified:
+                self._frames.move_to_end(filepath)
+                return cached[1]
+
+        df = pd.read_parquet(filepath, engine='pyarrow')
+        df = DataTransformer.downsample(df, self.read_resolution)
+        if self.cache_size > 0:
+            with self._lock:
+                self._frames[filepath] = (modified, df)
+                self._frames.move_to_end(filepath)
+                while len(self._frames) > self.cache_size:
+                    self._frames.popitem(last=False)
+        return df
+
     def station_file_exists(self, station: Station) -> bool:
         """
         Checks whether a Parquet file exists for a station.
@@ -124,6 +200,45 @@ class ParquetHandler:
         logger.debug("File check for station '%s': %s", station.name, exists)
         return exists
 
+    def get_latest_date(self, station: Station) -> pd.Timestamp | None:
+        """
+        Gets the timestamp of the most recent stored report of a station.
+
+        The value is read from the Parquet footer statistics, without loading
+        any row; the 'date' column is only read if statistics are missing.
+
+        Args:
+            station: Station to look up
+
+        Returns:
+            pd.Timestamp | None: Latest stored date, or None if nothing is stored
+        """
+        filepath = self._get_filepath(station)
+        if not filepath.exists():
+            return None
+
+        try:
+            metadata = pq.ParquetFile(filepath).metadata
+            date_index = metadata.schema.to_arrow_schema().get_field_index('date')
+            maxima = []
+            for i in range(metadata.num_row_groups):
+                stats = metadata.row_group(i).column(date_index).statistics
+                if stats is None or not stats.has_min_max:
+                    maxima = None
+                    break
+                maxima.append(stats.max)
+
+            if maxima is None:
+                maxima = [pd.read_parquet(filepath, columns=['date'])['date'].max()]
+
+            latest = max(maxima, default=None)
+            return None if latest is None or pd.isna(latest) else pd.Timestamp(latest)
+
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logger.error("Failed to read latest date for station '%s': %s - %s",
+                         station.name, type(e).__name__, str(e))
+            return None
+
     def _get_filepath(self, station: Station) -> Path:
         """
         Get the parquet filepath for a station.
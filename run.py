@@ -4,6 +4,8 @@ Il permet de lancer l'application, de lancer les tests,
 d'installer les dépendances et de nettoyer les fichiers temporaires.
 """
 
+import argparse
+import csv
 import os
 import shutil
 import sys
@@ -57,6 +59,42 @@ def test():
         print("\n\n🛑 Tests interrompus")
         sys.exit(130)  # Code standard pour interruption
 
+def stub_api():
+    """Lance une API locale imitant l'API Opendatasoft (tests de charge hors ligne)"""
+    parser = argparse.ArgumentParser(prog="python run.py stub-api")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="délai par réponse (s)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="proportion de 503")
+    parser.add_argument("--payload-size", type=int, default=None, help="relevés par réponse")
+    parser.add_argument("--cassettes", type=Path, default=None, help="réponses enregistrées")
+    parser.add_argument("--stations", type=Path, default=None,
+                        help="CSV des stations à lister dans le catalogue")
+    args = parser.parse_args(sys.argv[2:])
+
+    dataset_ids = []
+    if args.stations is not None:
+        with open(args.stations, encoding="utf-8-sig", newline="") as file:
+            dataset_ids = [row["id_nom"] for row in csv.DictReader(file, delimiter=";")]
+
+    # Importé ici : 'install' et 'clean' doivent fonctionner sans les dépendances
+    from projet.src.api.stub_server import StubApiServer  # pylint: disable=import-outside-toplevel
+
+    server = StubApiServer(
+        port=args.port,
+        latency=args.latency,
+        error_rate=args.error_rate,
+        payload_size=args.payload_size,
+        cassette_dir=args.cassettes,
+        dataset_ids=dataset_ids
+    )
+    print(f"🧪 API locale démarrée : {server.url_base}")
+    print("   Renseigner cette URL dans 'api.url_base' de config.json pour l'utiliser")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n🛑 API locale arrêtée")
+
+
 def clean():
     """Nettoie les fichiers temporaires"""
 
@@ -110,6 +148,7 @@ def help_cmd():
     python run.py test       🧪 Lance les tests avec pytest
     python run.py install    📦 Installe les dépendances
     python run.py clean      🧹 Nettoie les fichiers temporaires
+    python run.py stub-api   🧪 Lance une API locale (--latency, --error-rate, ...)
     python run.py help       ❓ Affiche cette aide
 
 💡 Exemples:
@@ -127,6 +166,7 @@ commands = {
     "run": run,
     "test": test,
     "clean": clean,
+    "stub-api": stub_api,
     "help": help_cmd,
 }
 
@@ -10,7 +10,7 @@ import pytest
 import streamlit as st
 import runpy
 
-from projet.app import main, _render_dashboard
+from projet.app import main, _render_dashboard, _watch_station_refresh
 
 class SessionStateMock(dict):
     """Simule st.session_state avec support du format dictionnaire et attributs."""
@@ -26,9 +26,6 @@ class SessionStateMock(dict):
 @pytest.fixture
 def mock_st(mocker):
     state = SessionStateMock()
-    # Initialisation des états par défaut pour éviter les KeyError
-    state['task_status'] = {"refresh_needed": False}
-    
     mocker.patch.object(st, "session_state", state)
     mocker.patch.object(st, "rerun")
     mocker.patch.object(st, "sidebar")
@@ -36,8 +33,7 @@ def mock_st(mocker):
     mocker.patch.object(st, "selectbox")
     mocker.patch.object(st, "plotly_chart")
     mocker.patch.object(st, "spinner")
-    # Patch time.sleep pour accélérer les tests
-    mocker.patch("time.sleep")
+    mocker.patch.object(st, "fragment")
     return st
 
 @pytest.fixture
@@ -45,11 +41,13 @@ def mock_components(mocker):
     mocks = {
         "ConfigLoader": mocker.patch("projet.app.ConfigLoader"),
         "AppInitializer": mocker.patch("projet.app.AppInitializer"),
-        "ApiRequestQueue": mocker.patch("projet.app.ApiRequestQueue"),
+        "SessionRequestQueue": mocker.patch("projet.app.SessionRequestQueue"),
         "LinkedListNavigator": mocker.patch("projet.app.LinkedListNavigator"),
         "Sidebar": mocker.patch("projet.app.Sidebar"),
         "NavigationHeader": mocker.patch("projet.app.NavigationHeader"),
-        "MetricsDisplay": mocker.patch("projet.app.MetricsDisplay")
+        "MetricsDisplay": mocker.patch("projet.app.MetricsDisplay"),
+        "AdminPanel": mocker.patch("projet.app.AdminPanel"),
+        "StationPrefetcher": mocker.patch("projet.app.StationPrefetcher")
     }
     # Forçage du retour de init_services pour l'unpacking (important !)
     mock_init_instance = mocks["AppInitializer"].return_value
@@ -65,26 +63,92 @@ def test_main_initialization_flow(mocker, mock_st, mock_components):
     # Simuler le fait que les objets ne sont pas encore en session
     # (On vide le dictionnaire initialisé par la fixture)
     st.session_state.clear()
-    st.session_state.task_status = {"refresh_needed": False}
 
     main()
 
     # Vérifications
     assert "api_queue" in st.session_state
     assert "navigator" in st.session_state
-    mock_components["ApiRequestQueue"].called
+    st.session_state.prefetcher.update.assert_called_once_with(st.session_state.navigator)
+    mock_components["SessionRequestQueue"].called
 
-def test_main_rerun_when_api_working(mocker, mock_st, mock_components):
-    # Setup : simuler une file d'attente qui travaille
-    mock_queue = mocker.Mock()
-    mock_queue.is_working = True
+def test_main_does_not_poll_when_api_working(mocker, mock_st, mock_components):
+    """Test : Une station en cours de rafraîchissement ne provoque ni sleep ni rerun"""
+    mock_queue = mocker.Mock(**{"is_pending.return_value": True, "completions.return_value": 0})
     st.session_state.api_queue = mock_queue
-    st.session_state.task_status = {"refresh_needed": False}
+    sleep = mocker.patch("time.sleep")
 
     main()
-    
-    # Vérifie que le code appelle rerun à cause de is_working
-    assert st.rerun.called
+
+    sleep.assert_not_called()
+    st.rerun.assert_not_called()
+
+def _run_fragment(mocker):
+    """Remplace st.fragment par un décorateur qui exécute la fonction et la garde pour ses relances."""
+    fragments = []
+    def fragment(run_every=None):
+        def register(func):
+            fragments.append((run_every, func))
+            return func
+        return register
+    mocker.patch.object(st, "fragment", side_effect=fragment)
+    mocker.patch.object(st, "caption")
+    return fragments
+
+@pytest.fixture
+def shared_state(mocker):
+    """File partagée simulée : clés en cours et nombre de rafraîchissements réussis"""
+    pending, counts = set(), {"S1": 0, "S2": 0}
+    api_queue = mocker.Mock()
+    api_queue.is_pending.side_effect = lambda key: key in pending
+    api_queue.completions.side_effect = lambda key: counts[key]
+    return api_queue, pending, counts
+
+def test_watch_station_refresh_polls_while_pending(mocker, mock_st, shared_state):
+    """Test : Le fragment se relance vite tant que la station affichée est en cours"""
+    fragments = _run_fragment(mocker)
+    api_queue, pending, _ = shared_state
+    pending.add("S1")
+
+    _watch_station_refresh(api_queue, "S1", 2.0, 30.0)
+
+    assert fragments[0][0] == 2.0
+    st.caption.assert_called_once()
+    st.rerun.assert_not_called()
+
+def test_watch_station_refresh_reruns_on_any_completion(mocker, mock_st, shared_state):
+    """Test : Un rafraîchissement de la station affichée, quel qu'en soit l'auteur, recharge l'appli"""
+    fragments = _run_fragment(mocker)
+    api_queue, pending, counts = shared_state
+    pending.add("S1")
+    _watch_station_refresh(api_queue, "S1", 2.0, 30.0)
+    _, watcher = fragments[0]
+
+    # Rafraîchissement d'une autre station : ignoré
+    counts["S2"] += 1
+    watcher()
+    st.rerun.assert_not_called()
+
+    pending.discard("S1")
+    counts["S1"] += 1
+    watcher()
+    st.rerun.assert_called_once_with()
+
+def test_watch_station_refresh_idle(mocker, mock_st, shared_state):
+    """Test : Sans rafraîchissement en cours, le fragment ne vérifie que rarement la file"""
+    fragments = _run_fragment(mocker)
+    api_queue, pending, _ = shared_state
+
+    _watch_station_refresh(api_queue, "S1", 2.0, 30.0)
+
+    assert fragments[0][0] == 30.0
+    st.caption.assert_not_called()
+    st.rerun.assert_not_called()
+
+    # Un rafraîchissement lancé ailleurs (planificateur, autre session) : passage au polling rapide
+    pending.add("S1")
+    fragments[0][1]()
+    st.rerun.assert_called_once_with()
 
 def test_render_dashboard_normal_metric(mocker, mock_st):
     # Mock des données de station
@@ -123,17 +187,6 @@ def test_render_dashboard_no_reports(mocker, mock_st):
 
     st.info.assert_called_with("Not enough data to display chart")
 
-def test_main_refresh_needed(mocker, mock_st, mock_components):
-    # Setup : simuler un besoin de rafraîchissement
-    st.session_state.task_status = {"refresh_needed": True}
-    st.session_state.api_queue = mocker.Mock(is_working=False)
-    st.session_state.navigator = mocker.Mock()
-    
-    main()
-    
-    assert st.session_state.task_status["refresh_needed"] is False
-    assert st.rerun.called
-
 def test_render_dashboard_surprise(mocker, mock_st):
     mock_station = mocker.Mock()
     st.selectbox.return_value = "Surprise 🎁"
@@ -145,8 +198,7 @@ def test_render_dashboard_surprise(mocker, mock_st):
 
 def test_main_no_data_available(mocker, mock_st, mock_components):
     # Setup : simuler une station sans données
-    st.session_state.task_status = {"refresh_needed": False}
-    st.session_state.api_queue = mocker.Mock(is_working=False)
+    st.session_state.api_queue = mocker.Mock(**{"is_pending.return_value": False, "completions.return_value": 0})
     
     mock_station = mocker.Mock()
     mock_station.reports = False # Simule if not current_station.reports
@@ -162,6 +214,27 @@ def test_main_no_data_available(mocker, mock_st, mock_components):
 
     assert st.warning.called
 
+def test_main_no_data_since(mocker, mock_st, mock_components):
+    """Test : Une station connue pour être vide affiche depuis quand"""
+    from datetime import datetime, timezone
+    st.session_state.api_queue = mocker.Mock(**{"is_pending.return_value": False, "completions.return_value": 0})
+    mock_station = mocker.Mock(reports=[])
+    st.session_state.navigator = mocker.Mock(**{"get_current.return_value": mock_station})
+    mock_components["ConfigLoader"].return_value.get.return_value = "Title"
+    data_fetcher = mock_components["AppInitializer"].return_value.init_services.return_value[1]
+    data_fetcher.no_data_since.return_value = (
+        datetime(2023, 1, 1, 12, tzinfo=timezone.utc),
+        datetime(2023, 1, 1, 13, tzinfo=timezone.utc)
+    )
+    mocker.patch.object(st, "warning")
+    mocker.patch.object(st, "info")
+    mocker.patch.object(st, "error")
+
+    main()
+
+    assert "No data since" in st.info.call_args.args[0]
+    st.error.assert_not_called()
+
 def test_script_execution_entry_point_via_side_effect(mocker):
     # Au lieu de mocker main (qui est redéfini par runpy), 
     # on mock ce que main APPELLE en premier.
@@ -169,6 +242,12 @@ def test_script_execution_entry_point_via_side_effect(mocker):
     
     # On mock aussi les autres composants pour éviter que le reste du script ne plante
     mocker.patch("projet.app.ConfigLoader")
+    # Pas d'ingestion planifiée, de file durable ni de worker en arrière-plan
+    # pendant le reste de la suite, et aucune requête réseau
+    mocker.patch("projet.app.AppInitializer.init_scheduler")
+    mocker.patch("projet.app.AppInitializer.init_request_queue")
+    mocker.patch("projet.app.AppInitializer.init_services")
+    mocker.patch("projet.src.services.station_prefetcher.StationPrefetcher")
 
     try:
         runpy.run_path("projet/app.py", run_name="__main__")
@@ -101,8 +101,19 @@ def test_setup_logging(mocker):
 # --- Test init_services ---
 
 def test_init_services(mocker):
+    AppInitializer.init_services.clear()
     mocker.patch("projet.app_init.ConfigLoader")
+    mocker.patch("projet.app_init.HttpSessionPool")
+    mocker.patch("projet.app_init.ResponseCache")
+    mocker.patch("projet.app_init.RetryPolicy")
+    mocker.patch("projet.app_init.CircuitBreaker")
+    mocker.patch("projet.app_init.RateLimiter")
+    mocker.patch("projet.app_init.ResponseRecorder")
     mocker.patch("projet.app_init.APIExtractor")
+    mocker.patch("projet.app_init.ExportExtractor")
+    mocker.patch("projet.app_init.CatalogSync")
+    mocker.patch("projet.app_init.NegativeCache")
+    mocker.patch("projet.app_init.DataTransformer")
     mocker.patch("projet.app_init.DataValidator")
     mocker.patch("projet.app_init.ParquetHandler")
     mocker.patch("projet.app_init.DataFetcher")
@@ -111,3 +122,111 @@ def test_init_services(mocker):
     res = AppInitializer.init_services()
 
     assert len(res) == 3
+
+def test_init_request_queue_is_shared(mocker):
+    """Test : Une seule file (et un seul pool de workers) par processus"""
+    AppInitializer.init_request_queue.clear()
+    mocker.patch("projet.app_init.ConfigLoader").return_value.get.side_effect = (
+        lambda key, default=None: default
+    )
+    mock_queue = mocker.patch("projet.app_init.ApiRequestQueue")
+
+    first = AppInitializer.init_request_queue()
+    second = AppInitializer.init_request_queue()
+
+    assert first is second
+    mock_queue.assert_called_once_with(
+        workers=4, process_workers=0, aging_interval=10,
+        max_size=0, overflow_policy='reject', block_timeout=1.0, store=None
+    )
+    mock_queue.return_value.start.assert_called_once()
+    AppInitializer.init_request_queue.clear()
+
+def test_init_scheduler(mocker, app_init, mock_config):
+    """Test : Le planificateur d'ingestion est créé une fois, sur la file partagée"""
+    AppInitializer.init_scheduler.clear()
+    mock_config.get.side_effect = lambda key, default=None: True if key == 'scheduler.enabled' else default
+    mocker.patch.object(AppInitializer, "init_services", return_value=("ph", "fetcher", "charts"))
+    mocker.patch.object(AppInitializer, "init_request_queue", return_value="queue")
+    mocker.patch.object(AppInitializer, "load_stations", return_value=["s1"])
+    mock_scheduler = mocker.patch("projet.app_init.IngestionScheduler")
+
+    assert app_init.init_scheduler() is mock_scheduler.return_value
+    app_init.init_scheduler()
+
+    mock_scheduler.assert_called_once_with(
+        api_queue="queue", data_fetcher="fetcher", stations=["s1"],
+        offset=300, jitter=300, max_age=3600
+    )
+    mock_scheduler.return_value.start.assert_called_once()
+    AppInitializer.init_scheduler.clear()
+
+def test_init_scheduler_disabled(app_init, mock_config):
+    """Test : Aucun planificateur si la configuration le désactive"""
+    AppInitializer.init_scheduler.clear()
+    mock_config.get.side_effect = lambda key, default=None: default
+    assert app_init.init_scheduler() is None
+    AppInitializer.init_scheduler.clear()
+
+def test_init_request_queue_resumes_stored_tasks(mocker):
+    """Test : Avec le stockage durable, les tâches de l'exécution précédente sont reprises"""
+    AppInitializer.init_request_queue.clear()
+    mocker.patch("projet.app_init.ConfigLoader").return_value.get.side_effect = (
+        lambda key, default=None: True if key == 'queue.store.enabled' else default
+    )
+    mock_store = mocker.patch("projet.app_init.SqliteTaskStore")
+    mock_queue = mocker.patch("projet.app_init.ApiRequestQueue")
+    data_fetcher = mocker.Mock()
+    mocker.patch.object(AppInitializer, "init_services", return_value=("ph", data_fetcher, "charts"))
+    station = mocker.Mock(id="s1")
+    mocker.patch.object(AppInitializer, "load_stations", return_value=[station])
+
+    api_queue = AppInitializer.init_request_queue()
+
+    mock_store.assert_called_once_with(Path('projet/data/queue/tasks.sqlite3'), max_attempts=5)
+    assert mock_queue.call_args.kwargs['store'] is mock_store.return_value
+    api_queue.register_durable.assert_any_call('refresh', data_fetcher.refresh_and_save_station_data)
+    api_queue.register_durable.assert_any_call('backfill', data_fetcher.backfill_station,
+                                               progress_kwarg='on_progress')
+    api_queue.resume.assert_called_once_with({"s1": station})
+    api_queue.start.assert_called_once()
+    AppInitializer.init_request_queue.clear()
+
+def test_build_extractors_backfills_through_recorder(mocker, mock_config):
+    """Test : Avec l'enregistreur actif, les backfills passent par /records (enregistrés)"""
+    mocker.patch("projet.app_init.HttpSessionPool")
+    mocker.patch("projet.app_init.RateLimiter")
+    mocker.patch("projet.app_init.ResponseRecorder").MODES = ('record', 'replay')
+    mock_extractor = mocker.patch("projet.app_init.APIExtractor")
+    mock_export = mocker.patch("projet.app_init.ExportExtractor")
+    mock_config.get.side_effect = lambda key, default=None: default
+    mock_config.get_section.side_effect = lambda key: (
+        {'mode': 'replay'} if key == 'api.recorder' else {}
+    )
+
+    extractor, backfill_extractor = AppInitializer._build_extractors(mock_config)
+
+    assert extractor is backfill_extractor is mock_extractor.return_value
+    mock_export.assert_not_called()
+
+def test_build_extractors_backfills_through_exports(mocker, mock_config):
+    """Test : Sans enregistreur, les backfills passent par l'endpoint /exports"""
+    mocker.patch("projet.app_init.HttpSessionPool")
+    mocker.patch("projet.app_init.RateLimiter")
+    mock_export = mocker.patch("projet.app_init.ExportExtractor")
+    mocker.patch("projet.app_init.APIExtractor")
+    mock_config.get.side_effect = lambda key, default=None: default
+
+    _, backfill_extractor = AppInitializer._build_extractors(mock_config)
+
+    assert backfill_extractor is mock_export.return_value
+
+def test_build_catalog_does_not_sync_at_startup(mocker, mock_config):
+    """Test : Le démarrage n'attend pas l'API, le catalogue se synchronise à la première consultation"""
+    mock_catalog = mocker.patch("projet.app_init.CatalogSync")
+    mock_config.get_section.return_value = {'enabled': True}
+
+    catalog = AppInitializer._build_catalog(mock_config, mocker.Mock())
+
+    assert catalog is mock_catalog.return_value
+    mock_catalog.return_value.sync.assert_not_called()
@@ -1,6 +1,7 @@
 import pytest
 import pandas as pd
 from unittest.mock import MagicMock
+from projet.components.admin_panel import AdminPanel
 from projet.components.metrics_display import MetricsDisplay
 from projet.components.navigation_header import NavigationHeader
 from projet.components.sidebar import Sidebar
@@ -82,6 +83,7 @@ def test_navigation_header_render_previous(mocker, mock_navigator, mock_api_queu
     mock_st.button.side_effect = lambda label, **kwargs: label == "← Previous"
     
     prev_station = mocker.Mock(id=123)
+    mock_navigator.get_current.return_value = mocker.Mock(id=124)
     mock_navigator.get_previous.return_value = prev_station
     
     NavigationHeader.render(mock_navigator, mock_api_queue, mock_data_fetcher)
@@ -89,6 +91,8 @@ def test_navigation_header_render_previous(mocker, mock_navigator, mock_api_queu
     # Verify assignment to session_state
     assert mock_st.session_state.selected_station_id == 123
     mock_api_queue.add_task.assert_called_once()
+    # La demande de rafraîchissement de la station quittée est annulée
+    mock_api_queue.cancel.assert_called_once_with(124)
     mock_st.rerun.assert_called_once()
 
 def test_navigation_header_render_next(mocker, mock_navigator, mock_api_queue, mock_data_fetcher):
@@ -161,6 +165,7 @@ def test_sidebar_render(mocker, mock_parquet_handler, mock_data_fetcher, mock_ap
     assert mock_st.session_state.selected_station_id == "s2"
     
     mock_api_queue.add_task.assert_called_once()
+    mock_api_queue.cancel.assert_called_once_with("s1")
     mock_st.rerun.assert_called_once()
 
 def test_sidebar_refresh_button(mocker, mock_parquet_handler, mock_data_fetcher, mock_api_queue, mock_navigator):
@@ -212,3 +217,49 @@ def test_sidebar_render_fallback_when_id_not_found(mocker, mock_parquet_handler,
     # 3. Vérifications : 
     # Le code doit avoir exécuté le bloc 'except' et s'être replié sur le premier ID (s1)
     assert mock_st.session_state.selected_station_id == "s1"
+
+
+# --- AdminPanel Tests ---
+
+def test_admin_panel_render(mocker):
+    """Test : Affichage des métriques de la file d'attente"""
+    mock_st = mocker.patch("projet.components.admin_panel.st")
+    mock_st.columns.return_value = [mocker.MagicMock(), mocker.MagicMock()]
+    summary = {'count': 4, 'mean': 1.0, 'max': 3.0, 'p50': 0.5, 'p90': 2.0, 'p99': 3.0}
+    snapshot = {
+        'outcomes': {'succeeded': 3, 'failed': 1},
+        'dropped': {'evicted': 2},
+        'wait': {**summary, 'p90': 0.25},
+        'run': summary,
+        'by_task': {'refresh_and_save_station_data': summary},
+        'depth': {'current': 5, 'max': 8, 'history': [(1700000000.0, 8), (1700000001.0, 5)]},
+        'workers': 4,
+        'busy_workers': 3
+    }
+
+    AdminPanel.render(snapshot)
+
+    mock_st.metric.assert_any_call("Busy workers", "3/4")
+    mock_st.metric.assert_any_call("Wait p90", "0.25 s")
+    mock_st.metric.assert_any_call("Waiting tasks", 5)
+    mock_st.caption.assert_called_once_with("evicted: 2 · failed: 1 · succeeded: 3")
+    assert mock_st.line_chart.call_args.args[0]['depth'].tolist() == [8, 5]
+    table = mock_st.dataframe.call_args.args[0]
+    assert table['task'].tolist() == ['refresh_and_save_station_data']
+
+def test_admin_panel_render_without_tasks(mocker):
+    """Test : Panneau vide avant la première tâche"""
+    mock_st = mocker.patch("projet.components.admin_panel.st")
+    mock_st.columns.return_value = [mocker.MagicMock(), mocker.MagicMock()]
+    snapshot = {
+        'outcomes': {}, 'dropped': {}, 'wait': {'count': 0}, 'run': {'count': 0},
+        'by_task': {}, 'depth': {'current': 0, 'max': 0, 'history': []},
+        'workers': 1, 'busy_workers': 0
+    }
+
+    AdminPanel.render(snapshot)
+
+    mock_st.metric.assert_any_call("Run p90", "-")
+    mock_st.caption.assert_called_once_with("No task run yet")
+    mock_st.line_chart.assert_not_called()
+    mock_st.dataframe.assert_not_called()
@@ -1,7 +1,9 @@
+import json
 import pandas as pd
 import pytest
 import requests
 from projet.src.api.extractor import APIExtractor
+from projet.src.api.rate_limiter import RateLimiter
 
 @pytest.fixture
 def mock_station(mocker):
@@ -10,25 +12,29 @@ def mock_station(mocker):
     station.id = "toulouse-blagnac"
     return station
 
+def _body(payload) -> bytes:
+    """Sérialise une réponse JSON de l'API"""
+    return json.dumps(payload).encode()
+
 @pytest.fixture
 def extractor():
-    return APIExtractor()
+    return APIExtractor(rate_limiter=RateLimiter(rate=None))
 
 @pytest.fixture
-def mock_requests_get(mocker):
-    return mocker.patch('requests.get')
+def mock_session_get(mocker):
+    return mocker.patch('requests.Session.get')
 
-def test_extract_success(extractor, mock_station, mock_requests_get):
+def test_extract_success(extractor, mock_station, mock_session_get):
     """Test Nominal : Extraction réussie avec des données"""
     # Mock de la réponse API
-    mock_response = mock_requests_get.return_value
+    mock_response = mock_session_get.return_value
     mock_response.status_code = 200
-    mock_response.json.return_value = {
+    mock_response.content = _body({
         'results': [
             {'heure_de_paris': '2023-01-01 12:00', 'temp': 15},
             {'heure_de_paris': '2023-01-01 13:00', 'temp': 16}
         ]
-    }
+    })
     
     df = extractor.extract(mock_station)
     
@@ -37,47 +43,394 @@ def test_extract_success(extractor, mock_station, mock_requests_get):
     assert len(df) == 2
     assert 'heure_de_paris' in df.columns
     
-    # Vérifie l'appel requests
-    mock_requests_get.assert_called_once()
-    args, kwargs = mock_requests_get.call_args
+    # Vérifie l'appel via la session partagée
+    mock_session_get.assert_called_once()
+    args, kwargs = mock_session_get.call_args
     assert "toulouse-blagnac/records" in args[0]
     assert kwargs['params']['limit'] == '100'
 
-def test_extract_no_results_key(extractor, mock_station, mock_requests_get):
+def test_extract_no_results_key(extractor, mock_station, mock_session_get):
     """Test : API répond mais sans clé 'results'"""
-    mock_response = mock_requests_get.return_value
-    mock_response.json.return_value = {'error': 'Something went wrong'}
+    mock_response = mock_session_get.return_value
+    mock_response.content = _body({'error': 'Something went wrong'})
     
     df = extractor.extract(mock_station)
     
     assert isinstance(df, pd.DataFrame)
     assert df.empty
 
-def test_extract_empty_results(extractor, mock_station, mock_requests_get):
+def test_extract_empty_results(extractor, mock_station, mock_session_get):
     """Test : API répond avec une liste vide dans 'results'"""
-    mock_response = mock_requests_get.return_value
-    mock_response.json.return_value = {'results': []}
+    mock_response = mock_session_get.return_value
+    mock_response.content = _body({'results': []})
     
     df = extractor.extract(mock_station)
     
     assert isinstance(df, pd.DataFrame)
     assert df.empty
+    assert not df.attrs.get("request_failed", False)
 
-def test_extract_request_exception(extractor, mock_station, mock_requests_get):
+def test_extract_request_exception(extractor, mock_station, mock_session_get):
     """Test : Erreur réseau (timeout, connection error, etc.)"""
-    mock_requests_get.side_effect = requests.exceptions.RequestException("Timeout")
+    mock_session_get.side_effect = requests.exceptions.RequestException("Timeout")
     
     df = extractor.extract(mock_station)
     
     assert isinstance(df, pd.DataFrame)
     assert df.empty
+    assert df.attrs["request_failed"]
 
-def test_extract_http_error(extractor, mock_station, mock_requests_get):
+def test_extract_http_error(extractor, mock_station, mock_session_get):
     """Test : Erreur HTTP (404, 500) via raise_for_status"""
-    mock_response = mock_requests_get.return_value
+    mock_response = mock_session_get.return_value
     mock_response.raise_for_status.side_effect = requests.exceptions.HTTPError("404 Not Found")
     
     df = extractor.extract(mock_station)
     
     assert isinstance(df, pd.DataFrame)
     assert df.empty
+
+def _page(start, count):
+    """Construit une page de résultats horaires décroissants à partir de `start`"""
+    dates = pd.date_range(end=start, periods=count, freq='h', tz='UTC')[::-1]
+    return {'results': [{'heure_de_paris': d.isoformat(), 'temp': 10} for d in dates]}
+
+def test_extract_pages_offset_paging(extractor, mock_station, mock_session_get, mocker):
+    """Test : Une fenêtre est paginée par offset jusqu'à une page incomplète"""
+    now = pd.Timestamp.now(tz='UTC').floor('h')
+    first, last = mocker.Mock(status_code=200), mocker.Mock(status_code=200)
+    first.content = _body(_page(now, 100))
+    last.content = _body(_page(now - pd.Timedelta(hours=100), 20))
+    mock_session_get.side_effect = [first, last]
+
+    pages = list(extractor.extract_pages(mock_station, days=3, window_days=3))
+
+    assert [len(p) for p in pages] == [100, 20]
+    offsets = [c.kwargs['params']['offset'] for c in mock_session_get.call_args_list]
+    assert offsets == ['0', '100']
+
+def test_extract_pages_walks_windows(extractor, mock_station, mock_session_get):
+    """Test : La plage est découpée en fenêtres successives"""
+    mock_session_get.return_value.content = _body({'results': []})
+
+    pages = list(extractor.extract_pages(mock_station, days=10, window_days=3))
+
+    assert pages == []
+    # 10 jours en fenêtres de 3 jours -> 4 requêtes
+    assert mock_session_get.call_count == 4
+    where = mock_session_get.call_args_list[0].kwargs['params']['where']
+    assert "minute(heure_de_paris) = 0" in where
+
+def test_extract_pages_stops_at_stored_data(extractor, mock_station, mock_session_get):
+    """Test : La pagination s'arrête dès qu'on atteint les données déjà stockées"""
+    now = pd.Timestamp.now(tz='UTC').floor('h')
+    mock_session_get.return_value.content = _body(_page(now, 100))
+
+    stop_at = now - pd.Timedelta(hours=10)
+    pages = list(extractor.extract_pages(mock_station, days=30, stop_at=stop_at))
+
+    assert len(pages) == 1
+    assert len(pages[0]) == 10
+    mock_session_get.assert_called_once()
+
+def test_extract_pages_resumes_before_until(extractor, mock_station, mock_session_get):
+    """Test : Une reprise de backfill ne demande que les relevés plus anciens que le point de reprise"""
+    mock_session_get.return_value.content = _body({'results': []})
+    until = pd.Timestamp.now(tz='UTC').floor('h') - pd.Timedelta(days=1)
+
+    list(extractor.extract_pages(mock_station, days=3, window_days=3, until=until))
+
+    where = mock_session_get.call_args_list[0].kwargs['params']['where']
+    assert f"heure_de_paris < date'{until.isoformat()}'" in where
+    # Il ne reste que 2 jours à parcourir : une seule fenêtre
+    assert mock_session_get.call_count == 1
+
+def test_extract_pages_request_error(extractor, mock_station, mock_session_get):
+    """Test : Une erreur réseau interrompt l'itération sans exception"""
+    mock_session_get.side_effect = requests.exceptions.RequestException("Timeout")
+
+    assert list(extractor.extract_pages(mock_station, days=30)) == []
+
+def test_extract_many_isolates_errors(extractor, mocker):
+    """Test : extract_many renvoie un résultat par station, erreurs isolées"""
+    ok_station = mocker.Mock(id="ok")
+    ko_station = mocker.Mock(id="ko")
+    ko_station.name = "KO"
+
+    def fake_extract(station, **kwargs):
+        if station is ko_station:
+            raise ValueError("Boom")
+        return pd.DataFrame({'heure_de_paris': ['2023-01-01 12:00']})
+
+    mocker.patch.object(extractor, 'extract', side_effect=fake_extract)
+
+    results = {r.station_id: r for r in extractor.extract_many([ok_station, ko_station], max_concurrency=2)}
+
+    assert results["ok"].ok
+    assert len(results["ok"].data) == 1
+    assert not results["ko"].ok
+    assert isinstance(results["ko"].error, ValueError)
+    assert results["ko"].data.empty
+
+def test_extract_incremental_since(extractor, mock_station, mock_session_get):
+    """Test : En mode incrémental, seuls les relevés postérieurs sont demandés"""
+    mock_session_get.return_value.content = _body({'results': []})
+
+    extractor.extract(mock_station, since=pd.Timestamp("2023-01-01 12:00"))
+
+    where = mock_session_get.call_args.kwargs['params']['where']
+    assert "heure_de_paris >= now(days=-7)" in where
+    assert "heure_de_paris > date'2023-01-01T12:00:00+00:00'" in where
+
+def test_extract_aggregates_pushes_group_by(extractor, mock_station, mock_session_get):
+    """Test : Les agrégats journaliers sont calculés par l'API en une seule requête"""
+    mock_session_get.return_value.content = _body({'results': [
+        {'periode': '2023-01-02', 'temperature_en_degre_c_avg': 10.5,
+         'temperature_en_degre_c_min': 4.0, 'temperature_en_degre_c_max': 15.0},
+        {'periode': '2023-01-01', 'temperature_en_degre_c_avg': 9.0,
+         'temperature_en_degre_c_min': 3.5, 'temperature_en_degre_c_max': 14.0}
+    ]})
+
+    df = extractor.extract_aggregates(mock_station, resolution='day', days=365)
+
+    mock_session_get.assert_called_once()
+    params = mock_session_get.call_args.kwargs['params']
+    assert params['group_by'] == 'periode'
+    assert "date_format(heure_de_paris, 'yyyy-MM-dd') as periode" in params['select']
+    assert "avg(temperature_en_degre_c) as temperature_en_degre_c_avg" in params['select']
+    assert "max(pression) as pression_max" in params['select']
+    assert params['where'] == 'heure_de_paris >= now(days=-365)'
+    assert df.attrs['resolution'] == 'day'
+    assert len(df) == 2
+    assert df['heure_de_paris'].iloc[0] == pd.Timestamp('2023-01-02', tz='UTC')
+    assert df['temperature_en_degre_c_max'].tolist() == [15.0, 14.0]
+
+def test_extract_aggregates_hourly_bucket(extractor, mock_station, mock_session_get):
+    """Test : La résolution horaire groupe par heure"""
+    mock_session_get.return_value.content = _body({'results': [
+        {'periode': '2023-01-01 13:00:00', 'humidite_avg': 80.0}
+    ]})
+
+    df = extractor.extract_aggregates(mock_station, resolution='hour', days=7, fields=['humidite'])
+
+    select = mock_session_get.call_args.kwargs['params']['select']
+    assert "date_format(heure_de_paris, 'yyyy-MM-dd HH:00:00')" in select
+    assert "pression" not in select
+    assert df.attrs['resolution'] == 'hour'
+    assert df['heure_de_paris'].iloc[0] == pd.Timestamp('2023-01-01 13:00', tz='UTC')
+
+def test_extract_aggregates_request_error(extractor, mock_station, mock_session_get):
+    """Test : Une erreur réseau renvoie un DataFrame vide, toujours étiqueté"""
+    mock_session_get.side_effect = requests.exceptions.RequestException("Network Error")
+
+    df = extractor.extract_aggregates(mock_station)
+
+    assert df.empty
+    assert df.attrs['resolution'] == 'day'
+
+def test_extract_aggregates_unknown_resolution(extractor, mock_station):
+    """Test : Une résolution inconnue est refusée"""
+    with pytest.raises(ValueError):
+        extractor.extract_aggregates(mock_station, resolution='week')
+
+def test_extract_sub_hourly_resolution_pages(mock_station, mock_session_get, mocker):
+    """Test : En résolution 15 min, plusieurs pages couvrent la même période"""
+    extractor = APIExtractor(rate_limiter=RateLimiter(rate=None), resolution='15min')
+    now = pd.Timestamp.now(tz='UTC').floor('h')
+    first, last = mocker.Mock(status_code=200), mocker.Mock(status_code=200)
+    first.content = _body(_page(now, 100))
+    last.content = _body(_page(now - pd.Timedelta(hours=100), 30))
+    mock_session_get.side_effect = [first, last]
+
+    df = extractor.extract(mock_station)
+
+    assert len(df) == 130
+    assert mock_session_get.call_count == 2
+    params = mock_session_get.call_args.kwargs['params']
+    assert params['offset'] == '100'
+    assert 'minute(heure_de_paris) = 15' in params['where']
+
+def test_extract_partial_pages_are_failed(mock_station, mock_session_get, mocker):
+    """Test : Si une page suivante échoue, les pages déjà lues ne sont pas rendues comme complètes"""
+    extractor = APIExtractor(rate_limiter=RateLimiter(rate=None), resolution='15min')
+    now = pd.Timestamp.now(tz='UTC').floor('h')
+    first = mocker.Mock(status_code=200)
+    first.content = _body(_page(now, 100))
+
+    def get(*args, **kwargs):
+        if mock_session_get.call_count == 1:
+            return first
+        raise requests.exceptions.ConnectionError("down")
+    mock_session_get.side_effect = get
+
+    df = extractor.extract(mock_station)
+
+    assert df.empty
+    assert df.attrs["request_failed"]
+
+def test_extract_raw_resolution_has_no_sampling_filter(mock_station, mock_session_get):
+    """Test : En résolution brute, aucun filtre sur les minutes n'est envoyé"""
+    extractor = APIExtractor(rate_limiter=RateLimiter(rate=None), resolution='raw')
+    mock_session_get.return_value.content = _body({'results': []})
+
+    extractor.extract(mock_station)
+
+    assert mock_session_get.call_args.kwargs['params']['where'] == 'heure_de_paris >= now(days=-7)'
+
+@pytest.fixture
+def cached_extractor(tmp_path):
+    from projet.src.api.response_cache import ResponseCache
+    return APIExtractor(
+        cache=ResponseCache(cache_dir=tmp_path / "cache", align_to_hour=False),
+        rate_limiter=RateLimiter(rate=None)
+    )
+
+def test_extract_served_from_cache(cached_extractor, mock_station, mock_session_get):
+    """Test : Un second appel identique est servi par le cache sans requête"""
+    mock_session_get.return_value.status_code = 200
+    mock_session_get.return_value.content = b'{"results": [{"heure_de_paris": "2023-01-01 12:00"}]}'
+    mock_session_get.return_value.headers = {}
+
+    first = cached_extractor.extract(mock_station)
+    second = cached_extractor.extract(mock_station)
+
+    assert len(first) == len(second) == 1
+    mock_session_get.assert_called_once()
+
+def test_empty_page_is_not_cached(cached_extractor, mock_station, mock_session_get):
+    """Test : Une page vide (relevé horaire pas encore publié) n'est pas mise en cache"""
+    mock_session_get.return_value.status_code = 200
+    mock_session_get.return_value.content = b'{"total_count": 0, "results": []}'
+    mock_session_get.return_value.headers = {}
+
+    assert cached_extractor.extract(mock_station).empty
+    mock_session_get.return_value.content = b'{"results": [{"heure_de_paris": "2023-01-01 12:00"}]}'
+
+    assert len(cached_extractor.extract(mock_station)) == 1
+    assert mock_session_get.call_count == 2
+
+def test_extract_revalidates_stale_cache(cached_extractor, mock_station, mock_session_get, mocker):
+    """Test : Une entrée périmée est revalidée par ETag (réponse 304)"""
+    response = mock_session_get.return_value
+    response.status_code = 200
+    response.content = b'{"results": [{"heure_de_paris": "2023-01-01 12:00"}]}'
+    response.headers = {"ETag": '"v1"'}
+    cached_extractor.extract(mock_station)
+
+    mocker.patch("projet.src.api.response_cache.time.time", return_value=2**40)
+    response.status_code = 304
+    response.content = b''
+
+    df = cached_extractor.extract(mock_station)
+
+    assert len(df) == 1
+    assert mock_session_get.call_args.kwargs['headers'] == {"If-None-Match": '"v1"'}
+
+@pytest.fixture
+def mock_sleep(mocker):
+    return mocker.patch('projet.src.api.extractor.time.sleep')
+
+def test_extract_retries_transient_errors(extractor, mock_station, mock_session_get, mock_sleep, mocker):
+    """Test : Les erreurs transitoires (5xx, timeout) sont réessayées"""
+    error_response = mocker.Mock(status_code=503, headers={})
+    ok_response = mocker.Mock(status_code=200)
+    ok_response.content = _body({'results': [{'heure_de_paris': '2023-01-01 12:00'}]})
+    mock_session_get.side_effect = [
+        requests.exceptions.Timeout("slow"),
+        error_response,
+        ok_response,
+    ]
+
+    df = extractor.extract(mock_station)
+
+    assert len(df) == 1
+    assert mock_session_get.call_count == 3
+    assert mock_sleep.call_count == 2
+
+def test_extract_does_not_retry_client_errors(extractor, mock_station, mock_session_get, mock_sleep):
+    """Test : Une erreur 404 n'est pas réessayée"""
+    mock_session_get.return_value.status_code = 404
+    mock_session_get.return_value.raise_for_status.side_effect = requests.exceptions.HTTPError("404")
+
+    assert extractor.extract(mock_station).empty
+    mock_session_get.assert_called_once()
+    mock_sleep.assert_not_called()
+
+def test_extract_fails_fast_when_circuit_open(mock_station, mock_session_get, mock_sleep):
+    """Test : Une fois le circuit ouvert, les appels échouent sans requête"""
+    from projet.src.api.resilience import CircuitBreaker, RetryPolicy
+    extractor = APIExtractor(
+        retry_policy=RetryPolicy(max_attempts=2),
+        circuit_breaker=CircuitBreaker(failure_threshold=1, cooldown=60),
+        rate_limiter=RateLimiter(rate=None)
+    )
+    mock_session_get.side_effect = requests.exceptions.ConnectionError("down")
+
+    assert extractor.extract(mock_station).empty
+    assert mock_session_get.call_count == 2
+
+    assert extractor.extract(mock_station).empty
+    assert mock_session_get.call_count == 2
+
+def test_unexpected_error_releases_half_open_trial(mock_station, mock_session_get, mock_sleep, mocker):
+    """Test : Une erreur non réessayée pendant l'essai semi-ouvert ne bloque pas le circuit"""
+    from projet.src.api.resilience import CircuitBreaker, CircuitOpenError, RetryPolicy
+    clock = mocker.patch('projet.src.api.resilience.time.monotonic', return_value=0.0)
+    extractor = APIExtractor(
+        retry_policy=RetryPolicy(max_attempts=1),
+        circuit_breaker=CircuitBreaker(failure_threshold=1, cooldown=60),
+        rate_limiter=RateLimiter(rate=None)
+    )
+    url = "https://example.com/records"
+    mock_session_get.side_effect = requests.exceptions.ConnectionError("down")
+    with pytest.raises(requests.exceptions.ConnectionError):
+        extractor._send(url, {})
+
+    # Essai semi-ouvert interrompu par une erreur inattendue
+    clock.return_value = 61.0
+    mock_session_get.side_effect = requests.exceptions.ChunkedEncodingError("cut")
+    with pytest.raises(requests.exceptions.ChunkedEncodingError):
+        extractor._send(url, {})
+    with pytest.raises(CircuitOpenError):
+        extractor._send(url, {})
+
+    # Après un nouveau délai, l'essai suivant passe et referme le circuit
+    clock.return_value = 122.0
+    mock_session_get.side_effect = None
+    mock_session_get.return_value.status_code = 200
+    assert extractor._send(url, {}).status_code == 200
+    assert extractor._send(url, {}).status_code == 200
+
+def test_retried_response_is_closed(extractor, mock_station, mock_session_get, mock_sleep, mocker):
+    """Test : Une réponse réessayée rend sa connexion au pool ; la dernière reste ouverte"""
+    first = mocker.Mock(status_code=503, headers={})
+    last = mocker.Mock(status_code=200)
+    mock_session_get.side_effect = [first, last]
+
+    assert extractor._send("https://example.com/records", {}, stream=True) is last
+
+    first.close.assert_called_once()
+    last.close.assert_not_called()
+
+def test_extract_waits_for_rate_limiter(mock_station, mock_session_get, mocker):
+    """Test : Chaque requête HTTP attend un jeton du limiteur de débit"""
+    limiter = mocker.Mock()
+    extractor = APIExtractor(rate_limiter=limiter)
+    mock_session_get.return_value.content = _body({'results': []})
+
+    extractor.extract(mock_station)
+
+    limiter.acquire.assert_called_once()
+
+def test_extract_uses_shared_rate_limiter():
+    """Test : Par défaut tous les extracteurs partagent le même limiteur"""
+    assert APIExtractor().rate_limiter is APIExtractor().rate_limiter is RateLimiter.shared()
+
+def test_fetch_json(extractor, mock_session_get):
+    """Test : Un document JSON quelconque passe par le transport de l'extracteur"""
+    mock_session_get.return_value.status_code = 200
+    mock_session_get.return_value.content = _body({'total_count': 0, 'results': []})
+
+    assert extractor.fetch_json("https://example.com/catalog", {'limit': '1'}) == {
+        'total_count': 0, 'results': []
+    }
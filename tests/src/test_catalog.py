@@ -0,0 +1,188 @@
+import json
+import threading
+from datetime import datetime, timedelta, timezone
+
+import pytest
+import requests
+
+from projet.src.api.catalog import CatalogSync, DatasetStatus
+from projet.src.entities.station import Station
+
+
+def _catalog(*entries, total_count=None):
+    """Construit une réponse du catalogue à partir de (dataset_id, records_count, modified)"""
+    return {
+        'total_count': len(entries) if total_count is None else total_count,
+        'results': [
+            {'dataset_id': dataset_id,
+             'metas': {'default': {'records_count': count, 'data_processed': modified}}}
+            for dataset_id, count, modified in entries
+        ]
+    }
+
+RECENT = (datetime.now(timezone.utc) - timedelta(hours=1)).isoformat()
+OLD = (datetime.now(timezone.utc) - timedelta(days=30)).isoformat()
+
+@pytest.fixture
+def extractor(mocker):
+    extractor = mocker.Mock()
+    extractor.base_url = "https://example.com/api/explore/v2.1/catalog/datasets/"
+    extractor.fetch_json.return_value = _catalog(
+        ('00-station-meteo-toulouse-valade', 120000, RECENT),
+        ('02-station-meteo-toulouse-marengo', 0, None),
+        ('03-station-meteo-toulouse-busca', 50000, OLD),
+        ('parkings-toulouse', 300, RECENT)
+    )
+    return extractor
+
+@pytest.fixture
+def catalog(extractor, tmp_path):
+    return CatalogSync(extractor, cache_path=tmp_path / "catalog.json")
+
+def test_sync_classifies_datasets(catalog, extractor):
+    """Test : Une seule requête classe les stations actives, mortes et figées"""
+    datasets = catalog.sync()
+
+    extractor.fetch_json.assert_called_once()
+    url, params = extractor.fetch_json.call_args.args
+    assert url == "https://example.com/api/explore/v2.1/catalog/datasets"
+    assert params['limit'] == '100'
+    assert 'parkings-toulouse' not in datasets
+    assert catalog.status_of('00-station-meteo-toulouse-valade') == 'active'
+    assert catalog.status_of('02-station-meteo-toulouse-marengo') == 'dead'
+    assert catalog.status_of('03-station-meteo-toulouse-busca') == 'stale'
+    assert catalog.status_of('99-station-meteo-inconnue') == 'dead'
+
+def test_is_fetchable(catalog, extractor):
+    """Test : Seules les stations actives (ou un catalogue inconnu) sont interrogées"""
+    station = Station('02-station-meteo-toulouse-marengo', 'Marengo', 0, 0)
+    extractor.fetch_json.side_effect = [requests.exceptions.ConnectionError("down"),
+                                        extractor.fetch_json.return_value]
+    assert catalog.is_fetchable(station)
+
+    catalog.sync(force=True)
+
+    assert not catalog.is_fetchable(station)
+    assert catalog.is_fetchable(Station('00-station-meteo-toulouse-valade', 'Valade', 0, 0))
+
+def test_is_fetchable_include_stale(catalog):
+    """Test : Un jeu de données figé reste interrogeable pour son historique"""
+    catalog.sync()
+    stale = Station('03-station-meteo-toulouse-busca', 'Busca', 0, 0)
+    dead = Station('02-station-meteo-toulouse-marengo', 'Marengo', 0, 0)
+
+    assert not catalog.is_fetchable(stale)
+    assert catalog.is_fetchable(stale, include_stale=True)
+    assert not catalog.is_fetchable(dead, include_stale=True)
+
+def test_lookup_does_not_wait_for_sync(catalog, extractor):
+    """Test : Pendant une synchronisation, les autres threads répondent sans attendre"""
+    started, release = threading.Event(), threading.Event()
+    response = extractor.fetch_json.return_value
+
+    def slow_fetch(*_):
+        started.set()
+        release.wait(5)
+        return response
+    extractor.fetch_json.side_effect = slow_fetch
+    syncing = threading.Thread(target=catalog.sync)
+    syncing.start()
+    started.wait(5)
+
+    assert catalog.status_of('02-station-meteo-toulouse-marengo') == 'unknown'
+
+    release.set()
+    syncing.join(5)
+    extractor.fetch_json.assert_called_once()
+    assert catalog.status_of('02-station-meteo-toulouse-marengo') == 'dead'
+
+def test_sync_uses_local_copy(catalog, extractor, tmp_path):
+    """Test : La copie locale évite toute requête avant expiration"""
+    catalog.sync()
+    reloaded = CatalogSync(extractor, cache_path=tmp_path / "catalog.json")
+
+    reloaded.sync()
+
+    extractor.fetch_json.assert_called_once()
+    assert reloaded.status_of('03-station-meteo-toulouse-busca') == 'stale'
+    assert json.loads((tmp_path / "catalog.json").read_text())['datasets']
+
+def test_sync_refreshes_expired_copy(extractor, tmp_path):
+    """Test : Une copie locale expirée est rafraîchie"""
+    catalog = CatalogSync(extractor, cache_path=tmp_path / "catalog.json", ttl=0)
+    catalog.sync()
+    catalog.sync()
+    assert extractor.fetch_json.call_count == 2
+
+def test_sync_failure_keeps_previous_copy(catalog, extractor, caplog):
+    """Test : Un échec de synchronisation conserve le catalogue connu"""
+    catalog.sync()
+    extractor.fetch_json.side_effect = requests.exceptions.ConnectionError("down")
+
+    datasets = catalog.sync(force=True)
+
+    assert len(datasets) == 3
+    assert "Catalog sync failed" in caplog.text
+
+def test_failed_sync_is_not_retried_immediately(catalog, extractor):
+    """Test : Après un échec, le catalogue n'est pas réinterrogé à chaque station"""
+    extractor.fetch_json.side_effect = requests.exceptions.ConnectionError("down")
+
+    assert catalog.status_of('00-station-meteo-toulouse-valade') == 'unknown'
+    assert catalog.status_of('00-station-meteo-toulouse-valade') == 'unknown'
+
+    extractor.fetch_json.assert_called_once()
+
+def _move_clock(mocker, now):
+    """Avance l'horloge du module catalog"""
+    clock = mocker.patch('projet.src.api.catalog.datetime')
+    clock.now.return_value = now
+    clock.fromisoformat = datetime.fromisoformat
+
+def test_long_running_process_resyncs_instead_of_going_stale(catalog, extractor, mocker):
+    """Test : Après stale_after, un catalogue expiré est resynchronisé, pas tout déclaré figé"""
+    catalog.sync()
+    later = datetime.now(timezone.utc) + timedelta(days=8)
+    extractor.fetch_json.return_value = _catalog(
+        ('00-station-meteo-toulouse-valade', 120000, (later - timedelta(hours=1)).isoformat())
+    )
+    _move_clock(mocker, later)
+
+    assert catalog.is_expired
+    assert catalog.status_of('00-station-meteo-toulouse-valade') == 'active'
+    assert extractor.fetch_json.call_count == 2
+
+def test_unrefreshable_copy_keeps_its_classification(catalog, extractor, mocker):
+    """Test : Si la resynchronisation échoue, les statuts restent ceux du dernier catalogue"""
+    catalog.sync()
+    extractor.fetch_json.side_effect = requests.exceptions.ConnectionError("down")
+    _move_clock(mocker, datetime.now(timezone.utc) + timedelta(days=8))
+
+    assert catalog.status_of('00-station-meteo-toulouse-valade') == 'active'
+    assert catalog.status_of('03-station-meteo-toulouse-busca') == 'stale'
+
+def test_sync_pages_large_catalog(extractor, tmp_path):
+    """Test : Un catalogue de plus de 100 jeux de données est paginé"""
+    extractor.fetch_json.side_effect = [
+        _catalog(*[(f'{i}-station-meteo', 1, RECENT) for i in range(100)], total_count=101),
+        _catalog(('100-station-meteo', 1, RECENT), total_count=101)
+    ]
+    catalog = CatalogSync(extractor, cache_path=tmp_path / "catalog.json")
+
+    assert len(catalog.sync()) == 101
+    assert extractor.fetch_json.call_args.args[1]['offset'] == '100'
+
+def test_unreadable_local_copy_is_ignored(extractor, tmp_path):
+    """Test : Une copie locale corrompue est ignorée"""
+    (tmp_path / "catalog.json").write_text("{not json")
+    extractor.fetch_json.side_effect = requests.exceptions.ConnectionError("down")
+    catalog = CatalogSync(extractor, cache_path=tmp_path / "catalog.json")
+    assert catalog.is_expired
+    assert catalog.status_of('00-station-meteo-toulouse-valade') == 'unknown'
+
+def test_dataset_status_naive_date():
+    """Test : Une date sans fuseau est interprétée en UTC"""
+    dataset = DatasetStatus('x', 10, '2023-01-01T00:00:00')
+    now = datetime(2023, 1, 2, tzinfo=timezone.utc)
+    assert dataset.status(timedelta(days=7), now=now) == 'active'
+    assert dataset.status(timedelta(hours=1), now=now) == 'stale'
@@ -66,7 +66,7 @@ def test_fetch_and_load_success(fetcher, mock_extractor, mock_transformer, mock_
     assert result is True
     
     # Vérifie que chaque étape a été appelée
-    mock_extractor.extract.assert_called_once_with(mock_station)
+    mock_extractor.extract.assert_called_once_with(mock_station, since=None)
     mock_transformer.format_data.assert_called_once()
     mock_transformer.normalize_columns.assert_called_once()
     mock_validator.is_format_correct.assert_called_once()
@@ -129,7 +129,9 @@ def test_refresh_and_save_success(fetcher, mock_station, mock_parquet_handler, m
     result = fetcher.refresh_and_save_station_data(mock_station)
     
     assert result is True
-    fetcher.fetch_and_load.assert_called_once_with(mock_station)
+    fetcher.fetch_and_load.assert_called_once_with(
+        mock_station, since=mock_parquet_handler.get_latest_date.return_value
+    )
     mock_parquet_handler.save_station_reports.assert_called_once_with(mock_station)
 
 def test_refresh_and_save_fetch_fail(fetcher, mock_station, mock_parquet_handler, mocker):
@@ -152,3 +154,186 @@ def test_refresh_and_save_save_fail(fetcher, mock_station, mock_parquet_handler,
     result = fetcher.refresh_and_save_station_data(mock_station)
     
     assert result is False
+
+def test_prefetch_station_refreshes_then_preloads(fetcher, mock_station, mock_parquet_handler, mocker):
+    """Test : Le préchargement rafraîchit la station puis met ses données en mémoire"""
+    mocker.patch.object(fetcher, 'refresh_and_save_station_data', return_value=False)
+    mock_parquet_handler.preload.return_value = True
+
+    assert fetcher.prefetch_station(mock_station) is True
+    fetcher.refresh_and_save_station_data.assert_called_once_with(mock_station)
+    mock_parquet_handler.preload.assert_called_once_with(mock_station)
+
+def test_backfill_station_saves_each_page(fetcher, mock_extractor, mock_parquet_handler, mock_station, mocker):
+    """Test : Chaque page valide est chargée puis sauvegardée immédiatement"""
+    mock_extractor.extract_pages.return_value = iter([
+        pd.DataFrame({'raw': [1, 2]}),
+        pd.DataFrame({'raw': [3]}),
+    ])
+    mocker.patch.object(fetcher, '_process_and_load', side_effect=[True, False])
+    mock_station.reports = [1, 2]
+
+    saved = fetcher.backfill_station(mock_station, days=30)
+
+    assert saved == 2
+    mock_extractor.extract_pages.assert_called_once_with(mock_station, days=30, stop_at=None, until=None)
+    mock_parquet_handler.save_station_reports.assert_called_once_with(mock_station)
+
+def test_refresh_stations(fetcher, mock_extractor, mock_parquet_handler, mocker):
+    """Test : Rafraîchissement groupé, chaque station traitée indépendamment"""
+    from projet.src.api.extractor import ExtractionResult
+
+    s1, s2, s3 = mocker.Mock(id="s1"), mocker.Mock(id="s2"), mocker.Mock(id="s3")
+    mock_extractor.extract_many.return_value = iter([
+        ExtractionResult("s2", pd.DataFrame({'raw': [1]})),
+        ExtractionResult("s1", pd.DataFrame(), ValueError("Boom")),
+        ExtractionResult("s3", pd.DataFrame({'raw': [1]})),
+    ])
+    mocker.patch.object(fetcher, '_process_and_load', side_effect=[True, True])
+    mock_parquet_handler.save_station_reports.side_effect = [None, OSError("disk full")]
+
+    outcome = fetcher.refresh_stations([s1, s2, s3], max_concurrency=4)
+
+    assert outcome == {"s1": False, "s2": True, "s3": False}
+    mock_extractor.extract_many.assert_called_once_with(
+        [s1, s2, s3],
+        max_concurrency=4,
+        since={s.id: mock_parquet_handler.get_latest_date.return_value for s in (s1, s2, s3)}
+    )
+
+def test_refresh_and_save_full_fetch_when_not_incremental(fetcher, mock_station, mock_parquet_handler, mocker):
+    """Test : Mode non incrémental, la date du dernier relevé stocké n'est pas consultée"""
+    fetcher.incremental = False
+    mocker.patch.object(fetcher, 'fetch_and_load', return_value=False)
+
+    fetcher.refresh_and_save_station_data(mock_station)
+
+    fetcher.fetch_and_load.assert_called_once_with(mock_station, since=None)
+    mock_parquet_handler.get_latest_date.assert_not_called()
+
+def test_fetch_and_load_up_to_date(fetcher, mock_extractor, mock_station, caplog):
+    """Test : Aucun nouveau relevé en mode incrémental, la station est à jour"""
+    mock_extractor.extract.return_value = pd.DataFrame()
+
+    with caplog.at_level("INFO"):
+        result = fetcher.fetch_and_load(mock_station, since=pd.Timestamp("2023-01-01", tz="UTC"))
+
+    assert result is False
+    assert "déjà à jour" in caplog.text
+    fetcher.transformer.format_data.assert_not_called()
+
+def test_backfill_uses_backfill_extractor(mock_extractor, mock_transformer, mock_validator, mock_loader, mock_parquet_handler, mock_station, mocker):
+    """Test : Le backfill passe par l'extracteur dédié (export) s'il est fourni"""
+    export_extractor = mocker.Mock()
+    export_extractor.extract_pages.return_value = iter([])
+    fetcher = DataFetcher(
+        extractor=mock_extractor,
+        transformer=mock_transformer,
+        validator=mock_validator,
+        loader=mock_loader,
+        parquet_handler=mock_parquet_handler,
+        backfill_extractor=export_extractor
+    )
+
+    assert fetcher.backfill_station(mock_station, days=10) == 0
+    export_extractor.extract_pages.assert_called_once_with(mock_station, days=10, stop_at=None, until=None)
+    mock_extractor.extract_pages.assert_not_called()
+
+def test_refresh_skips_dead_station(fetcher, mock_station, mock_extractor, mocker):
+    """Test : Une station au jeu de données mort ou figé n'est jamais interrogée"""
+    fetcher.catalog = mocker.Mock()
+    fetcher.catalog.is_fetchable.return_value = False
+    fetcher.catalog.status_of.return_value = 'dead'
+
+    assert fetcher.refresh_and_save_station_data(mock_station) is False
+    assert fetcher.backfill_station(mock_station) == 0
+    mock_extractor.extract.assert_not_called()
+    mock_extractor.extract_pages.assert_not_called()
+
+def test_backfill_fetches_stale_station(fetcher, mock_station, mock_extractor, mocker):
+    """Test : Un jeu de données figé garde un historique, le backfill l'interroge"""
+    fetcher.catalog = mocker.Mock()
+    fetcher.catalog.is_fetchable.side_effect = lambda station, include_stale=False: include_stale
+    mock_extractor.extract_pages.return_value = iter([])
+
+    assert fetcher.refresh_and_save_station_data(mock_station) is False
+    fetcher.backfill_station(mock_station, days=10)
+
+    mock_extractor.extract.assert_not_called()
+    mock_extractor.extract_pages.assert_called_once()
+
+def test_refresh_stations_filters_with_catalog(fetcher, mock_extractor, mocker):
+    """Test : Le rafraîchissement groupé n'extrait que les stations actives"""
+    alive, dead = mocker.Mock(id="alive"), mocker.Mock(id="dead")
+    fetcher.catalog = mocker.Mock()
+    fetcher.catalog.is_fetchable.side_effect = lambda station, **_: station is alive
+    mock_extractor.extract_many.return_value = iter([])
+
+    outcome = fetcher.refresh_stations([alive, dead])
+
+    assert outcome == {"dead": False}
+    assert mock_extractor.extract_many.call_args.args[0] == [alive]
+
+def test_negative_cache_records_empty_full_fetch(fetcher, mock_station, mock_extractor, mocker):
+    """Test : Une extraction complète sans données alimente le cache négatif"""
+    fetcher.negative_cache = mocker.Mock()
+    mock_extractor.extract.return_value = pd.DataFrame()
+
+    assert fetcher.fetch_and_load(mock_station) is False
+
+    fetcher.negative_cache.record_empty.assert_called_once_with(mock_station.id)
+
+def test_negative_cache_ignores_up_to_date_and_failures(fetcher, mock_station, mock_extractor, mocker):
+    """Test : Ni une station à jour ni une requête en échec ne sont considérées vides"""
+    fetcher.negative_cache = mocker.Mock()
+    mock_extractor.extract.return_value = pd.DataFrame()
+    fetcher.fetch_and_load(mock_station, since=pd.Timestamp("2023-01-01", tz="UTC"))
+
+    failed = pd.DataFrame()
+    failed.attrs['request_failed'] = True
+    mock_extractor.extract.return_value = failed
+    fetcher.fetch_and_load(mock_station)
+
+    fetcher.negative_cache.record_empty.assert_not_called()
+
+def test_negative_cache_skips_and_clears(fetcher, mock_station, mock_extractor, mocker):
+    """Test : Une station vide récemment est ignorée ; des données effacent l'entrée"""
+    fetcher.negative_cache = mocker.Mock()
+    fetcher.negative_cache.should_skip.return_value = True
+
+    assert fetcher.refresh_and_save_station_data(mock_station) is False
+    mock_extractor.extract.assert_not_called()
+
+    mock_extractor.extract.return_value = pd.DataFrame({'raw': [1]})
+    mocker.patch.object(fetcher, '_process_and_load', return_value=True)
+    fetcher.fetch_and_load(mock_station)
+    fetcher.negative_cache.record_data.assert_called_once_with(mock_station.id)
+
+def test_no_data_since(fetcher, mock_station, mocker):
+    """Test : La date du premier échec et de la prochaine vérification sont exposées"""
+    assert fetcher.no_data_since(mock_station) is None
+
+    fetcher.negative_cache = mocker.Mock()
+    fetcher.negative_cache.empty_since.return_value = "t0"
+    fetcher.negative_cache.next_check.return_value = "t1"
+    assert fetcher.no_data_since(mock_station) == ("t0", "t1")
+
+    fetcher.negative_cache.empty_since.return_value = None
+    assert fetcher.no_data_since(mock_station) is None
+
+def test_backfill_checkpoints_progress(fetcher, mock_extractor, mock_station, mocker):
+    """Test : Le backfill signale la date la plus ancienne atteinte après chaque page sauvegardée"""
+    mock_extractor.extract_pages.return_value = iter([
+        pd.DataFrame({'heure_de_paris': ['2023-01-02T10:00:00+00:00', '2023-01-02T09:00:00+00:00']}),
+        pd.DataFrame({'heure_de_paris': ['2023-01-02T08:00:00+00:00']}),
+    ])
+    mocker.patch.object(fetcher, '_process_and_load', side_effect=[True, False])
+    mock_station.reports = [1, 2]
+    on_progress = mocker.Mock()
+    until = pd.Timestamp("2023-01-03", tz="UTC")
+
+    fetcher.backfill_station(mock_station, days=30, until=until, on_progress=on_progress)
+
+    mock_extractor.extract_pages.assert_called_once_with(mock_station, days=30, stop_at=None, until=until)
+    # La page ignorée ne fait pas avancer le point de reprise
+    on_progress.assert_called_once_with(until=pd.Timestamp("2023-01-02T09:00", tz="UTC"))
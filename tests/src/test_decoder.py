@@ -0,0 +1,63 @@
+import json
+import pandas as pd
+import pytest
+from projet.src.api import decoder
+from projet.src.api.decoder import decode_records, is_empty_page
+
+
+@pytest.fixture
+def body():
+    return json.dumps({
+        'total_count': 2,
+        'results': [
+            {'heure_de_paris': '2023-01-01T12:00:00+00:00', 'temperature_en_degre_c': 12.5, 'humidite': 80, 'pression': 101300},
+            {'heure_de_paris': '2023-01-01T13:00:00+00:00', 'temperature_en_degre_c': 13, 'humidite': 78, 'pression': 101200},
+        ]
+    }).encode()
+
+def test_decode_records_typed_columns(body):
+    """Test Nominal : Les résultats sont décodés en colonnes typées"""
+    df = decode_records(body)
+
+    assert df.columns.tolist() == ['heure_de_paris', 'temperature_en_degre_c', 'humidite', 'pression']
+    assert df['temperature_en_degre_c'].dtype == 'float64'
+    assert df['humidite'].dtype == 'int64'
+    assert df['temperature_en_degre_c'].tolist() == [12.5, 13.0]
+
+def test_decode_records_matches_dataframe_from_dicts(body):
+    """Test : Même résultat que pd.DataFrame construit depuis les dictionnaires"""
+    expected = pd.DataFrame(json.loads(body)['results'])
+
+    pd.testing.assert_frame_equal(decode_records(body), expected, check_dtype=False)
+
+def test_decode_records_missing_fields():
+    """Test : Un champ absent d'un relevé devient une valeur manquante"""
+    body = b'{"results": [{"a": 1, "b": 2}, {"a": 3}]}'
+
+    df = decode_records(body)
+
+    assert df['a'].tolist() == [1, 3]
+    assert pd.isna(df['b'].iloc[1])
+
+def test_decode_records_empty_and_missing_results():
+    assert decode_records(b'{"results": []}').empty
+    assert decode_records(b'{"error": "boom"}') is None
+    assert decode_records(b'[]') is None
+
+def test_decode_records_invalid_json():
+    with pytest.raises(ValueError):
+        decode_records(b'not json')
+
+def test_decode_records_without_orjson(body, mocker):
+    """Test : Repli sur le module json standard si orjson n'est pas installé"""
+    mocker.patch.object(decoder, 'orjson', None)
+
+    assert len(decode_records(body)) == 2
+
+def test_is_empty_page(body):
+    """Test : Seule une réponse dont 'results' est vide est une page vide"""
+    assert is_empty_page(b'{"total_count": 0, "results": []}')
+    assert not is_empty_page(body)
+    assert not is_empty_page(b'{"error": "x"}')
+    assert not is_empty_page(b'not json')
+    assert not is_empty_page(b'{"results": []}' + b' ' * 1024)
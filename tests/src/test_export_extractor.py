@@ -0,0 +1,111 @@
+import io
+import pandas as pd
+import pytest
+import requests
+from projet.src.api.export_extractor import ExportExtractor
+from projet.src.api.rate_limiter import RateLimiter
+
+
+@pytest.fixture
+def mock_station(mocker):
+    station = mocker.Mock(name="Station")
+    station.name = "Toulouse-Blagnac"
+    station.id = "toulouse-blagnac"
+    return station
+
+@pytest.fixture
+def records():
+    return pd.DataFrame({
+        'heure_de_paris': pd.date_range("2023-01-01", periods=25, freq="h", tz="UTC")[::-1],
+        'temperature_en_degre_c': [10.5] * 25,
+        'humidite': [80] * 25,
+        'pression': [101300] * 25,
+    })
+
+@pytest.fixture
+def mock_session_get(mocker):
+    return mocker.patch('requests.Session.get')
+
+def _stream(mock_session_get, payload: bytes):
+    """Simule une réponse téléchargée par morceaux"""
+    response = mock_session_get.return_value
+    response.status_code = 200
+    response.__enter__.return_value = response
+    response.iter_content.side_effect = lambda chunk_size: (
+        payload[i:i + chunk_size] for i in range(0, len(payload), chunk_size)
+    )
+
+def test_invalid_format():
+    with pytest.raises(ValueError):
+        ExportExtractor(export_format="xlsx")
+
+def test_extract_parquet_export(mock_station, mock_session_get, records):
+    """Test Nominal : L'export parquet est téléchargé par morceaux puis lu en colonnes"""
+    buffer = io.BytesIO()
+    records.to_parquet(buffer, index=False)
+    _stream(mock_session_get, buffer.getvalue())
+    extractor = ExportExtractor(chunk_size=256, rate_limiter=RateLimiter(rate=None))
+
+    df = extractor.extract(mock_station)
+
+    pd.testing.assert_frame_equal(df, records)
+    args, kwargs = mock_session_get.call_args
+    assert args[0].endswith("toulouse-blagnac/exports/parquet")
+    assert kwargs['stream'] is True
+    assert 'limit' not in kwargs['params']
+
+def test_extract_pages_in_batches(mock_station, mock_session_get, records):
+    """Test : Le backfill est restitué par lots de `batch_size` lignes"""
+    buffer = io.BytesIO()
+    records.to_parquet(buffer, index=False)
+    _stream(mock_session_get, buffer.getvalue())
+    extractor = ExportExtractor(batch_size=10, rate_limiter=RateLimiter(rate=None))
+
+    pages = list(extractor.extract_pages(mock_station, days=30, stop_at=pd.Timestamp("2023-01-01")))
+
+    assert [len(p) for p in pages] == [10, 10, 5]
+    where = mock_session_get.call_args.kwargs['params']['where']
+    assert "now(days=-30)" in where
+    assert "heure_de_paris > date'2023-01-01T00:00:00+00:00'" in where
+
+def test_extract_pages_until(mock_station, mock_session_get, records):
+    """Test : Une reprise de backfill n'exporte que les relevés antérieurs au point de reprise"""
+    buffer = io.BytesIO()
+    records.to_parquet(buffer, index=False)
+    _stream(mock_session_get, buffer.getvalue())
+    extractor = ExportExtractor(rate_limiter=RateLimiter(rate=None))
+
+    list(extractor.extract_pages(mock_station, days=30, until=pd.Timestamp("2023-01-05", tz="UTC")))
+
+    where = mock_session_get.call_args.kwargs['params']['where']
+    assert "heure_de_paris < date'2023-01-05T00:00:00+00:00'" in where
+
+def test_extract_csv_export(mock_station, mock_session_get, records):
+    """Test : Export CSV (séparateur ';')"""
+    _stream(mock_session_get, records.to_csv(sep=';', index=False).encode())
+    extractor = ExportExtractor(export_format="csv", rate_limiter=RateLimiter(rate=None))
+
+    df = extractor.extract(mock_station)
+
+    assert len(df) == 25
+    assert df['humidite'].tolist() == [80] * 25
+    assert mock_session_get.call_args.kwargs['params']['delimiter'] == ';'
+
+def test_extract_empty_export(mock_station, mock_session_get):
+    _stream(mock_session_get, b"")
+    extractor = ExportExtractor(rate_limiter=RateLimiter(rate=None))
+
+    df = extractor.extract(mock_station)
+    assert df.empty
+    assert not df.attrs.get("request_failed", False)
+
+def test_extract_request_error(mock_station, mock_session_get):
+    """Test : Une erreur HTTP renvoie un DataFrame vide marqué en échec (pas une station vide)"""
+    _stream(mock_session_get, b"")
+    mock_session_get.return_value.raise_for_status.side_effect = requests.exceptions.HTTPError("404")
+    extractor = ExportExtractor(rate_limiter=RateLimiter(rate=None))
+
+    df = extractor.extract(mock_station)
+    assert df.empty
+    assert df.attrs["request_failed"]
+    assert list(extractor.extract_pages(mock_station)) == []
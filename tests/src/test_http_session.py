@@ -0,0 +1,54 @@
+import gc
+import threading
+from projet.src.api.http_session import HttpSessionPool
+
+
+def test_session_reused_in_same_thread():
+    """Test : Le même thread récupère toujours la même session"""
+    pool = HttpSessionPool(pool_size=4)
+
+    assert pool.session is pool.session
+
+def test_sessions_share_adapter_across_threads():
+    """Test : Chaque thread a sa session mais toutes partagent le pool de connexions"""
+    pool = HttpSessionPool(pool_size=4)
+    sessions = []
+
+    thread = threading.Thread(target=lambda: sessions.append(pool.session))
+    thread.start()
+    thread.join()
+    sessions.append(pool.session)
+
+    assert sessions[0] is not sessions[1]
+    assert sessions[0].get_adapter('https://example.org') is sessions[1].get_adapter('https://example.org')
+
+def test_session_accepts_compression():
+    """Test : Les réponses compressées sont acceptées"""
+    pool = HttpSessionPool()
+
+    assert 'gzip' in pool.session.headers['Accept-Encoding']
+
+def test_close_releases_sessions(mocker):
+    """Test : close() ferme les sessions et le pool de connexions"""
+    pool = HttpSessionPool()
+    session = pool.session
+    close_session = mocker.spy(session, 'close')
+    close_adapter = mocker.spy(pool._adapter, 'close')
+
+    pool.close()
+
+    close_session.assert_called_once()
+    close_adapter.assert_called()
+    assert pool.session is not session
+
+def test_session_of_finished_thread_is_released():
+    """Test : La session d'un thread terminé n'est pas conservée par le pool"""
+    pool = HttpSessionPool(pool_size=4)
+
+    for _ in range(5):
+        thread = threading.Thread(target=lambda: pool.session)
+        thread.start()
+        thread.join()
+    gc.collect()
+
+    assert len(pool._sessions) == 0
@@ -0,0 +1,91 @@
+import random
+from datetime import datetime, timedelta, timezone
+
+import pandas as pd
+import pytest
+
+from projet.src.api.request_queue import ApiRequestQueue, TaskPriority
+from projet.src.services.ingestion_scheduler import IngestionScheduler
+
+NOW = datetime(2023, 1, 1, 12, 30, tzinfo=timezone.utc)
+
+@pytest.fixture
+def stations(mocker):
+    return [mocker.Mock(id="s1"), mocker.Mock(id="s2"), mocker.Mock(id="s3")]
+
+@pytest.fixture
+def data_fetcher(mocker):
+    fetcher = mocker.Mock()
+    fetcher.refresh_and_save_station_data.__name__ = "refresh_and_save_station_data"
+    return fetcher
+
+@pytest.fixture
+def scheduler(mocker, stations, data_fetcher):
+    return IngestionScheduler(
+        mocker.Mock(spec=ApiRequestQueue), data_fetcher, stations,
+        offset=300, jitter=60, max_age=3600, rng=random.Random(0)
+    )
+
+def test_next_run_aligned_on_hour(scheduler):
+    """Test : Le passage suivant a lieu après le début de l'heure, décalage et gigue compris"""
+    for _ in range(20):
+        run_at = scheduler.next_run(NOW)
+        assert datetime(2023, 1, 1, 13, 5, tzinfo=timezone.utc) <= run_at
+        assert run_at <= datetime(2023, 1, 1, 13, 6, tzinfo=timezone.utc)
+
+    # Avant le décalage, le passage de l'heure courante n'est pas encore passé
+    early = scheduler.next_run(datetime(2023, 1, 1, 12, 1, tzinfo=timezone.utc))
+    assert early.hour == 12 and early.minute >= 5
+
+def test_next_run_after_pass_inside_jitter_window(mocker, stations, data_fetcher):
+    """Test : Un passage terminé dans la fenêtre de gigue n'en déclenche pas un second dans l'heure"""
+    scheduler = IngestionScheduler(
+        mocker.Mock(spec=ApiRequestQueue), data_fetcher, stations,
+        offset=300, jitter=300, rng=random.Random(0)
+    )
+    after_pass = datetime(2023, 1, 1, 14, 6, tzinfo=timezone.utc)
+
+    for _ in range(50):
+        run_at = scheduler.next_run(after_pass)
+        assert datetime(2023, 1, 1, 15, 5, tzinfo=timezone.utc) <= run_at
+        assert run_at <= datetime(2023, 1, 1, 15, 10, tzinfo=timezone.utc)
+
+def test_run_once_skips_fresh_stations(scheduler, data_fetcher, stations):
+    """Test : Seules les stations sans données récentes sont rafraîchies, en tâche de fond"""
+    latest = {
+        "s1": pd.Timestamp(NOW - timedelta(minutes=30)),              # à jour
+        "s2": pd.Timestamp(NOW - timedelta(hours=2)),                 # périmée
+        "s3": None                                                    # jamais récupérée
+    }
+    data_fetcher.parquet_handler.get_latest_date.side_effect = lambda station: latest[station.id]
+
+    assert scheduler.run_once(NOW) == 2
+
+    calls = scheduler.api_queue.add_task.call_args_list
+    assert [call.kwargs["station"] for call in calls] == stations[1:]
+    assert all(call.kwargs["priority"] == TaskPriority.BACKGROUND for call in calls)
+    assert [call.kwargs["dedupe_key"] for call in calls] == ["s2", "s3"]
+
+def test_naive_latest_date_is_utc(scheduler, data_fetcher, stations):
+    """Test : Une date stockée sans fuseau est interprétée en UTC"""
+    data_fetcher.parquet_handler.get_latest_date.return_value = pd.Timestamp("2023-01-01 12:00")
+    assert scheduler.is_fresh(stations[0], NOW)
+
+def test_start_runs_first_pass_and_stop(scheduler, data_fetcher):
+    """Test : Le planificateur rattrape immédiatement, puis s'arrête proprement"""
+    data_fetcher.parquet_handler.get_latest_date.return_value = None
+
+    scheduler.start()
+    scheduler.start()  # Sans effet : un seul thread
+    scheduler.stop()
+
+    assert not scheduler.is_running
+    assert scheduler.api_queue.add_task.call_count == 3
+
+def test_failed_pass_keeps_scheduler_alive(scheduler, data_fetcher, caplog):
+    """Test : Un passage en échec est journalisé sans arrêter le planificateur"""
+    data_fetcher.parquet_handler.get_latest_date.side_effect = OSError("disk")
+
+    scheduler._safe_run_once()
+
+    assert "Scheduled ingestion pass failed" in caplog.text
@@ -99,3 +99,17 @@ def test_navigator_single_element(mock_station):
     assert nav.get_current() == mock_station
     assert nav.get_next() == mock_station
     assert nav.get_previous() == mock_station
+
+def test_navigator_peek_neighbours(mocker):
+    """Test : Les voisines sont renvoyées sans déplacer la station courante"""
+    stations = [mocker.Mock(name=f"Station{i}") for i in range(6)]
+    nav = LinkedListNavigator(stations)
+
+    assert nav.peek_neighbours(2) == [stations[1], stations[5], stations[2], stations[4]]
+    assert nav.get_current() == stations[0]
+
+def test_navigator_peek_neighbours_without_duplicates(stations, mock_station):
+    """Test : Une petite liste circulaire ne renvoie ni doublon ni la station courante"""
+    assert LinkedListNavigator(stations).peek_neighbours(5) == [stations[1], stations[2]]
+    assert LinkedListNavigator([mock_station]).peek_neighbours(1) == []
+    assert LinkedListNavigator([]).peek_neighbours(1) == []
@@ -0,0 +1,54 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from projet.src.services.negative_cache import NegativeCache
+
+T0 = datetime(2023, 1, 1, 12, tzinfo=timezone.utc)
+
+@pytest.fixture
+def cache(tmp_path):
+    return NegativeCache(tmp_path / "negative_cache.json", base_interval=60, max_interval=300)
+
+def test_unknown_station_is_not_skipped(cache):
+    """Test : Une station jamais vide n'est pas ignorée"""
+    assert not cache.should_skip("s1")
+    assert cache.empty_since("s1") is None
+    assert cache.next_check("s1") is None
+
+def test_exponential_recheck_interval(cache):
+    """Test : L'intervalle de re-vérification double à chaque échec, jusqu'au plafond"""
+    cache.record_empty("s1", now=T0)
+    assert cache.next_check("s1") == T0 + timedelta(seconds=60)
+    assert cache.should_skip("s1", now=T0 + timedelta(seconds=59))
+    assert not cache.should_skip("s1", now=T0 + timedelta(seconds=60))
+
+    cache.record_empty("s1", now=T0 + timedelta(seconds=60))
+    assert cache.next_check("s1") == T0 + timedelta(seconds=60 + 120)
+
+    for _ in range(5):
+        cache.record_empty("s1", now=T0)
+    assert cache.next_check("s1") == T0 + timedelta(seconds=300)
+    assert cache.empty_since("s1") == T0
+
+def test_record_data_clears_entry(cache):
+    """Test : Des données reçues effacent l'entrée"""
+    cache.record_empty("s1", now=T0)
+    cache.record_data("s1")
+    cache.record_data("unknown")
+    assert cache.empty_since("s1") is None
+    assert not cache.should_skip("s1", now=T0)
+
+def test_entries_survive_restart(cache, tmp_path):
+    """Test : Les entrées sont persistées entre deux démarrages"""
+    cache.record_empty("s1", now=T0)
+    reloaded = NegativeCache(tmp_path / "negative_cache.json", base_interval=60)
+    assert reloaded.empty_since("s1") == T0
+    assert reloaded.should_skip("s1", now=T0 + timedelta(seconds=30))
+
+def test_unreadable_file_is_ignored(tmp_path, caplog):
+    """Test : Un fichier corrompu est ignoré"""
+    (tmp_path / "negative_cache.json").write_text("[broken")
+    cache = NegativeCache(tmp_path / "negative_cache.json")
+    assert cache.empty_since("s1") is None
+    assert "unreadable negative cache" in caplog.text
@@ -136,3 +136,87 @@ def test_merge_error_handling(handler, station, test_reports, caplog):
     df = pd.read_parquet(filepath)
     assert len(df) == 1
     assert df.iloc[0]['temperature'] == 12
+
+def test_get_latest_date(handler, station, test_reports):
+    """Test : La date la plus récente est lue depuis les statistiques du fichier"""
+    assert handler.get_latest_date(station) is None
+
+    station.reports = test_reports
+    handler.save_station_reports(station)
+
+    assert handler.get_latest_date(station) == pd.Timestamp("2023-01-02 12:00")
+
+def test_get_latest_date_error_handling(handler, station, test_reports, mocker, caplog):
+    station.reports = test_reports
+    handler.save_station_reports(station)
+    mocker.patch('pyarrow.parquet.ParquetFile', side_effect=Exception("Fichier corrompu"))
+
+    assert handler.get_latest_date(station) is None
+    assert "Failed to read latest date" in caplog.text
+
+def test_load_station_reports_downsampled_on_read(temp_dir, station):
+    """Test : Le fichier garde la pleine résolution, la lecture est sous-échantillonnée"""
+    station.reports = [
+        WeatherReport(pd.to_datetime("2023-01-01 12:00"), 10.0, 50, 101300, "a"),
+        WeatherReport(pd.to_datetime("2023-01-01 12:15"), 12.0, 52, 101310, "b"),
+        WeatherReport(pd.to_datetime("2023-01-01 13:00"), 14.0, 54, 101320, "c")
+    ]
+    ParquetHandler(data_dir=temp_dir).save_station_reports(station)
+
+    handler = ParquetHandler(data_dir=temp_dir, read_resolution='hourly')
+    handler.load_station_reports(station)
+
+    assert [report.temperature for report in station.reports] == [11.0, 14.0]
+    assert len(pd.read_parquet(handler._get_filepath(station))) == 3
+
+def test_load_station_reports_from_memory_cache(temp_dir, station, test_reports, mocker):
+    """Test : Une station déjà lue n'est pas relue tant que son fichier ne change pas"""
+    handler = ParquetHandler(data_dir=temp_dir, cache_size=2)
+    station.reports = test_reports
+    handler.save_station_reports(station)
+    read = mocker.spy(pd, "read_parquet")
+
+    assert handler.preload(station)
+    handler.load_station_reports(station)
+
+    assert read.call_count == 1
+    assert [report.temperature for report in station.reports] == [10, 12]
+
+    station.reports = [WeatherReport(pd.to_datetime("2023-01-03 12:00"), 14, 60, 1017, "03 Jan")]
+    handler.save_station_reports(station)
+    read.reset_mock()
+    handler.load_station_reports(station)
+
+    # Le fichier a changé : il est relu
+    assert read.call_count == 1
+    assert len(station.reports) == 3
+
+def test_memory_cache_keeps_most_recent_frames(temp_dir, test_reports):
+    """Test : Le cache mémoire est borné et évince la lecture la plus ancienne"""
+    handler = ParquetHandler(data_dir=temp_dir, cache_size=2)
+    stations = [Station(i, f"Station {i}", 0, 0) for i in range(3)]
+    for station in stations:
+        station.reports = test_reports
+        handler.save_station_reports(station)
+        handler.preload(station)
+
+    assert list(handler._frames) == [handler._get_filepath(s) for s in stations[1:]]
+
+def test_preload_without_cache_or_file(handler, temp_dir, station, test_reports):
+    """Test : Le préchargement est ignoré sans cache mémoire ou sans fichier"""
+    assert not ParquetHandler(data_dir=temp_dir, cache_size=2).preload(station)
+
+    station.reports = test_reports
+    handler.save_station_reports(station)
+
+    assert not handler.preload(station)
+    assert not handler._frames
+
+def test_preload_error_handling(temp_dir, station, test_reports, mocker, caplog):
+    handler = ParquetHandler(data_dir=temp_dir, cache_size=2)
+    station.reports = test_reports
+    handler.save_station_reports(station)
+    mocker.patch('pandas.read_parquet', side_effect=Exception("Fichier corrompu"))
+
+    assert not handler.preload(station)
+    assert "Failed to preload reports" in caplog.text
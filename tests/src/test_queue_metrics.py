@@ -0,0 +1,60 @@
+import math
+
+from projet.src.api.queue_metrics import QueueMetrics, TaskSample, summarize
+
+def test_summarize_percentiles_and_histogram():
+    """Test : Percentiles au rang le plus proche et histogramme par borne supérieure"""
+    summary = summarize([0.05 * i for i in range(1, 101)])  # 0,05 s à 5 s
+
+    assert summary['count'] == 100
+    assert math.isclose(summary['p50'], 2.5)
+    assert math.isclose(summary['p90'], 4.5)
+    assert math.isclose(summary['p99'], 4.95)
+    assert math.isclose(summary['max'], 5.0)
+    assert summary['histogram'][0.1] == 2
+    assert summary['histogram'][5] == 60
+    assert summary['histogram'][math.inf] == 0
+    assert sum(summary['histogram'].values()) == 100
+
+def test_summarize_empty():
+    """Test : Une série vide n'a que son nombre d'éléments"""
+    assert summarize([]) == {'count': 0}
+
+def test_snapshot_ignores_tasks_not_run_in_timings():
+    """Test : Les tâches annulées sont comptées mais exclues des temps d'attente et d'exécution"""
+    metrics = QueueMetrics(window=3)
+    metrics.record_task(TaskSample("refresh", "INTERACTIVE", 0.2, 1.0, "succeeded"))
+    metrics.record_task(TaskSample("backfill", "BACKGROUND", 5.0, 30.0, "failed"))
+    metrics.record_task(TaskSample("refresh", "PREFETCH", 1.0, 0.0, "cancelled"))
+
+    snapshot = metrics.snapshot()
+
+    assert snapshot['outcomes'] == {"succeeded": 1, "failed": 1, "cancelled": 1}
+    assert snapshot['wait']['count'] == 2
+    assert snapshot['run']['max'] == 30.0
+    assert set(snapshot['by_task']) == {"refresh", "backfill"}
+
+def test_rolling_window_keeps_totals():
+    """Test : Seules les dernières tâches sont résumées, les totaux sont conservés"""
+    metrics = QueueMetrics(window=2)
+    for run in (10.0, 1.0, 2.0):
+        metrics.record_task(TaskSample("refresh", "BACKGROUND", 0.0, run, "succeeded"))
+
+    snapshot = metrics.snapshot()
+
+    assert snapshot['run']['count'] == 2
+    assert snapshot['run']['max'] == 2.0
+    assert snapshot['outcomes'] == {"succeeded": 3}
+
+def test_depth_sampled_per_interval():
+    """Test : La profondeur est échantillonnée par intervalle, en gardant le maximum"""
+    metrics = QueueMetrics(depth_interval=1.0)
+    metrics.record_depth(3, now=100.0)
+    metrics.record_depth(7, now=100.5)
+    metrics.record_depth(1, now=100.9)
+    metrics.record_depth(2, now=101.5)
+
+    depth = metrics.snapshot()['depth']
+
+    assert depth['history'] == [(100.0, 7), (101.5, 2)]
+    assert depth['max'] == 7
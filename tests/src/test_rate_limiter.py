@@ -0,0 +1,70 @@
+import threading
+import time
+from projet.src.api.rate_limiter import RateLimiter
+
+
+def test_burst_is_immediate(mocker):
+    """Test : Les N premières requêtes (burst) ne patientent pas"""
+    sleep = mocker.patch("projet.src.api.rate_limiter.time.sleep")
+    limiter = RateLimiter(rate=10, burst=3)
+
+    for _ in range(3):
+        assert limiter.acquire()
+
+    sleep.assert_not_called()
+
+def test_waits_beyond_burst(mocker):
+    """Test : Au-delà du burst, chaque requête attend 1/rate secondes de plus"""
+    mocker.patch("projet.src.api.rate_limiter.time.monotonic", return_value=100.0)
+    sleep = mocker.patch("projet.src.api.rate_limiter.time.sleep")
+    limiter = RateLimiter(rate=10, burst=2)
+
+    for _ in range(4):
+        limiter.acquire()
+
+    waits = [round(c.args[0], 3) for c in sleep.call_args_list]
+    assert waits == [0.1, 0.2]
+
+def test_timeout_does_not_consume_token(mocker):
+    """Test : Un appel qui abandonne ne réserve pas de jeton"""
+    mocker.patch("projet.src.api.rate_limiter.time.monotonic", return_value=100.0)
+    mocker.patch("projet.src.api.rate_limiter.time.sleep")
+    limiter = RateLimiter(rate=1, burst=1)
+
+    assert limiter.acquire()
+    assert not limiter.acquire(timeout=0.5)
+    assert limiter.acquire(timeout=1)
+
+def test_disabled_limiter(mocker):
+    sleep = mocker.patch("projet.src.api.rate_limiter.time.sleep")
+    limiter = RateLimiter(rate=None)
+
+    for _ in range(100):
+        limiter.acquire()
+
+    sleep.assert_not_called()
+
+def test_shared_instance_is_reconfigurable():
+    """Test : L'instance partagée est unique et reconfigurable"""
+    shared = RateLimiter.shared()
+    rate, burst = shared.rate, shared.burst
+
+    shared.configure(rate=2, burst=4)
+
+    assert RateLimiter.shared() is shared
+    assert (shared.rate, shared.burst) == (2, 4)
+    shared.configure(rate, burst)
+
+def test_concurrent_callers_are_throttled():
+    """Test : Des threads concurrents respectent le débit global"""
+    limiter = RateLimiter(rate=200, burst=1)
+    threads = [threading.Thread(target=limiter.acquire) for _ in range(10)]
+
+    start = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # 10 jetons à 200/s avec un burst de 1 : le dernier n'est pas servi avant +45 ms
+    assert time.monotonic() - start >= 0.045 - 0.005
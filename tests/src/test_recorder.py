@@ -0,0 +1,32 @@
+import pytest
+from projet.src.api.recorder import ReplayMissError, ResponseRecorder
+
+
+def test_invalid_mode(tmp_path):
+    with pytest.raises(ValueError):
+        ResponseRecorder(tmp_path, mode="live")
+
+def test_record_then_replay(tmp_path):
+    """Test Nominal : Une réponse enregistrée est rejouée à l'identique"""
+    recorder = ResponseRecorder(tmp_path, mode="record")
+    recorder.save("https://api.example.org/datasets/s1/records", {"limit": "100"}, b'{"results": []}')
+
+    replayer = ResponseRecorder(tmp_path, mode="replay")
+
+    assert replayer.is_replaying
+    assert replayer.load("https://api.example.org/datasets/s1/records", {"limit": "100"}) == b'{"results": []}'
+
+def test_replay_is_host_independent(tmp_path):
+    """Test : La cassette ne dépend pas de l'hôte (rejouable sur l'API locale)"""
+    ResponseRecorder(tmp_path, mode="record").save("https://live.org/datasets/s1/records", {}, b"{}")
+
+    assert ResponseRecorder(tmp_path).load("http://127.0.0.1:8765/datasets/s1/records", {}) == b"{}"
+
+def test_replay_miss(tmp_path):
+    with pytest.raises(ReplayMissError):
+        ResponseRecorder(tmp_path).load("https://live.org/datasets/s1/records", {"limit": "1"})
+
+def test_save_ignored_in_replay_mode(tmp_path):
+    ResponseRecorder(tmp_path, mode="replay").save("https://live.org/x", {}, b"{}")
+
+    assert list(tmp_path.iterdir()) == []
@@ -1,5 +1,6 @@
 import pytest
 import threading
+import time
 from queue import Empty
 from projet.src.api.request_queue import ApiRequestQueue
 
@@ -30,12 +31,12 @@ def test_start_creates_thread(queue_instance, mocker):
     
     mock_thread.assert_called_once()
     mock_thread_instance.start.assert_called_once()
-    assert queue_instance._worker_thread is not None
+    assert len(queue_instance._worker_threads) == 1
 
 def test_stop_sets_event(queue_instance, mocker):
     """Test : stop() arrête le thread"""
     mock_thread = mocker.Mock()
-    queue_instance._worker_thread = mock_thread
+    queue_instance._worker_threads = [mock_thread]
     mock_thread.is_alive.return_value = True
     
     queue_instance.stop()
@@ -44,12 +45,10 @@ def test_stop_sets_event(queue_instance, mocker):
     mock_thread.join.assert_called_once()
 
 def test_worker_executes_task(queue_instance, mocker):
-    """Test : _worker exécute la tâche et update le status"""
+    """Test : _worker exécute la tâche et appelle son callback"""
     task = mocker.Mock(name="Task")
     task.__name__ = "MockTask"  # Required for logger.info(task.__name__)
     on_complete = mocker.Mock(name="Callback")
-    status = {}
-    queue_instance._task_status = status
     
     # On ajoute une tâche
     queue_instance.add_task(task, "test", on_complete=on_complete)
@@ -64,8 +63,7 @@ def test_worker_executes_task(queue_instance, mocker):
     # Vérifications
     task.assert_called_once_with("test")
     on_complete.assert_called_once()
-    assert status["refresh_needed"] is True
-    assert queue_instance._is_busy is False
+    assert queue_instance._busy_workers == 0
 
 def test_worker_handle_exception(queue_instance, mocker):
     """Test : Le worker ne plante pas si la tâche lève une exception"""
@@ -79,7 +77,7 @@ def test_worker_handle_exception(queue_instance, mocker):
     queue_instance._worker()
     
     task.assert_called_once()
-    assert queue_instance._is_busy is False
+    assert queue_instance._busy_workers == 0
 
 
 def test_is_working_property(queue_instance, mocker):
@@ -88,9 +86,9 @@ def test_is_working_property(queue_instance, mocker):
     assert queue_instance.is_working is False
     
     # Cas 2: Busy
-    queue_instance._is_busy = True
+    queue_instance._busy_workers = 1
     assert queue_instance.is_working is True
-    queue_instance._is_busy = False
+    queue_instance._busy_workers = 0
     
     # Cas 3: Queue non vide
     queue_instance.add_task(lambda: None)
@@ -100,7 +98,7 @@ def test_start_already_running(queue_instance, mocker):
     """Test : start() ne fait rien si thread déjà en cours"""
     mock_thread = mocker.Mock()
     mock_thread.is_alive.return_value = True
-    queue_instance._worker_thread = mock_thread
+    queue_instance._worker_threads = [mock_thread]
     
     # Appel start
     queue_instance.start()
@@ -111,28 +109,25 @@ def test_start_already_running(queue_instance, mocker):
 
 def test_stop_no_thread(queue_instance, mocker):
     """Test : stop() sans thread actif ne plante pas"""
-    queue_instance._worker_thread = None
+    queue_instance._worker_threads = []
     queue_instance.stop()
     assert queue_instance._stop_event.is_set()
 
 def test_stop_dead_thread(queue_instance, mocker):
     """Test : stop() avec thread mort ne plante pas"""
     mock_thread = mocker.Mock()
-    queue_instance._worker_thread = mock_thread
+    queue_instance._worker_threads = [mock_thread]
     
     queue_instance.stop()
     
     assert queue_instance._stop_event.is_set()
     mock_thread.join.assert_called_once()
 
-def test_worker_success_no_status_no_callback(queue_instance, mocker):
-    """Test : Exécution réussie sans task_status ni on_complete"""
+def test_worker_success_no_callback(queue_instance, mocker):
+    """Test : Exécution réussie sans on_complete"""
     task = mocker.Mock(name="Task")
     task.__name__ = "MsTask"
     
-    # Ensure queue has no status
-    queue_instance._task_status = None
-    
     # Add task without callback
     queue_instance.add_task(task)
     
@@ -155,3 +150,578 @@ def test_worker_timeout(queue_instance, mocker):
     
     # Vérifie que get a été appelé
     queue_instance._tasks.get.assert_called_once()
+
+def test_add_task_coalesces_pending_key(queue_instance, mocker):
+    """Test : Une tâche dont la clé est déjà en attente est fusionnée, pas ajoutée"""
+    task = mocker.Mock(__name__="refresh")
+    first_cb, second_cb = mocker.Mock(), mocker.Mock()
+
+    assert queue_instance.add_task(task, station="s1", dedupe_key="s1", on_complete=first_cb).queued
+    assert not queue_instance.add_task(task, station="s1", dedupe_key="s1",
+                                       on_complete=second_cb).queued
+    assert queue_instance.add_task(task, station="s2", dedupe_key="s2").queued
+    for _ in range(10):
+        queue_instance.add_task(task, station="s1", dedupe_key="s1")
+
+    assert queue_instance._tasks.qsize() == 2
+
+    mocker.patch.object(queue_instance._stop_event, 'is_set', side_effect=[False, True])
+    queue_instance._worker()
+
+    task.assert_called_once_with(station="s1")
+    first_cb.assert_called_once()
+    second_cb.assert_called_once()
+    assert queue_instance._pending == {"s2": []}
+    assert queue_instance._in_flight == {}
+
+def test_in_flight_task_satisfies_same_key(queue_instance, mocker):
+    """Test : Une tâche en cours d'exécution satisfait les demandes de même clé"""
+    late_cb = mocker.Mock()
+
+    def refresh(station):
+        # Demande arrivant pendant l'exécution
+        assert not queue_instance.add_task(refresh, station=station, dedupe_key=station,
+                                           on_complete=late_cb).queued
+
+    queue_instance.add_task(refresh, station="s1", dedupe_key="s1")
+    mocker.patch.object(queue_instance._stop_event, 'is_set', side_effect=[False, True])
+    queue_instance._worker()
+
+    late_cb.assert_called_once()
+    assert queue_instance._tasks.empty()
+    # La clé est libérée : une nouvelle demande est de nouveau mise en file
+    assert queue_instance.add_task(refresh, station="s1", dedupe_key="s1").queued
+
+def test_failed_keyed_task_releases_key(queue_instance, mocker):
+    """Test : Une tâche en échec libère sa clé"""
+    task = mocker.Mock(side_effect=ValueError("Boom"), __name__="refresh")
+    queue_instance.add_task(task, dedupe_key="s1")
+    mocker.patch.object(queue_instance._stop_event, 'is_set', side_effect=[False, True])
+
+    queue_instance._worker()
+
+    assert queue_instance._in_flight == {}
+    assert queue_instance.add_task(task, dedupe_key="s1").queued
+
+def _square(value):
+    """Tâche picklable exécutée dans le pool de processus"""
+    return value * value
+
+def test_workers_run_tasks_concurrently():
+    """Test : Une tâche lente ne bloque pas les autres avec plusieurs workers"""
+    api_queue = ApiRequestQueue(workers=3)
+    release = threading.Event()
+    done = []
+
+    def slow():
+        release.wait(timeout=5)
+        done.append("slow")
+
+    def fast(name):
+        done.append(name)
+
+    api_queue.start()
+    try:
+        api_queue.add_task(slow)
+        api_queue.add_task(fast, "a")
+        api_queue.add_task(fast, "b")
+        for _ in range(100):
+            if len(done) == 2:
+                break
+            time.sleep(0.01)
+        assert sorted(done) == ["a", "b"]
+        assert api_queue.is_working
+        assert api_queue._busy_workers == 1
+        release.set()
+        api_queue._tasks.join()
+    finally:
+        api_queue.stop()
+
+    assert done[-1] == "slow"
+    assert not api_queue.is_working
+
+def test_callbacks_run_in_queue_order(queue_instance, mocker):
+    """Test : Les callbacks ordonnés suivent l'ordre d'ajout, même si les tâches finissent dans le désordre"""
+    order = []
+    task = mocker.Mock(__name__="refresh")
+    for name in ("first", "second", "third"):
+        queue_instance.add_task(task, on_complete=lambda name=name: order.append(name), ordered=True)
+    first, second, third = [queue_instance._tasks.get() for _ in range(3)]
+
+    queue_instance._execute(third)
+    queue_instance._execute(second)
+    assert order == []
+
+    queue_instance._execute(first)
+    assert order == ["first", "second", "third"]
+
+def test_unordered_callbacks_are_not_held_back(queue_instance, mocker):
+    """Test : Une longue tâche (backfill) ne retarde pas les callbacks des rafraîchissements"""
+    from projet.src.api.request_queue import TaskPriority
+    order = []
+    task = mocker.Mock(__name__="refresh")
+    queue_instance.add_task(task, on_complete=lambda: order.append("backfill"), ordered=True)
+    queue_instance.add_task(task, on_complete=lambda: order.append("refresh"),
+                            priority=TaskPriority.INTERACTIVE)
+    refresh, backfill = [queue_instance._tasks.get() for _ in range(2)]
+
+    queue_instance._execute(refresh)
+    assert order == ["refresh"]
+
+    queue_instance._execute(backfill)
+    assert order == ["refresh", "backfill"]
+
+def test_failed_task_does_not_block_callbacks(queue_instance, mocker):
+    """Test : Une tâche en échec ne bloque pas les callbacks suivants"""
+    failing = mocker.Mock(side_effect=ValueError("Boom"), __name__="failing")
+    callback = mocker.Mock(side_effect=RuntimeError("callback error"))
+    last = mocker.Mock()
+    queue_instance.add_task(failing, on_complete=mocker.Mock())
+    queue_instance.add_task(mocker.Mock(__name__="ok"), on_complete=callback)
+    queue_instance.add_task(mocker.Mock(__name__="ok"), on_complete=last)
+
+    for _ in range(3):
+        queue_instance._execute(queue_instance._tasks.get())
+
+    callback.assert_called_once()
+    last.assert_called_once()
+
+def test_cpu_bound_task_runs_in_process_pool():
+    """Test : Une tâche CPU est déléguée au pool de processus"""
+    api_queue = ApiRequestQueue(workers=1, process_workers=1)
+    done = threading.Event()
+    api_queue.start()
+    try:
+        assert api_queue._process_pool is not None
+        api_queue.add_task(_square, 4, cpu_bound=True, on_complete=done.set)
+        assert done.wait(timeout=30)
+    finally:
+        api_queue.stop()
+    assert api_queue._process_pool is None
+
+def test_interactive_task_runs_before_background(queue_instance, mocker):
+    """Test : Une tâche interactive passe devant le travail de fond"""
+    from projet.src.api.request_queue import TaskPriority
+    task = mocker.Mock(__name__="refresh")
+    queue_instance.add_task(task, "backfill")
+    queue_instance.add_task(task, "prefetch", priority=TaskPriority.PREFETCH)
+    queue_instance.add_task(task, "displayed", priority=TaskPriority.INTERACTIVE)
+
+    order = [queue_instance._tasks.get(timeout=0).args[0] for _ in range(3)]
+
+    assert order == ["displayed", "prefetch", "backfill"]
+
+def test_aging_prevents_starvation(mocker):
+    """Test : Une tâche de fond ancienne finit par passer devant une tâche interactive récente"""
+    from projet.src.api.request_queue import TaskPriority
+    clock = mocker.patch("projet.src.api.request_queue.time.monotonic", return_value=100.0)
+    api_queue = ApiRequestQueue(aging_interval=10)
+    task = mocker.Mock(__name__="refresh")
+    api_queue.add_task(task, "old background")
+
+    clock.return_value = 125.0  # 2,5 niveaux de vieillissement
+    api_queue.add_task(task, "new interactive", priority=TaskPriority.INTERACTIVE)
+
+    assert api_queue._tasks.get(timeout=0).args[0] == "old background"
+
+def test_pending_task_promoted_by_interactive_request(queue_instance, mocker):
+    """Test : Une demande interactive promeut la tâche de fond en attente de même clé"""
+    from projet.src.api.request_queue import TaskPriority
+    task = mocker.Mock(__name__="refresh")
+    queue_instance.add_task(task, "other", priority=TaskPriority.PREFETCH)
+    queue_instance.add_task(task, "s1", dedupe_key="s1")
+
+    assert not queue_instance.add_task(task, "s1", dedupe_key="s1",
+                                       priority=TaskPriority.INTERACTIVE).queued
+
+    first = queue_instance._tasks.get(timeout=0)
+    assert first.args == ("s1",)
+    assert first.priority == TaskPriority.INTERACTIVE
+    assert queue_instance._tasks.qsize() == 1
+
+def test_get_times_out_when_empty(queue_instance):
+    """Test : get() lève Empty à l'expiration du délai"""
+    with pytest.raises(Empty):
+        queue_instance._tasks.get(timeout=0.01)
+
+def test_sessions_share_queue_and_completions(queue_instance, mocker):
+    """Test : Deux sessions partagent la file ; la fin d'une tâche est visible de toutes"""
+    from projet.src.api.session_queue import SessionRequestQueue
+    session_a = SessionRequestQueue(queue_instance)
+    session_b = SessionRequestQueue(queue_instance)
+    watcher = SessionRequestQueue(queue_instance)
+    task = mocker.Mock(__name__="refresh")
+
+    assert session_a.add_task(task, station="s1", dedupe_key="s1").queued
+    assert not session_b.add_task(task, station="s1", dedupe_key="s1").queued
+    assert watcher.is_pending("s1") and not watcher.is_pending("s2")
+    assert queue_instance._tasks.qsize() == 1
+
+    queue_instance._execute(queue_instance._tasks.get(timeout=0))
+
+    task.assert_called_once_with(station="s1")
+    assert not watcher.is_pending("s1")
+    assert watcher.completions("s1") == 1
+    assert watcher.completions("s2") == 0
+    assert not session_a._handles and not session_b._handles
+
+def test_failed_task_is_not_counted(queue_instance, mocker):
+    """Test : Une tâche en échec libère la clé sans compter de rafraîchissement"""
+    from projet.src.api.session_queue import SessionRequestQueue
+    session = SessionRequestQueue(queue_instance)
+    session.add_task(mocker.Mock(side_effect=ValueError("Boom"), __name__="refresh"),
+                     dedupe_key="s1")
+
+    queue_instance._execute(queue_instance._tasks.get(timeout=0))
+
+    assert not session.is_pending("s1")
+    assert session.completions("s1") == 0
+
+def test_completion_counted_for_any_requester(queue_instance, mocker):
+    """Test : Un rafraîchissement planifié ou préchargé est compté comme celui d'une session"""
+    from projet.src.api.session_queue import SessionRequestQueue
+    session = SessionRequestQueue(queue_instance)
+    queue_instance.add_task(mocker.Mock(__name__="refresh"), dedupe_key="s1")
+
+    assert session.is_pending("s1")
+    queue_instance._execute(queue_instance._tasks.get(timeout=0))
+
+    assert session.completions("s1") == 1
+
+def test_add_task_returns_handle_with_result(queue_instance, mocker):
+    """Test : add_task renvoie un handle portant le statut et le résultat de la tâche"""
+    handle = queue_instance.add_task(mocker.Mock(return_value=42, __name__="refresh"))
+    assert handle.status == "pending"
+
+    queue_instance._execute(queue_instance._tasks.get(timeout=0))
+
+    assert handle.status == "done"
+    assert handle.result(timeout=0) == 42
+
+def test_failed_task_sets_handle_exception(queue_instance, mocker):
+    """Test : L'exception d'une tâche en échec est transmise à son handle"""
+    error = ValueError("Boom")
+    handle = queue_instance.add_task(mocker.Mock(side_effect=error, __name__="refresh"))
+
+    queue_instance._execute(queue_instance._tasks.get(timeout=0))
+
+    assert handle.status == "failed"
+    assert handle.exception(timeout=0) is error
+
+def test_cancelled_task_is_dropped_before_execution(queue_instance, mocker):
+    """Test : Une tâche annulée après sa sortie de file, avant son démarrage, n'est pas exécutée"""
+    task = mocker.Mock(__name__="refresh")
+    callback = mocker.Mock()
+    handle = queue_instance.add_task(task, dedupe_key="s1", on_complete=callback)
+    item = queue_instance._tasks.get(timeout=0)
+
+    assert handle.cancel()
+    queue_instance._execute(item)
+
+    task.assert_not_called()
+    callback.assert_not_called()
+    assert handle.status == "cancelled"
+    assert queue_instance._in_flight == {}
+    # La clé est libérée
+    assert queue_instance.add_task(task, dedupe_key="s1").queued
+
+def test_cancel_withdraws_task_from_queue(mocker):
+    """Test : Une tâche annulée quitte la file aussitôt : plus en attente, place libérée"""
+    api_queue = ApiRequestQueue(max_size=1)
+    task = mocker.Mock(__name__="refresh")
+    first = api_queue.add_task(task, dedupe_key="s1")
+    merged = api_queue.add_task(task, dedupe_key="s1")
+
+    assert first.cancel()
+    assert api_queue.is_pending("s1")
+    assert merged.cancel()
+
+    assert not api_queue.is_pending("s1")
+    assert api_queue._tasks.qsize() == 0
+    assert api_queue.add_task(task, dedupe_key="s2").queued
+    assert api_queue.dropped == {}
+    assert api_queue.snapshot()['outcomes'] == {"cancelled": 1}
+
+def test_cancel_withdraws_unkeyed_task(queue_instance, mocker):
+    """Test : Une tâche sans clé annulée quitte aussi la file"""
+    task = mocker.Mock(__name__="refresh")
+    kept = queue_instance.add_task(task, "kept")
+    queue_instance.add_task(task, "cancelled").cancel()
+
+    assert queue_instance._tasks.qsize() == 1
+    assert queue_instance._tasks.get(timeout=0).handle is kept
+
+def test_merged_request_keeps_task_alive_after_cancel(queue_instance, mocker):
+    """Test : Annuler une demande n'annule pas la tâche tant qu'une autre l'attend"""
+    task = mocker.Mock(return_value="ok", __name__="refresh")
+    first = queue_instance.add_task(task, dedupe_key="s1")
+    second = queue_instance.add_task(task, dedupe_key="s1")
+
+    assert first.cancel()
+    queue_instance._execute(queue_instance._tasks.get(timeout=0))
+
+    task.assert_called_once()
+    assert first.cancelled()
+    assert second.result(timeout=0) == "ok"
+
+def test_running_task_cannot_be_cancelled(queue_instance):
+    """Test : Une tâche en cours d'exécution ne peut pas être annulée"""
+    results = []
+
+    def refresh():
+        results.append(handle.cancel())
+
+    handle = queue_instance.add_task(refresh)
+    queue_instance._execute(queue_instance._tasks.get(timeout=0))
+
+    assert results == [False]
+    assert handle.status == "done"
+
+def test_expired_task_is_dropped(mocker):
+    """Test : Une tâche dont le délai a expiré avant son démarrage n'est pas exécutée"""
+    clock = mocker.patch("projet.src.api.request_queue.time.monotonic", return_value=100.0)
+    api_queue = ApiRequestQueue()
+    task = mocker.Mock(__name__="refresh")
+    handle = api_queue.add_task(task, timeout=5)
+
+    clock.return_value = 106.0
+    api_queue._execute(api_queue._tasks.get(timeout=0))
+
+    task.assert_not_called()
+    assert isinstance(handle.exception(timeout=0), TimeoutError)
+
+def test_session_cancel_releases_pending(queue_instance, mocker):
+    """Test : Quitter une station annule la demande de la session sans toucher aux autres"""
+    from projet.src.api.session_queue import SessionRequestQueue
+    session_a = SessionRequestQueue(queue_instance)
+    session_b = SessionRequestQueue(queue_instance)
+    task = mocker.Mock(__name__="refresh")
+    handle_a = session_a.add_task(task, station="s1", dedupe_key="s1")
+    handle_b = session_b.add_task(task, station="s1", dedupe_key="s1")
+
+    assert session_a.cancel("s1")
+    assert not session_a.cancel("s1")
+
+    queue_instance._execute(queue_instance._tasks.get(timeout=0))
+
+    task.assert_called_once_with(station="s1")
+    assert handle_a.cancelled()
+    assert handle_b.status == "done"
+
+def test_session_cancel_all_requests_drops_task(queue_instance, mocker):
+    """Test : Une tâche dont toutes les demandes sont annulées n'est ni exécutée ni comptée"""
+    from projet.src.api.session_queue import SessionRequestQueue
+    session = SessionRequestQueue(queue_instance)
+    task = mocker.Mock(__name__="refresh")
+    session.add_task(task, dedupe_key="s1")
+
+    assert session.cancel("s1")
+
+    assert queue_instance._tasks.empty()
+    task.assert_not_called()
+    assert not session.is_pending("s1")
+    assert session.completions("s1") == 0
+
+def test_full_queue_rejects_new_task(mocker):
+    """Test : Politique 'reject' : une tâche ajoutée à une file pleine est refusée et comptée"""
+    from projet.src.api.request_queue import QueueFullError
+    api_queue = ApiRequestQueue(max_size=2)
+    task = mocker.Mock(__name__="refresh")
+    api_queue.add_task(task, "a")
+    api_queue.add_task(task, "b", dedupe_key="b")
+
+    # Une demande fusionnée n'occupe pas de place
+    assert api_queue.add_task(task, "b", dedupe_key="b").status == "pending"
+    rejected = api_queue.add_task(task, "c", dedupe_key="c")
+
+    assert not rejected.queued
+    assert isinstance(rejected.exception(timeout=0), QueueFullError)
+    assert api_queue._tasks.qsize() == 2
+    assert "c" not in api_queue._pending
+    assert api_queue.dropped == {"rejected": 1}
+
+def test_drop_oldest_policy(mocker):
+    """Test : Politique 'drop_oldest' : la tâche la plus ancienne est abandonnée"""
+    from projet.src.api.request_queue import QueueFullError
+    api_queue = ApiRequestQueue(max_size=2, overflow_policy="drop_oldest")
+    task = mocker.Mock(__name__="refresh")
+    oldest = api_queue.add_task(task, "a", dedupe_key="a")
+    merged = api_queue.add_task(task, "a", dedupe_key="a")
+    api_queue.add_task(task, "b")
+
+    newest = api_queue.add_task(task, "c")
+
+    assert newest.queued
+    assert isinstance(oldest.exception(timeout=0), QueueFullError)
+    assert isinstance(merged.exception(timeout=0), QueueFullError)
+    assert "a" not in api_queue._pending
+    assert [api_queue._tasks.get(timeout=0).args[0] for _ in range(2)] == ["b", "c"]
+    assert api_queue.dropped == {"evicted": 1}
+
+def test_drop_lowest_priority_policy(mocker):
+    """Test : Politique 'drop_lowest_priority' : le travail de fond cède la place à l'interactif"""
+    from projet.src.api.request_queue import QueueFullError, TaskPriority
+    api_queue = ApiRequestQueue(max_size=2, overflow_policy="drop_lowest_priority")
+    task = mocker.Mock(__name__="refresh")
+    api_queue.add_task(task, "prefetch", priority=TaskPriority.PREFETCH)
+    background = api_queue.add_task(task, "background")
+
+    interactive = api_queue.add_task(task, "displayed", priority=TaskPriority.INTERACTIVE)
+    # Aucune tâche de priorité plus faible : la nouvelle tâche est refusée
+    refused = api_queue.add_task(task, "other prefetch", priority=TaskPriority.PREFETCH)
+
+    assert interactive.queued
+    assert isinstance(background.exception(timeout=0), QueueFullError)
+    assert isinstance(refused.exception(timeout=0), QueueFullError)
+    assert api_queue.dropped == {"evicted": 1, "rejected": 1}
+
+def test_block_policy_waits_for_room(mocker):
+    """Test : Politique 'block' : l'ajout attend qu'une place se libère, puis abandonne"""
+    from projet.src.api.request_queue import QueueFullError
+    api_queue = ApiRequestQueue(max_size=1, overflow_policy="block", block_timeout=2)
+    task = mocker.Mock(__name__="refresh")
+    api_queue.add_task(task, "a")
+
+    timer = threading.Timer(0.05, api_queue._tasks.get)
+    timer.start()
+    assert api_queue.add_task(task, "b").queued
+    timer.join()
+
+    api_queue.block_timeout = 0.01
+    assert isinstance(api_queue.add_task(task, "c").exception(timeout=0), QueueFullError)
+
+def test_unknown_overflow_policy():
+    """Test : Une politique de débordement inconnue est refusée"""
+    with pytest.raises(ValueError):
+        ApiRequestQueue(overflow_policy="drop_everything")
+
+class _Service:
+    """Service factice dont les méthodes sont enregistrées comme tâches durables"""
+    def __init__(self):
+        self.calls = []
+
+    def refresh(self, station):
+        self.calls.append(("refresh", station.id))
+
+    def backfill(self, station, days, until=None, on_progress=None):
+        self.calls.append(("backfill", station.id, until))
+        on_progress(until="2023-01-01T00:00:00+00:00")
+        raise SystemExit("arrêt du conteneur")
+
+@pytest.fixture
+def durable_setup(tmp_path):
+    from projet.src.api.task_store import SqliteTaskStore
+    from projet.src.entities.station import Station
+    station = Station("s1", "Station 1", 1.4, 43.6)
+
+    def make_queue():
+        service = _Service()
+        api_queue = ApiRequestQueue(store=SqliteTaskStore(tmp_path / "tasks.sqlite3"))
+        api_queue.register_durable("refresh", service.refresh)
+        api_queue.register_durable("backfill", service.backfill, progress_kwarg="on_progress")
+        return api_queue, service
+
+    return make_queue, station
+
+def test_durable_tasks_resumed_after_restart(durable_setup):
+    """Test : Les tâches en attente au redémarrage sont remises en file, une seule fois"""
+    make_queue, station = durable_setup
+    api_queue, service = make_queue()
+    api_queue.add_task(service.refresh, station=station, dedupe_key="s1")
+    api_queue.add_task(lambda: None)  # Non durable : perdue au redémarrage
+    assert len(api_queue._store) == 1
+
+    restarted, service = make_queue()
+    assert restarted.resume({"s1": station}) == 1
+    restarted._execute(restarted._tasks.get(timeout=0))
+
+    assert service.calls == [("refresh", "s1")]
+    assert len(restarted._store) == 0
+    assert restarted.resume({"s1": station}) == 0
+
+def test_interrupted_backfill_resumes_from_checkpoint(durable_setup):
+    """Test : Un backfill interrompu reprend depuis son dernier point de reprise"""
+    make_queue, station = durable_setup
+    api_queue, service = make_queue()
+    api_queue.add_task(service.backfill, station=station, days=365)
+
+    # Arrêt brutal pendant l'exécution : la tâche reste dans le stockage
+    with pytest.raises(SystemExit):
+        api_queue._execute(api_queue._tasks.get(timeout=0))
+
+    restarted, service = make_queue()
+    assert restarted.resume({"s1": station}) == 1
+    item = restarted._tasks.get(timeout=0)
+
+    assert item.kwargs["until"] == "2023-01-01T00:00:00+00:00"
+    assert item.kwargs["days"] == 365
+
+def test_failed_durable_task_is_kept_for_retry(durable_setup, mocker):
+    """Test : Une tâche durable en échec reste stockée, avec sa tentative comptée"""
+    make_queue, station = durable_setup
+    api_queue, service = make_queue()
+    mocker.patch.object(service, "calls", mocker.Mock(**{"append.side_effect": ValueError("Boom")}))
+    handle = api_queue.add_task(service.refresh, station=station, dedupe_key="s1")
+
+    api_queue._execute(api_queue._tasks.get(timeout=0))
+
+    assert handle.status == 'failed'
+    assert [task.attempts for task in api_queue._store.unfinished()] == [1]
+    restarted, _ = make_queue()
+    assert restarted.resume({"s1": station}) == 1
+
+def test_store_written_outside_queue_lock(durable_setup, mocker):
+    """Test : Les écritures sur disque ne bloquent pas la file pendant leur durée"""
+    make_queue, station = durable_setup
+    api_queue, service = make_queue()
+    locked = []
+    add, remove = api_queue._store.add, api_queue._store.remove
+    mocker.patch.object(api_queue._store, "add",
+                        side_effect=lambda *a, **k: locked.append(api_queue._lock.locked()) or add(*a, **k))
+    mocker.patch.object(api_queue._store, "remove",
+                        side_effect=lambda *a: locked.append(api_queue._lock.locked()) or remove(*a))
+
+    api_queue.add_task(service.refresh, station=station, dedupe_key="s1")
+    merged = api_queue.add_task(service.refresh, station=station, dedupe_key="s1")
+    api_queue._execute(api_queue._tasks.get(timeout=0))
+
+    assert not merged.queued
+    assert locked == [False, False, False, False]
+    assert len(api_queue._store) == 0
+
+def test_resume_drops_unknown_station(durable_setup):
+    """Test : Une tâche dont la station a disparu est abandonnée"""
+    make_queue, station = durable_setup
+    api_queue, service = make_queue()
+    api_queue.add_task(service.refresh, station=station)
+
+    restarted, _ = make_queue()
+
+    assert restarted.resume({}) == 0
+    assert len(restarted._store) == 0
+
+def test_snapshot_records_wait_run_and_outcome(mocker):
+    """Test : Temps d'attente, temps d'exécution, issue et profondeur sont mesurés"""
+    clock = mocker.patch("projet.src.api.request_queue.time.monotonic", return_value=100.0)
+    api_queue = ApiRequestQueue(workers=2)
+
+    def refresh():
+        clock.return_value = 103.5
+
+    api_queue.add_task(refresh)
+    api_queue.add_task(mocker.Mock(side_effect=ValueError("Boom"), __name__="failing"))
+    api_queue.add_task(refresh).cancel()
+    clock.return_value = 101.0
+    api_queue._execute(api_queue._tasks.get(timeout=0))
+
+    snapshot = api_queue.snapshot()
+
+    assert snapshot['outcomes'] == {"succeeded": 1, "cancelled": 1}
+    assert snapshot['wait']['max'] == 1.0
+    assert snapshot['by_task']['refresh']['p50'] == 2.5
+    assert snapshot['depth']['current'] == 1
+    assert snapshot['depth']['max'] == 3
+    assert snapshot['workers'] == 2 and snapshot['busy_workers'] == 0
+
+    api_queue._execute(api_queue._tasks.get(timeout=0))
+    assert api_queue.snapshot()['outcomes'] == {"succeeded": 1, "failed": 1, "cancelled": 1}
@@ -0,0 +1,69 @@
+import pytest
+from projet.src.api.resilience import CircuitBreaker, CircuitOpenError, RetryPolicy
+
+
+def test_retry_policy_retryable_statuses():
+    policy = RetryPolicy()
+
+    assert policy.is_retryable(429)
+    assert policy.is_retryable(503)
+    assert not policy.is_retryable(404)
+
+def test_retry_policy_delay_is_bounded():
+    """Test : Le délai est aléatoire mais borné par le backoff exponentiel"""
+    policy = RetryPolicy(backoff_base=1, backoff_max=5)
+
+    assert 0 <= policy.delay(0) <= 1
+    assert 0 <= policy.delay(2) <= 4
+    assert 0 <= policy.delay(10) <= 5
+
+def test_retry_policy_honors_retry_after():
+    policy = RetryPolicy(backoff_max=30)
+
+    assert policy.delay(0, retry_after="12") == 12
+    assert policy.delay(0, retry_after="120") == 30
+
+@pytest.fixture
+def breaker():
+    return CircuitBreaker(failure_threshold=2, cooldown=60)
+
+def test_circuit_opens_after_threshold(breaker):
+    """Test : Le circuit s'ouvre après N échecs consécutifs"""
+    breaker.record_failure("host")
+    breaker.before_request("host")
+
+    breaker.record_failure("host")
+
+    assert breaker.is_open("host")
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request("host")
+    # Les autres hôtes ne sont pas affectés
+    breaker.before_request("other")
+
+def test_success_resets_failures(breaker):
+    breaker.record_failure("host")
+    breaker.record_success("host")
+    breaker.record_failure("host")
+
+    assert not breaker.is_open("host")
+
+def test_half_open_trial(breaker, mocker):
+    """Test : Après le cooldown, une seule requête d'essai passe"""
+    clock = mocker.patch("projet.src.api.resilience.time.monotonic", return_value=0)
+    breaker.record_failure("host")
+    breaker.record_failure("host")
+
+    clock.return_value = 61
+    breaker.before_request("host")
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request("host")
+
+    # L'échec de l'essai rouvre le circuit
+    breaker.record_failure("host")
+    assert breaker.is_open("host")
+
+    clock.return_value = 200
+    breaker.before_request("host")
+    breaker.record_success("host")
+    breaker.before_request("host")
+    breaker.before_request("host")
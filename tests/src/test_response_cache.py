@@ -0,0 +1,112 @@
+import pytest
+from projet.src.api.response_cache import ResponseCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ResponseCache(cache_dir=tmp_path / "cache", ttl=60, align_to_hour=False)
+
+def test_make_key_ignores_param_order():
+    """Test : La clé ne dépend pas de l'ordre des paramètres"""
+    key1 = ResponseCache.make_key("http://api/records", {"a": "1", "b": "2"})
+    key2 = ResponseCache.make_key("http://api/records", {"b": "2", "a": "1"})
+
+    assert key1 == key2
+    assert key1 != ResponseCache.make_key("http://api/records", {"a": "2"})
+
+def test_put_and_get(cache):
+    """Test : Une réponse stockée est servie fraîche avec ses validateurs"""
+    cache.put("k", b'{"results": []}', {"ETag": '"v1"', "Last-Modified": "Mon"})
+
+    cached = cache.get("k")
+
+    assert cached.body == b'{"results": []}'
+    assert cached.is_fresh
+    assert cached.revalidation_headers() == {"If-None-Match": '"v1"', "If-Modified-Since": "Mon"}
+
+def test_get_miss(cache):
+    assert cache.get("absent") is None
+
+def test_entries_persist_on_disk(tmp_path, cache):
+    """Test : Les entrées survivent à la recréation du cache"""
+    cache.put("k", b"body")
+
+    reloaded = ResponseCache(cache_dir=tmp_path / "cache")
+
+    assert reloaded.get("k").body == b"body"
+
+def test_ttl_expiry(cache, mocker):
+    """Test : Une entrée expirée est rendue mais marquée périmée"""
+    cache.put("k", b"body")
+    mocker.patch("projet.src.api.response_cache.time.time", return_value=cache.get("k").stored_at + 61)
+
+    assert not cache.get("k").is_fresh
+
+def test_align_to_hour(tmp_path, mocker):
+    """Test : Une entrée expire au plus tard à l'heure pleine suivante"""
+    mocker.patch("projet.src.api.response_cache.time.time", return_value=3600 * 10 + 3000)
+    cache = ResponseCache(cache_dir=tmp_path / "cache", ttl=3600)
+
+    cache.put("k", b"body")
+
+    assert cache.get("k").expires_at == 3600 * 11
+
+def test_refresh_extends_lifetime(cache, mocker):
+    """Test : Une revalidation (304) prolonge la durée de vie"""
+    cache.put("k", b"body")
+    later = cache.get("k").stored_at + 120
+    mocker.patch("projet.src.api.response_cache.time.time", return_value=later)
+
+    refreshed = cache.refresh("k", cache.get("k"))
+
+    assert refreshed.is_fresh
+    assert refreshed.stored_at == later
+
+def test_lru_eviction(tmp_path):
+    """Test : Les entrées les moins récemment utilisées sont évincées"""
+    cache = ResponseCache(cache_dir=tmp_path / "cache", max_bytes=10, memory_entries=0)
+    cache.put("a", b"12345")
+    cache.put("b", b"12345")
+    cache.get("a")
+
+    cache.put("c", b"12345")
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+    assert not (tmp_path / "cache" / "b.body").exists()
+
+def test_entry_evicted_during_read_is_not_recreated(tmp_path, mocker):
+    """Test : Une entrée évincée pendant sa lecture n'est pas recréée vide sur le disque"""
+    from pathlib import Path
+    cache = ResponseCache(cache_dir=tmp_path / "cache", memory_entries=0)
+    cache.put("k", b"body")
+    read_bytes = Path.read_bytes
+
+    def read_then_evict(path):
+        body = read_bytes(path)
+        with cache._lock:
+            cache._discard("k")
+        return body
+    mocker.patch("pathlib.Path.read_bytes", autospec=True, side_effect=read_then_evict)
+
+    assert cache.get("k").body == b"body"
+    assert list((tmp_path / "cache").iterdir()) == []
+
+def test_unreadable_entry(cache):
+    """Test : Une entrée corrompue est supprimée et traitée comme absente"""
+    cache.memory_entries = 0
+    cache.put("k", b"body")
+    cache._memory.clear()
+    (cache.cache_dir / "k.meta").write_text("not json")
+
+    assert cache.get("k") is None
+    assert not (cache.cache_dir / "k.body").exists()
+
+def test_clear(cache):
+    cache.put("k", b"body")
+
+    cache.clear()
+
+    assert cache.get("k") is None
+    assert list(cache.cache_dir.iterdir()) == []
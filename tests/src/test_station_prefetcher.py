@@ -0,0 +1,84 @@
+import pytest
+
+from projet.src.api.request_queue import ApiRequestQueue, TaskPriority
+from projet.src.entities.station import Station
+from projet.src.data_structures.linked_list_navigator import LinkedListNavigator
+from projet.src.services.station_prefetcher import StationPrefetcher
+
+
+@pytest.fixture
+def stations():
+    return [Station(f"s{i}", f"Station {i}", 0, 0) for i in range(6)]
+
+@pytest.fixture
+def api_queue():
+    """File non démarrée : les tâches restent en attente"""
+    return ApiRequestQueue()
+
+@pytest.fixture
+def data_fetcher(mocker):
+    return mocker.Mock(**{"prefetch_station.__name__": "prefetch_station"})
+
+def test_update_queues_neighbours_with_prefetch_priority(api_queue, data_fetcher, stations, mocker):
+    """Test : Les voisines de la station courante sont préchargées en priorité PREFETCH"""
+    add_task = mocker.spy(api_queue, "add_task")
+    prefetcher = StationPrefetcher(api_queue, data_fetcher, count=1)
+
+    prefetcher.update(LinkedListNavigator(stations))
+
+    assert [call.kwargs["station"] for call in add_task.call_args_list] == [stations[1], stations[5]]
+    for call in add_task.call_args_list:
+        assert call.args == (data_fetcher.prefetch_station,)
+        assert call.kwargs["dedupe_key"] == call.kwargs["station"].id
+        assert call.kwargs["priority"] == TaskPriority.PREFETCH
+    assert api_queue._tasks.qsize() == 2
+
+def test_update_ignores_unchanged_station(api_queue, data_fetcher, stations, mocker):
+    """Test : Rien n'est refait tant que la station courante ne change pas"""
+    add_task = mocker.spy(api_queue, "add_task")
+    prefetcher = StationPrefetcher(api_queue, data_fetcher, count=1)
+    navigator = LinkedListNavigator(stations)
+
+    prefetcher.update(navigator)
+    prefetcher.update(navigator)
+
+    assert add_task.call_count == 2
+
+def test_update_cancels_stale_prefetches(api_queue, data_fetcher, stations):
+    """Test : Avancer d'une station annule le préchargement sorti de la fenêtre"""
+    prefetcher = StationPrefetcher(api_queue, data_fetcher, count=1)
+    navigator = LinkedListNavigator(stations)
+    prefetcher.update(navigator)
+    stale = prefetcher._handles["s5"]
+    landed = prefetcher._handles["s1"]
+
+    navigator.get_next()
+    prefetcher.update(navigator)
+
+    assert stale.cancelled()
+    # La station atteinte est rafraîchie de toute façon : sa demande continue
+    assert not landed.cancelled()
+    assert set(prefetcher._handles) == {"s0", "s2"}
+
+def test_update_requeues_cancelled_prefetch(api_queue, data_fetcher, stations):
+    """Test : Un préchargement annulé ailleurs est relancé s'il est toujours voisin"""
+    prefetcher = StationPrefetcher(api_queue, data_fetcher, count=1)
+    navigator = LinkedListNavigator(stations)
+    prefetcher.update(navigator)
+    cancelled = prefetcher._handles["s1"]
+    cancelled.cancel()
+
+    navigator.set_current(stations[2])
+    prefetcher.update(navigator)
+
+    assert prefetcher._handles["s1"] is not cancelled
+    assert prefetcher._handles["s1"].status == "pending"
+    assert prefetcher._handles["s3"].status == "pending"
+
+def test_update_disabled(api_queue, data_fetcher, stations, mocker):
+    """Test : count=0 désactive le préchargement"""
+    add_task = mocker.spy(api_queue, "add_task")
+
+    StationPrefetcher(api_queue, data_fetcher, count=0).update(LinkedListNavigator(stations))
+
+    add_task.assert_not_called()
@@ -0,0 +1,117 @@
+import pandas as pd
+import pytest
+import requests
+from projet.src.api.catalog import CatalogSync
+from projet.src.api.export_extractor import ExportExtractor
+from projet.src.api.extractor import APIExtractor
+from projet.src.api.rate_limiter import RateLimiter
+from projet.src.api.recorder import ResponseRecorder
+from projet.src.api.resilience import RetryPolicy
+from projet.src.api.stub_server import StubApiServer
+
+
+@pytest.fixture
+def station(mocker):
+    station = mocker.Mock(name="Station")
+    station.name = "Stub"
+    station.id = "42-station-meteo-stub"
+    return station
+
+def _extractor(server, **kwargs):
+    return APIExtractor(base_url=server.url_base, rate_limiter=RateLimiter(rate=None), **kwargs)
+
+def test_synthetic_records(station):
+    """Test Nominal : L'API locale sert des relevés horaires synthétiques"""
+    with StubApiServer() as server:
+        df = _extractor(server).extract(station)
+
+    assert len(df) == 100
+    assert df['humidite'].between(0, 100).all()
+    assert df['heure_de_paris'].is_monotonic_decreasing
+    assert server.request_count == 1
+
+def test_paging_and_payload_size(station):
+    """Test : limit/offset sont respectés et la taille des réponses est configurable"""
+    with StubApiServer(history_hours=150) as server:
+        pages = list(_extractor(server).extract_pages(station, days=30))
+    assert [len(p) for p in pages] == [100, 50]
+
+    with StubApiServer(payload_size=3) as server:
+        response = requests.get(server.url_base + "s1/records", params={'limit': 100}, timeout=5)
+    assert len(response.json()['results']) == 3
+
+def test_error_rate(station):
+    """Test : Le taux d'erreur injecte des 503 de manière déterministe"""
+    with StubApiServer(error_rate=1.0) as server:
+        extractor = _extractor(server, retry_policy=RetryPolicy(max_attempts=2, backoff_base=0))
+        assert extractor.extract(station).empty
+    assert server.request_count == 2
+
+def test_unknown_endpoint():
+    with StubApiServer() as server:
+        response = requests.get(server.url_base + "s1/unknown", timeout=5)
+    assert response.status_code == 404
+
+def test_record_then_replay_offline(station, tmp_path):
+    """Test : Enregistrement via l'API locale puis rejeu sans réseau"""
+    with StubApiServer() as server:
+        recorded = _extractor(server, recorder=ResponseRecorder(tmp_path, mode="record")).extract(station)
+
+    # Serveur arrêté : seul le rejeu peut répondre
+    replayed = _extractor(server, recorder=ResponseRecorder(tmp_path, mode="replay")).extract(station)
+    assert replayed.equals(recorded)
+
+    # Les cassettes sont aussi servies par l'API locale
+    with StubApiServer(cassette_dir=tmp_path, payload_size=1) as replay_server:
+        served = _extractor(replay_server).extract(station)
+    assert served.equals(recorded)
+
+def test_incremental_fetch_returns_only_newer_records(station):
+    """Test : Les bornes temporelles de `where` sont respectées (pas de doublons en incrémental)"""
+    with StubApiServer() as server:
+        extractor = _extractor(server)
+        latest = pd.to_datetime(extractor.extract(station)['heure_de_paris']).max()
+        newer = extractor.extract(station, since=latest)
+        older = extractor.extract(station, since=latest - pd.Timedelta(hours=3))
+
+    assert newer.empty
+    assert len(older) == 3
+
+def test_backfill_windows_are_distinct(station):
+    """Test : Chaque fenêtre de extract_pages renvoie ses propres relevés"""
+    with StubApiServer(history_hours=24 * 10) as server:
+        pages = list(_extractor(server).extract_pages(station, days=10, window_days=2))
+
+    timestamps = pd.concat(pages)['heure_de_paris']
+    assert timestamps.is_unique
+    assert len(timestamps) == 24 * 10
+
+def test_aggregates_are_grouped(station):
+    """Test : group_by renvoie une ligne agrégée par période"""
+    with StubApiServer(history_hours=24 * 5) as server:
+        df = _extractor(server).extract_aggregates(station, resolution='day', days=3)
+
+    assert 3 <= len(df) <= 4
+    assert (df['temperature_en_degre_c_min'] <= df['temperature_en_degre_c_max']).all()
+    assert df['heure_de_paris'].is_monotonic_decreasing
+
+@pytest.mark.parametrize("export_format", ["parquet", "csv"])
+def test_exports(station, export_format):
+    """Test : Les exports CSV et Parquet sont servis en un seul fichier"""
+    with StubApiServer(history_hours=24 * 3) as server:
+        extractor = ExportExtractor(base_url=server.url_base, rate_limiter=RateLimiter(rate=None),
+                                    export_format=export_format)
+        pages = list(extractor.extract_pages(station, days=2))
+
+    assert sum(len(page) for page in pages) == 48
+    assert server.request_count == 1
+
+def test_catalog(tmp_path):
+    """Test : Le catalogue liste les jeux de données configurés"""
+    station_ids = ["01-station-meteo-a", "02-station-meteo-b"]
+    with StubApiServer(dataset_ids=station_ids + ["parkings"]) as server:
+        catalog = CatalogSync(_extractor(server), cache_path=tmp_path / "catalog.json")
+        datasets = catalog.sync()
+
+    assert sorted(datasets) == station_ids
+    assert catalog.status_of("01-station-meteo-a") == 'active'
@@ -0,0 +1,69 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from projet.src.api.task_store import SqliteTaskStore, decode_kwargs, encode_kwargs
+from projet.src.entities.station import Station
+
+@pytest.fixture
+def store(tmp_path):
+    return SqliteTaskStore(tmp_path / "queue" / "tasks.sqlite3", max_attempts=2)
+
+@pytest.fixture
+def station():
+    return Station("s1", "Station 1", 1.4, 43.6)
+
+def test_kwargs_round_trip(station):
+    """Test : Stations et dates sont restaurées à l'identique"""
+    until = datetime(2023, 1, 1, 12, tzinfo=timezone.utc)
+    document = encode_kwargs({"station": station, "days": 30, "until": until})
+
+    kwargs = decode_kwargs(document, {"s1": station})
+
+    assert kwargs == {"station": station, "days": 30, "until": until}
+
+def test_unserializable_kwargs_rejected():
+    """Test : Un argument non sérialisable est refusé"""
+    with pytest.raises(TypeError):
+        encode_kwargs({"callback": object()})
+
+def test_unknown_station_raises(station):
+    """Test : Une station disparue ne peut pas être restaurée"""
+    with pytest.raises(KeyError):
+        decode_kwargs(encode_kwargs({"station": station}), {})
+
+def test_tasks_survive_reopening(store, station):
+    """Test : Les tâches non terminées sont relues après redémarrage, dans l'ordre"""
+    first = store.add("refresh", {"station": station}, dedupe_key="s1", priority=0)
+    second = store.add("backfill", {"station": station, "days": 365}, priority=2)
+    store.remove(first)
+
+    reopened = SqliteTaskStore(store.path)
+    tasks = reopened.unfinished()
+
+    assert [task.task_id for task in tasks] == [second]
+    assert tasks[0].name == "backfill"
+    assert tasks[0].priority == 2
+    assert len(reopened) == 1
+
+def test_checkpoint_updates_kwargs(store, station):
+    """Test : Un point de reprise remplace les arguments concernés"""
+    task_id = store.add("backfill", {"station": station, "days": 365})
+    until = datetime(2023, 1, 1, tzinfo=timezone.utc)
+
+    store.checkpoint(task_id, until=until)
+    store.checkpoint(12345, until=until)  # Tâche inconnue : sans effet
+
+    kwargs = decode_kwargs(store.unfinished()[0].kwargs, {"s1": station})
+    assert kwargs == {"station": station, "days": 365, "until": until}
+
+def test_task_abandoned_after_max_attempts(store, station):
+    """Test : Une tâche démarrée trop souvent sans se terminer est abandonnée"""
+    task_id = store.add("refresh", {"station": station})
+    store.start(task_id)
+    assert store.unfinished()[0].attempts == 1
+
+    store.start(task_id)
+
+    assert store.unfinished() == []
+    assert len(store) == 0
@@ -91,3 +91,67 @@ def test_normalize_columns_generates_display_date(transformer):
     result_df = transformer.normalize_columns(df)
     
     assert result_df['display_date'].iloc[0] == '2023-01-01 14:30:00'
+
+def test_format_data_aligns_to_resolution():
+    """Test : En résolution 15 min, les horodatages sont alignés et dédoublonnés"""
+    transformer = DataTransformer(resolution='15min')
+    raw_df = pd.DataFrame({
+        'heure_de_paris': ['2023-01-01 12:16:30', '2023-01-01 12:15:00', '2023-01-01 12:00:00'],
+        'temperature_en_degre_c': [10.6, 10.5, 10.0],
+        'humidite': [80, 80, 81],
+        'pression': [101300, 101300, 101310]
+    })
+
+    result_df = transformer.format_data(raw_df)
+
+    assert result_df['display_date'].tolist() == ['2023-01-01 12:15', '2023-01-01 12:00']
+    assert result_df['temperature_en_degre_c'].tolist() == [10.6, 10.0]
+
+def test_format_data_raw_keeps_every_sample():
+    """Test : En résolution brute, aucun relevé n'est écarté"""
+    transformer = DataTransformer(resolution='raw')
+    raw_df = pd.DataFrame({
+        'heure_de_paris': ['2023-01-01 12:06:00', '2023-01-01 12:00:00'],
+        'temperature_en_degre_c': [10.5, 10.0],
+        'humidite': [80, 81],
+        'pression': [101300, 101310]
+    })
+
+    assert len(transformer.format_data(raw_df)) == 2
+
+def test_unknown_resolution():
+    """Test : Une résolution inconnue est refusée"""
+    with pytest.raises(ValueError):
+        DataTransformer(resolution='5min')
+
+def test_downsample_to_hourly():
+    """Test : Le sous-échantillonnage moyenne les relevés de chaque heure"""
+    df = pd.DataFrame({
+        'date': pd.to_datetime(['2023-01-01 12:00', '2023-01-01 12:15',
+                                '2023-01-01 12:30', '2023-01-01 13:00']),
+        'temperature': [10.0, 11.0, 12.0, 13.0],
+        'humidity': [80, 81, 82, 90],
+        'pressure': [101300, 101302, 101304, 101400],
+        'display_date': ['a', 'b', 'c', 'd']
+    })
+
+    result_df = DataTransformer.downsample(df, 'hourly')
+
+    assert len(result_df) == 2
+    assert result_df['temperature'].tolist() == [11.0, 13.0]
+    assert result_df['humidity'].tolist() == [81, 90]
+    assert result_df['pressure'].dtype == np.int64
+    assert result_df['display_date'].tolist() == ['2023-01-01 12:00', '2023-01-01 13:00']
+
+def test_downsample_noop_when_already_coarse():
+    """Test : Des données déjà horaires sont renvoyées telles quelles"""
+    df = pd.DataFrame({
+        'date': pd.to_datetime(['2023-01-01 12:00', '2023-01-01 13:00']),
+        'temperature': [10.0, 13.0],
+        'humidity': [80, 90],
+        'pressure': [101300, 101400],
+        'display_date': ['a', 'b']
+    })
+
+    assert DataTransformer.downsample(df, 'hourly') is df
+    assert DataTransformer.downsample(df, 'raw') is df
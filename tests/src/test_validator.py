@@ -152,4 +152,23 @@ def test_are_values_valid_exception(validator, df_test, mocker):
     # On simule une erreur inattendue lors de la validation des valeurs
     mocker.patch.object(pd.Series, 'between', side_effect=Exception("Erreur inattendue"))
     
-    assert validator.are_values_valid(df_test) is False
\ No newline at end of file
+    assert validator.are_values_valid(df_test) is False
+def test_is_resolution_consistent_hourly(validator, df_test):
+    """Test : Des relevés horaires respectent la résolution horaire"""
+    assert validator.is_resolution_consistent(df_test)
+
+def test_is_resolution_consistent_off_grid(validator, df_test, caplog):
+    """Test : Un relevé à 12h15 est refusé en résolution horaire"""
+    df_test['date'] = pd.to_datetime(['2023-01-01 12:00', '2023-01-01 12:15'])
+    with caplog.at_level(logging.ERROR):
+        assert not validator.is_resolution_consistent(df_test)
+    assert "do not match the hourly resolution" in caplog.text
+
+def test_is_resolution_consistent_quarter_hour(df_test):
+    """Test : La résolution 15 min accepte les quarts d'heure, la brute tout"""
+    df_test['date'] = pd.to_datetime(['2023-01-01 12:15', '2023-01-01 12:45'])
+    assert DataValidator(rules={}, resolution='15min').is_resolution_consistent(df_test)
+
+    df_test['date'] = pd.to_datetime(['2023-01-01 12:06', '2023-01-01 12:45'])
+    assert not DataValidator(rules={}, resolution='15min').is_resolution_consistent(df_test)
+    assert DataValidator(rules={}, resolution='raw').is_resolution_consistent(df_test)